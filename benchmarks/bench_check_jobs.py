@@ -0,0 +1,101 @@
+"""Benchmark: `firewall check` over a generated corpus, one file at a time vs --jobs.
+
+Usage:
+    python benchmarks/bench_check_jobs.py [--files 300] [--jobs 8]
+
+Each run gets a fresh cache directory so no result is answered from the
+result cache. Worker processes are started and warmed on a few files first,
+so process start-up is excluded from both timings. The corpus only imports
+the standard library, so no registry requests are made and the numbers
+measure parsing and signature inference. Expect no speedup on one core.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from hallucination_firewall.models import FirewallConfig, WorkerConfig
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+from hallucination_firewall.pipeline.signature_workers import shutdown_worker_pools
+
+MODULE_TEMPLATE = '''import json
+import os
+import re
+
+
+def load_{i}(path):
+    with open(path) as f:
+        data = json.load(f)
+    return os.path.join(os.getcwd(), data.get("name", "{i}"))
+
+
+def match_{i}(text):
+    pattern = re.compile(r"item-{i}-(\\d+)")
+    return [m.group(1) for m in pattern.finditer(text)]
+
+
+def dump_{i}(value):
+    return json.dumps({{"id": {i}, "value": value}}, indent=2, sort_keys=True)
+'''
+
+# Starts the worker processes without resolving anything the corpus calls
+WARMUP_TEMPLATE = "import math\n\nx_{i} = math.sqrt({i})\n"
+
+
+def generate_corpus(root: Path, n_files: int, template: str = MODULE_TEMPLATE) -> list[str]:
+    """Write ``n_files`` small Python modules under ``root``."""
+    root.mkdir()
+    paths = []
+    for i in range(n_files):
+        path = root / f"module_{i}.py"
+        path.write_text(template.format(i=i), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+async def run(paths: list[str], warmup: list[str], jobs: int, cache_dir: Path) -> float:
+    config = FirewallConfig(
+        cache_dir=cache_dir,
+        result_cache_size=0,
+        result_cache_persist=False,
+        signature_cache_persist=False,
+        workers=WorkerConfig(max_workers=jobs),
+    )
+    pipeline = ValidationPipeline(config)
+    try:
+        await pipeline.validate_files(warmup, jobs)
+        start = time.perf_counter()
+        await pipeline.validate_files(paths, jobs)
+        return time.perf_counter() - start
+    finally:
+        await pipeline.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = generate_corpus(root / "corpus", args.files)
+        warmup = generate_corpus(root / "warmup", args.jobs * 2, WARMUP_TEMPLATE)
+        print(f"{len(paths)} files, jobs={args.jobs}")
+
+        sequential = asyncio.run(run(paths, warmup, 1, root / "cache-seq"))
+        parallel = asyncio.run(run(paths, warmup, args.jobs, root / "cache-par"))
+        shutdown_worker_pools()
+
+    print(f"--jobs 1:  {sequential:8.2f} s  ({sequential / len(paths) * 1000:.1f} ms/file)")
+    print(f"--jobs {args.jobs}: {parallel:8.2f} s  ({parallel / len(paths) * 1000:.1f} ms/file)")
+    print(f"speedup: {sequential / parallel:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: RegistryCache get/set throughput, persistent vs per-call connections.
+
+Usage:
+    python benchmarks/bench_registry_cache.py [--keys 2000] [--rounds 5]
+
+"per-call" reproduces the earlier behaviour of opening a connection (and
+setting WAL mode) for every operation; "persistent" is the current cache
+with one connection per thread. Each mode writes ``--keys`` entries, then
+reads them all back ``--rounds`` times.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from hallucination_firewall.registries.cache import RegistryCache
+
+
+class PerCallRegistryCache(RegistryCache):
+    """The cache as it was: a fresh connection for every get/set/delete."""
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+
+def run(cache: RegistryCache, keys: int, rounds: int) -> tuple[float, float]:
+    """Return (sets per second, gets per second)."""
+    names = [f"pypi:exists:package-{i}" for i in range(keys)]
+    start = time.perf_counter()
+    for name in names:
+        cache.set(name, True)
+    set_rate = keys / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            cache.get(name)
+    get_rate = keys * rounds / (time.perf_counter() - start)
+    return set_rate, get_rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.keys} keys, {args.rounds} read rounds")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, cls in (("per-call", PerCallRegistryCache), ("persistent", RegistryCache)):
+            cache = cls(Path(tmp) / label)
+            set_rate, get_rate = run(cache, args.keys, args.rounds)
+            cache.close()
+            print(f"{label:>10}: {set_rate:10,.0f} sets/s  {get_rate:10,.0f} gets/s")
+
+
+if __name__ == "__main__":
+    main()
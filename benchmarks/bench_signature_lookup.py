@@ -0,0 +1,68 @@
+"""Benchmark: per-call Jedi signature lookup cost, fresh Script vs shared Script.
+
+Usage:
+    python benchmarks/bench_signature_lookup.py [--calls 1000] [--sample 50]
+
+"before" builds a new SignatureLookup (and so a new jedi.Script) for every
+call site, which is what check_signatures did previously. Because that path
+re-parses the whole file per call it is only timed on ``--sample`` call
+sites and reported per call. "after" resolves every call site against one
+shared lookup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from hallucination_firewall.pipeline.signature_checker import (
+    FunctionCallExtractor,
+    SignatureLookup,
+)
+
+CALL_TEMPLATES = [
+    "os.path.join('a', 'b{i}')",
+    "json.dumps({{'k': {i}}})",
+    "os.getenv('VAR_{i}')",
+    "re.compile(r'x{i}')",
+    "math.sqrt({i})",
+]
+
+
+def generate_code(n_calls: int) -> str:
+    """Build a module with ``n_calls`` dotted stdlib calls."""
+    lines = ["import json", "import math", "import os", "import re", ""]
+    for i in range(n_calls):
+        lines.append(f"v{i} = " + CALL_TEMPLATES[i % len(CALL_TEMPLATES)].format(i=i))
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=50)
+    args = parser.parse_args()
+
+    code = generate_code(args.calls)
+    calls = FunctionCallExtractor().extract_calls(code)
+    print(f"{len(calls)} call sites, {len(code.splitlines())} lines")
+
+    sample = calls[: args.sample]
+    start = time.perf_counter()
+    for call in sample:
+        SignatureLookup().get_signature(call.name, code, call.line)
+    before = (time.perf_counter() - start) / len(sample)
+
+    lookup = SignatureLookup()
+    start = time.perf_counter()
+    for call in calls:
+        lookup.get_signature(call.name, code, call.line)
+    after = (time.perf_counter() - start) / len(calls)
+
+    print(f"before (Script per call): {before * 1000:8.2f} ms/call  ({len(sample)} sampled)")
+    print(f"after  (shared Script):   {after * 1000:8.2f} ms/call  ({len(calls)} calls)")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
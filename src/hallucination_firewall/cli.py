@@ -2,23 +2,31 @@
 
 from __future__ import annotations
 
-import asyncio
+import os
 import re
 import sys
+from collections.abc import Iterable, Iterator
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 import click
-from rich.console import Console
 
-from .config import load_config
-from .models import ValidationResult
-from .pipeline.runner import ValidationPipeline
-from .reporters.json_reporter import print_json
-from .reporters.sarif_reporter import print_sarif
-from .reporters.terminal_reporter import print_result, print_summary
+# Everything heavier (pydantic models, rich, the pipeline with tree-sitter,
+# Jedi and httpx) is imported inside the commands that use it, so that
+# `--version`, `init` or a `check` answered by the daemon stay fast.
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
+    from .models import FirewallConfig, ValidationResult
+    from .registries.cache import RegistryCache
+    from .utils.git_diff import ChangedLines
+
+# Mirrors daemon.DEFAULT_IDLE_TIMEOUT without importing the daemon client
+DEFAULT_IDLE_TIMEOUT = 3600.0
+# Jedi worker processes for an in-process `check`, whatever --jobs is
+MAX_CHECK_WORKERS = 4
 
 _BLOCKED_HOSTS = re.compile(
     r"^(localhost|127\.\d+\.\d+\.\d+|10\.\d+\.\d+\.\d+|"
@@ -35,8 +43,16 @@ def main() -> None:
     """AI Hallucination Firewall — validates AI-generated code against real sources."""
 
 
+@cache
+def _console(stderr: bool = False) -> Console:
+    """Shared rich console, created on first output."""
+    from rich.console import Console
+
+    return Console(stderr=stderr)
+
+
 @main.command()
-@click.argument("files", nargs=-1, type=click.Path(exists=True))
+@click.argument("files", nargs=-1, type=click.Path())
 @click.option("--stdin", is_flag=True, help="Read code from stdin")
 @click.option(
     "--format", "output_format",
@@ -47,29 +63,98 @@ def main() -> None:
     type=click.Choice(["python", "javascript", "typescript"]), default=None,
 )
 @click.option("--ci", is_flag=True, help="Enable strict CI policy mode (fail on warnings)")
+@click.option("--timings", is_flag=True, help="Print per-layer timings to stderr")
+@click.option(
+    "--jobs", "-j", type=click.IntRange(min=1), default=None,
+    help="Files validated concurrently (default: CPU count)",
+)
+@click.option(
+    "--incremental", is_flag=True,
+    help="Skip files unchanged since the last run and replay their results",
+)
+@click.option(
+    "--changed-since", "changed_since", metavar="REF", default=None,
+    help="Only check files changed since git REF, and only call sites in changed lines",
+)
+@click.option(
+    "--no-daemon", "no_daemon", is_flag=True,
+    help="Validate in this process even if `firewall daemon` is running",
+)
+@click.option(
+    "--watch", is_flag=True,
+    help="Keep running and re-check files as they change, printing only new or resolved issues",
+)
+@click.option(
+    "--poll", is_flag=True, help="With --watch, poll for changes instead of using inotify",
+)
 def check(
     files: tuple[str, ...],
     stdin: bool,
     output_format: str,
     language: str | None,
     ci: bool,
+    timings: bool,
+    jobs: int | None,
+    incremental: bool,
+    changed_since: str | None,
+    no_daemon: bool,
+    watch: bool,
+    poll: bool,
 ) -> None:
-    """Validate code files for hallucinated APIs, wrong signatures, and more."""
-    if not files and not stdin:
-        console.print("[red]Error:[/] Provide file paths or use --stdin")
+    """Validate code files for hallucinated APIs, wrong signatures, and more.
+
+    FILES may be files, directories (walked recursively, honouring .gitignore
+    and the `exclude` config list) or quoted globs such as "src/**/*.py".
+    """
+    import asyncio
+
+    from .utils.file_walker import has_glob
+    if not files and not stdin and not changed_since:
+        _console().print("[red]Error:[/] Provide file paths or use --stdin")
         sys.exit(1)
+    if changed_since and (stdin or incremental):
+        raise click.UsageError("--changed-since cannot be combined with --stdin or --incremental")
+    if watch and (stdin or changed_since or output_format != "terminal"):
+        raise click.UsageError(
+            "--watch needs file paths and the terminal format, without --stdin or --changed-since",
+        )
+    for target in files:
+        if not has_glob(target) and not os.path.exists(target):
+            raise click.BadParameter(f"Path '{target}' does not exist.", param_hint="FILES")
+
+    if watch:
+        from .watch import run_watch
+
+        jobs = jobs or os.cpu_count() or 1
+        config = _check_config(ci)
+        _use_check_pool(config, jobs)
+        run_watch(config, files, jobs, _console(), incremental, poll)
+        return
 
-    results = asyncio.run(_run_check(files, stdin, language, ci))
+    results = asyncio.run(
+        _run_check(
+            files, stdin, language, ci, timings, jobs or os.cpu_count() or 1, incremental,
+            changed_since, use_daemon=not no_daemon,
+        ),
+    )
 
     if output_format == "json":
+        from .reporters.json_reporter import print_json
+
         print_json(results)
     elif output_format == "sarif":
+        from .reporters.sarif_reporter import print_sarif
+
         print_sarif(results)
     else:
+        from .reporters.terminal_reporter import print_result, print_summary
+
+        if files and not results:
+            _console().print("[yellow]No supported source files found[/]")
         for result in results:
-            print_result(result, console)
+            print_result(result, _console())
         if len(results) > 1:
-            print_summary(results, console)
+            print_summary(results, _console())
 
     # Exit code: 1 if any errors found
     if any(not r.passed for r in results):
@@ -94,20 +179,26 @@ def parse(
         curl ... | firewall parse --stdin
         firewall parse --url https://gist.githubusercontent.com/.../response.md
     """
+    import asyncio
+
     from .parsers.llm_output_parser import validate_llm_output
 
     markdown = _read_parse_input(file, use_stdin, url)
     report = asyncio.run(validate_llm_output(markdown))
 
     if output_format == "json":
+        from .reporters.json_reporter import print_json
+
         print_json(report.results)
     else:
-        console.print("\n[bold]LLM Output Validation Report[/]")
-        console.print(f"Total blocks: {report.total_blocks}")
-        console.print(f"Passed: [green]{report.blocks_passed}[/]")
-        console.print(f"Failed: [red]{report.blocks_failed}[/]\n")
+        from .reporters.terminal_reporter import print_result
+
+        _console().print("\n[bold]LLM Output Validation Report[/]")
+        _console().print(f"Total blocks: {report.total_blocks}")
+        _console().print(f"Passed: [green]{report.blocks_passed}[/]")
+        _console().print(f"Failed: [red]{report.blocks_failed}[/]\n")
         for result in report.results:
-            print_result(result, console)
+            print_result(result, _console())
 
     if not report.passed:
         sys.exit(1)
@@ -137,7 +228,7 @@ def _read_parse_input(file: str | None, use_stdin: bool, url: str | None) -> str
         return resp.text
     if file:
         return Path(file).read_text(encoding="utf-8")
-    console.print("[red]Error:[/] Provide a file path, --stdin, or --url")
+    _console().print("[red]Error:[/] Provide a file path, --stdin, or --url")
     sys.exit(1)
 
 
@@ -150,7 +241,7 @@ def serve(host: str, port: int) -> None:
 
     from .server import app
 
-    console.print(f"[bold green]Starting firewall API server on {host}:{port}[/]")
+    _console().print(f"[bold green]Starting firewall API server on {host}:{port}[/]")
     uvicorn.run(app, host=host, port=port)
 
 
@@ -159,7 +250,7 @@ def init() -> None:
     """Create a .firewall.toml config file in the current directory."""
     config_path = Path.cwd() / ".firewall.toml"
     if config_path.exists():
-        console.print("[yellow]Config file already exists[/]")
+        _console().print("[yellow]Config file already exists[/]")
         return
 
     config_path.write_text(
@@ -174,7 +265,167 @@ def init() -> None:
         'npm_enabled = true\n'
         'timeout_seconds = 10\n'
     )
-    console.print(f"[green]Created {config_path}[/]")
+    _console().print(f"[green]Created {config_path}[/]")
+
+
+@main.group()
+def index() -> None:
+    """Build offline signature indexes used before Jedi inference."""
+
+
+@index.command("build-stdlib")
+@click.option(
+    "--output", "output", type=click.Path(dir_okay=False), default=None,
+    help="Index file to write (default: inside the cache directory)",
+)
+def build_stdlib(output: str | None) -> None:
+    """Index every public stdlib callable's parameters for this interpreter."""
+    from .config import load_config
+    from .pipeline.stdlib_index import build_stdlib_index, default_index_path
+
+    path = Path(output) if output else default_index_path(load_config().cache_dir)
+    with _console().status("Indexing the standard library..."):
+        count = build_stdlib_index(path)
+    _console().print(f"[green]Indexed {count} stdlib signatures → {path}[/]")
+
+
+@main.group("cache")
+def cache_group() -> None:
+    """Inspect and shrink the registry cache database."""
+
+
+def _registry_cache() -> RegistryCache:
+    from .config import load_config
+    from .registries.cache import RegistryCache
+
+    config = load_config()
+    return RegistryCache(
+        config.cache_dir,
+        config.cache_ttl_seconds,
+        max_entries=config.registry_cache_max_entries,
+        max_bytes=config.registry_cache_max_mb * 1024 * 1024,
+    )
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+@cache_group.command("stats")
+def cache_stats() -> None:
+    """Show entry counts and sizes."""
+    registry_cache = _registry_cache()
+    usage = registry_cache.disk_usage()
+    registry_cache.close()
+    max_entries = usage["max_entries"] or "unbounded"
+    max_bytes = _format_bytes(usage["max_bytes"]) if usage["max_bytes"] else "unbounded"
+    _console().print(
+        f"{usage['path']}\n"
+        f"  entries:  {usage['entries']} ({usage['expired']} expired), limit {max_entries}\n"
+        f"  data:     {_format_bytes(usage['data_bytes'])}, limit {max_bytes}\n"
+        f"  file:     {_format_bytes(usage['file_bytes'])} "
+        f"({_format_bytes(usage['free_bytes'])} free)",
+        highlight=False,
+    )
+
+
+@cache_group.command("prune")
+def cache_prune() -> None:
+    """Delete expired entries and evict least recently used ones over the limits."""
+    registry_cache = _registry_cache()
+    result = registry_cache.prune()
+    registry_cache.close()
+    _console().print(
+        f"[green]Removed {result.expired} expired and {result.evicted} evicted entries, "
+        f"freed {_format_bytes(result.freed_bytes)}[/]",
+    )
+
+
+@cache_group.command("vacuum")
+def cache_vacuum() -> None:
+    """Rebuild the database file to reclaim all free space."""
+    registry_cache = _registry_cache()
+    before, after = registry_cache.vacuum()
+    registry_cache.close()
+    _console().print(
+        f"[green]Vacuumed {registry_cache.db_path}: "
+        f"{_format_bytes(before)} → {_format_bytes(after)}[/]",
+    )
+
+
+@main.group()
+def daemon() -> None:
+    """Keep a warm validation pipeline running in the background for `check`."""
+
+
+@daemon.command("start")
+@click.option("--foreground", is_flag=True, help="Run in this process instead of detaching")
+@click.option(
+    "--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, show_default=True,
+    help="Exit after this many seconds without requests (0: never)",
+)
+def daemon_start(foreground: bool, idle_timeout: float) -> None:
+    """Start the daemon for this project's cache directory."""
+    import asyncio
+    import logging
+
+    from .config import load_config
+    from .daemon import DaemonError, FirewallDaemon, daemon_status, socket_path, spawn_daemon
+
+    sock = socket_path(load_config().cache_dir)
+    status = asyncio.run(daemon_status(sock))
+    if status is not None:
+        _console().print(f"[yellow]Daemon already running (pid {status['pid']})[/]")
+        return
+    try:
+        if foreground:
+            logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+            asyncio.run(FirewallDaemon(sock, idle_timeout).serve())
+            return
+        pid = spawn_daemon(sock.parent, idle_timeout)
+    except DaemonError as exc:
+        raise click.ClickException(str(exc)) from exc
+    _console().print(f"[green]Daemon started (pid {pid}) on {sock}[/]")
+
+
+@daemon.command("stop")
+def daemon_stop() -> None:
+    """Stop the running daemon."""
+    import asyncio
+
+    from .config import load_config
+    from .daemon import DaemonError, request, socket_path
+
+    sock = socket_path(load_config().cache_dir)
+    try:
+        asyncio.run(request(sock, {"op": "stop"}))
+    except DaemonError:
+        _console().print("[yellow]Daemon is not running[/]")
+        return
+    _console().print("[green]Daemon stopped[/]")
+
+
+@daemon.command("status")
+def daemon_status_command() -> None:
+    """Show whether the daemon is running; exits 1 if it is not."""
+    import asyncio
+
+    from .config import load_config
+    from .daemon import daemon_status, socket_path
+
+    sock = socket_path(load_config().cache_dir)
+    status = asyncio.run(daemon_status(sock))
+    if status is None:
+        _console().print("Daemon is not running")
+        sys.exit(1)
+    _console().print(
+        f"Daemon running: pid {status['pid']}, up {status['uptime_seconds']}s, "
+        f"{status['requests']} requests, {status['pipelines']} warm pipeline(s)",
+    )
 
 
 async def _run_check(
@@ -182,14 +433,43 @@ async def _run_check(
     stdin: bool,
     language: str | None,
     ci: bool = False,
+    show_timings: bool = False,
+    jobs: int = 1,
+    incremental: bool = False,
+    changed_since: str | None = None,
+    use_daemon: bool = False,
 ) -> list[ValidationResult]:
-    """Run validation pipeline on files or stdin."""
-    config = load_config()
-    if ci:
-        config.ci_mode = True
+    """Run validation pipeline on files or stdin, ``jobs`` files at a time.
+
+    File checks go to a running ``firewall daemon`` when possible (not with
+    ``show_timings``, which reports this process's pipeline). The pipeline is
+    only imported when no daemon answers.
+    """
+    from .daemon import check_via_daemon, socket_path
+    from .utils.file_walker import iter_source_files
+
+    config = _check_config(ci)
+    changes = _git_changes(changed_since) if changed_since else None
+
+    paths: Iterable[str] = ()
+    if not stdin:
+        paths = iter_source_files(files, exclude=config.exclude)
+        if changes is not None:
+            paths = _changed_paths(files, changes, config.exclude)
+        if use_daemon and not show_timings and socket_path(config.cache_dir).exists():
+            paths = list(paths)
+            remote = await check_via_daemon(config, paths, jobs, incremental, changes)
+            if remote is not None:
+                return remote
+
+    from .pipeline.incremental import IncrementalStore
+    from .pipeline.runner import ValidationPipeline
+
+    _use_check_pool(config, jobs)
     pipeline = ValidationPipeline(config)
 
     results: list[ValidationResult] = []
+    store: IncrementalStore | None = None
     try:
         if stdin:
             code = sys.stdin.read()
@@ -197,14 +477,75 @@ async def _run_check(
             result = await pipeline.validate_code(code, file_name)
             results.append(result)
         else:
-            for file_path in files:
-                result = await pipeline.validate_file(file_path)
-                results.append(result)
+            if incremental:
+                store = IncrementalStore(config.cache_dir, config)
+            # Discovered files are validated while the walk continues
+            results = await pipeline.validate_files(paths, jobs, store, changes)
+            if store is not None:
+                store.save()
+        if show_timings:
+            from .reporters.terminal_reporter import print_timings
+
+            stderr = _console(stderr=True)
+            print_timings(pipeline.timings.stats(), stderr)
+            if store is not None:
+                stats = store.stats()
+                stderr.print(
+                    f"Incremental: {stats['replayed']} replayed, "
+                    f"{stats['validated']} validated",
+                )
     finally:
         await pipeline.close()
 
     return results
 
 
+def _check_config(ci: bool) -> FirewallConfig:
+    """Project config for a ``check`` run.
+
+    The worker pool is left as configured: a daemon answering the check
+    sizes its own.
+    """
+    from .config import load_config
+
+    config = load_config()
+    if ci:
+        config.ci_mode = True
+    return config
+
+
+def _use_check_pool(config: FirewallConfig, jobs: int) -> None:
+    """Size an unconfigured Jedi pool for ``jobs`` files at a time, up to a cap.
+
+    Spawned pools start workers on demand, so a run over fewer files
+    starts fewer processes.
+    """
+    config.workers.use_pool(min(jobs, MAX_CHECK_WORKERS))
+
+
+def _git_changes(ref: str) -> dict[str, ChangedLines]:
+    """Changed files and lines since ``ref``, or a usage error from git."""
+    from .utils.git_diff import GitDiffError, changed_lines
+
+    try:
+        return changed_lines(ref)
+    except GitDiffError as exc:
+        raise click.UsageError(f"--changed-since {ref}: {exc}") from exc
+
+
+def _changed_paths(
+    files: tuple[str, ...], changes: dict[str, ChangedLines], exclude: list[str],
+) -> Iterator[str]:
+    """Changed files under ``files`` (or anywhere, when none are given)."""
+    from .utils.file_walker import iter_source_files
+
+    if files:
+        return (p for p in iter_source_files(files, exclude) if os.path.abspath(p) in changes)
+    existing = sorted(
+        os.path.relpath(path) for path in changes if os.path.isfile(path)
+    )
+    return iter_source_files(existing, exclude, filter_files=True)
+
+
 if __name__ == "__main__":
     main()
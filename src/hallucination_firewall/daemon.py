@@ -0,0 +1,335 @@
+"""Background daemon keeping warm validation pipelines behind a Unix socket.
+
+``firewall daemon start`` runs ``FirewallDaemon``; ``firewall check`` sends
+its file list with ``check_via_daemon`` and falls back to validating
+in-process whenever no daemon answers. Requests and responses are single
+JSON lines.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+from collections.abc import AsyncIterator, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import __version__
+from .models import FirewallConfig, ValidationResult
+from .utils.git_diff import ChangedLines
+
+if TYPE_CHECKING:
+    from .pipeline.runner import ValidationPipeline
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "daemon.sock"
+LOG_NAME = "daemon.log"
+CONNECT_TIMEOUT = 1.0  # seconds; a daemon that cannot accept this fast is skipped
+# Seconds to wait for a response before giving up and validating in-process
+STATUS_TIMEOUT = 5.0
+CHECK_TIMEOUT = 300.0
+START_TIMEOUT = 15.0  # seconds to wait for a spawned daemon to answer
+MAX_MESSAGE_BYTES = 256 * 1024 * 1024
+MAX_PIPELINES = 4  # distinct configs and project roots kept warm at once
+DEFAULT_IDLE_TIMEOUT = 3600.0
+
+
+class DaemonError(Exception):
+    """No daemon answered, or it could not handle the request."""
+
+
+def socket_path(cache_dir: Path) -> Path:
+    """Where the daemon for ``cache_dir`` listens."""
+    return cache_dir / SOCKET_NAME
+
+
+async def request(
+    sock: Path, payload: dict[str, Any], timeout: float = STATUS_TIMEOUT,
+) -> dict[str, Any]:
+    """Send one request to the daemon at ``sock`` and return its response.
+
+    Raises ``DaemonError`` if no response arrives within ``timeout`` seconds.
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(str(sock), limit=MAX_MESSAGE_BYTES),
+            CONNECT_TIMEOUT,
+        )
+    except (OSError, asyncio.TimeoutError) as exc:
+        raise DaemonError(f"cannot connect to {sock}: {exc}") from exc
+    try:
+        writer.write(json.dumps({"version": __version__, **payload}).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError as exc:
+        raise DaemonError(f"no daemon response within {timeout:.0f}s") from exc
+    except (OSError, ValueError) as exc:  # ValueError: response over the size limit
+        raise DaemonError(f"daemon connection failed: {exc}") from exc
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+    try:
+        response = json.loads(line)
+    except ValueError as exc:
+        raise DaemonError("daemon closed the connection") from exc
+    if not isinstance(response, dict):
+        raise DaemonError(f"unexpected daemon response: {response!r}")
+    if "error" in response:
+        raise DaemonError(str(response["error"]))
+    return response
+
+
+async def daemon_status(sock: Path) -> dict[str, Any] | None:
+    """Status of the daemon at ``sock``, or None when none is running."""
+    try:
+        return await request(sock, {"op": "status"})
+    except DaemonError:
+        return None
+
+
+async def check_via_daemon(
+    config: FirewallConfig,
+    file_paths: Sequence[str],
+    jobs: int = 1,
+    incremental: bool = False,
+    changed_lines: Mapping[str, ChangedLines] | None = None,
+) -> list[ValidationResult] | None:
+    """Validate files in a running daemon; None if no daemon could do it.
+
+    The daemon resolves paths from the filesystem root, so absolute paths
+    are sent and results are reported under the caller's spelling. The
+    caller's working directory is sent as the project root first-party
+    imports are resolved in.
+    """
+    sock = socket_path(config.cache_dir)
+    if not sock.exists():
+        return None
+    payload = {
+        "op": "check",
+        "config": config.model_dump(mode="json"),
+        "project_root": os.getcwd(),
+        "files": [os.path.abspath(p) for p in file_paths],
+        "jobs": jobs,
+        "incremental": incremental,
+        "changed": (
+            {path: lines.ranges for path, lines in changed_lines.items()}
+            if changed_lines is not None else None
+        ),
+    }
+    try:
+        response = await request(sock, payload, CHECK_TIMEOUT)
+        results = [ValidationResult.model_validate(r) for r in response["results"]]
+    except (DaemonError, KeyError, TypeError, ValueError) as exc:
+        logger.debug("Daemon unavailable, validating in-process: %s", exc)
+        return None
+    if len(results) != len(file_paths):
+        return None
+    for result, file_path in zip(results, file_paths, strict=True):
+        result.file = file_path
+        for issue in result.issues:
+            issue.location.file = file_path
+    return results
+
+
+def spawn_daemon(cache_dir: Path, idle_timeout: float) -> int:
+    """Start ``firewall daemon start --foreground`` detached; return its pid.
+
+    Waits until the new daemon answers, logging to ``cache_dir/daemon.log``.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_dir / LOG_NAME, "ab") as log:
+        proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "hallucination_firewall.cli", "daemon", "start",
+                "--foreground", "--idle-timeout", str(idle_timeout),
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    sock = socket_path(cache_dir)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise DaemonError(f"daemon exited with status {proc.returncode}")
+        if asyncio.run(daemon_status(sock)) is not None:
+            return proc.pid
+        time.sleep(0.1)
+    raise DaemonError(f"daemon did not start within {START_TIMEOUT:.0f}s")
+
+
+class FirewallDaemon:
+    """Serves ``check``, ``status`` and ``stop`` requests on a Unix socket.
+
+    One ``ValidationPipeline`` is kept per distinct config and project root,
+    so Jedi worker processes, HTTP connection pools and in-memory caches
+    stay warm across requests. A pipeline evicted while requests still use
+    it is closed once the last of them finishes. Exits after
+    ``idle_timeout`` seconds without requests (never when 0).
+    """
+
+    def __init__(self, sock: Path, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        self.sock = sock
+        self.idle_timeout = idle_timeout
+        self.started_at = time.time()
+        self.requests = 0
+        self._active = 0
+        self._last_request = time.monotonic()
+        self._pipelines: dict[str, ValidationPipeline] = {}
+        # Requests currently using each pipeline
+        self._users: dict[ValidationPipeline, int] = {}
+        self._stop = asyncio.Event()
+
+    async def serve(self) -> None:
+        """Listen until stopped, idle for too long, or sent SIGTERM/SIGINT."""
+        if self.sock.exists():
+            if await daemon_status(self.sock) is not None:
+                raise DaemonError(f"a daemon is already listening on {self.sock}")
+            self.sock.unlink()  # left behind by a daemon that died
+        self.sock.parent.mkdir(parents=True, exist_ok=True)
+        server = await asyncio.start_unix_server(
+            self._handle, path=str(self.sock), limit=MAX_MESSAGE_BYTES,
+        )
+        os.chmod(self.sock, 0o600)
+        loop = asyncio.get_running_loop()
+        handled = []
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            # Only possible on the main thread of a Unix process
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                loop.add_signal_handler(sig, self._stop.set)
+                handled.append(sig)
+        logger.info("Firewall daemon %s listening on %s", os.getpid(), self.sock)
+        watchdog = asyncio.create_task(self._exit_when_idle())
+        try:
+            await self._stop.wait()
+        finally:
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+            watchdog.cancel()
+            server.close()
+            await server.wait_closed()
+            for pipeline in self._pipelines.values():
+                await pipeline.close()
+            self._pipelines.clear()
+            with contextlib.suppress(FileNotFoundError):
+                self.sock.unlink()
+            logger.info("Firewall daemon stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def _exit_when_idle(self) -> None:
+        if self.idle_timeout <= 0:
+            return
+        while True:
+            remaining = self._last_request + self.idle_timeout - time.monotonic()
+            if remaining <= 0 and not self._active:
+                logger.info("Idle for %.0fs, stopping", self.idle_timeout)
+                self._stop.set()
+                return
+            await asyncio.sleep(max(remaining, 1.0))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._active += 1
+        self.requests += 1
+        try:
+            try:
+                message = json.loads(await reader.readline())
+                response = await self._dispatch(message)
+            except Exception as exc:
+                logger.exception("Daemon request failed")
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        except OSError:
+            logger.debug("Client went away", exc_info=True)
+        finally:
+            writer.close()
+            self._active -= 1
+            self._last_request = time.monotonic()
+
+    async def _dispatch(self, message: dict[str, Any]) -> dict[str, Any]:
+        if message.get("version") != __version__:
+            client = message.get("version")
+            return {"error": f"daemon runs version {__version__}, client {client}"}
+        op = message.get("op")
+        if op == "status":
+            return {
+                "pid": os.getpid(),
+                "version": __version__,
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "requests": self.requests,
+                "pipelines": len(self._pipelines),
+            }
+        if op == "stop":
+            self._stop.set()
+            return {"stopping": True}
+        if op == "check":
+            return await self._check(message)
+        return {"error": f"unknown op {op!r}"}
+
+    async def _check(self, message: dict[str, Any]) -> dict[str, Any]:
+        config = FirewallConfig.model_validate(message["config"])
+        project_root = Path(message.get("project_root") or os.getcwd())
+        async with self._pipeline_for(config, project_root) as pipeline:
+            return await self._check_with(pipeline, config, message)
+
+    async def _check_with(
+        self, pipeline: ValidationPipeline, config: FirewallConfig, message: dict[str, Any],
+    ) -> dict[str, Any]:
+        from .pipeline.incremental import IncrementalStore
+
+        changed = message.get("changed")
+        changes = (
+            {
+                path: ChangedLines(None if ranges is None else [(a, b) for a, b in ranges])
+                for path, ranges in changed.items()
+            }
+            if changed is not None else None
+        )
+        store = None
+        if message.get("incremental"):
+            store = IncrementalStore(config.cache_dir, pipeline.config, pipeline.project_root)
+        results = await pipeline.validate_files(
+            message["files"], int(message.get("jobs", 1)), store, changes,
+        )
+        if store is not None:
+            store.save()
+        return {"results": [r.model_dump(mode="json") for r in results]}
+
+    @contextlib.asynccontextmanager
+    async def _pipeline_for(
+        self, config: FirewallConfig, project_root: Path,
+    ) -> AsyncIterator[ValidationPipeline]:
+        """The warm pipeline for ``config`` and ``project_root``, held for one request."""
+        from .pipeline.runner import ValidationPipeline
+
+        config.workers.use_pool()
+        key = f"{project_root}\0{config.model_dump_json(exclude={'exclude'})}"
+        pipeline = self._pipelines.pop(key, None)
+        if pipeline is None:
+            if len(self._pipelines) >= MAX_PIPELINES:
+                oldest = self._pipelines.pop(next(iter(self._pipelines)))
+                if oldest not in self._users:
+                    await oldest.close()
+            pipeline = ValidationPipeline(config, project_root=project_root)
+        self._pipelines[key] = pipeline  # most recently used last
+        self._users[pipeline] = self._users.get(pipeline, 0) + 1
+        try:
+            yield pipeline
+        finally:
+            self._users[pipeline] -= 1
+            if not self._users[pipeline]:
+                del self._users[pipeline]
+                if pipeline not in self._pipelines.values():  # evicted meanwhile
+                    await pipeline.close()
@@ -7,6 +7,8 @@ from pathlib import Path
 
 from pydantic import BaseModel, Field
 
+DEFAULT_POOL_WORKERS = 2  # Jedi worker processes for the server and daemon
+
 
 class Severity(str, Enum):
     """Severity level for validation issues."""
@@ -109,10 +111,23 @@ class FirewallConfig(BaseModel):
     severity_threshold: Severity = Severity.WARNING
     cache_ttl_seconds: int = 3600
     cache_dir: Path = Path.home() / ".cache" / "hallucination-firewall"
+    registry_cache_size: int = 4096
+    # Bounds on the registry cache database (0: unbounded); see RegistryCache.prune
+    registry_cache_max_entries: int = 100_000
+    registry_cache_max_mb: int = 256
     registries: RegistryConfig = Field(default_factory=lambda: RegistryConfig())
+    workers: WorkerConfig = Field(default_factory=lambda: WorkerConfig())
     fail_on_network_error: bool = False
     output_format: str = "terminal"
     ci_mode: bool = False
+    signature_cache_size: int = 4096
+    signature_cache_persist: bool = True
+    result_cache_size: int = 1024
+    result_cache_persist: bool = True
+    # Snippets per client IP per rate-limit window on /validate/batch
+    batch_item_limit: int = 10_000
+    # Gitignore-style patterns skipped when walking directories and globs
+    exclude: list[str] = []
 
 
 class RegistryConfig(BaseModel):
@@ -121,3 +136,18 @@ class RegistryConfig(BaseModel):
     pypi_enabled: bool = True
     npm_enabled: bool = True
     timeout_seconds: int = 10
+
+
+class WorkerConfig(BaseModel):
+    """Configuration for the signature inference worker pool."""
+
+    # Unset (the default for library use) or 0 runs inference on a thread in
+    # this process: a spawned pool re-imports the embedding program's
+    # __main__. The CLI, server and daemon use a pool (see ``use_pool``).
+    max_workers: int | None = None
+    timeout_seconds: float = 30.0
+
+    def use_pool(self, size: int = DEFAULT_POOL_WORKERS) -> None:
+        """Run inference in ``size`` worker processes unless a size was configured."""
+        if self.max_workers is None:
+            self.max_workers = size
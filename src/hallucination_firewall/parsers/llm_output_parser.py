@@ -110,6 +110,9 @@ async def validate_llm_output(
 
     pipeline = ValidationPipeline(config)  # type: ignore[arg-type]
     results: list[ValidationResult] = []
+    # Supported blocks are validated as one batch, sharing registry lookups
+    batch: list[tuple[str, str]] = []
+    batch_slots: list[int] = []
 
     try:
         for block in blocks:
@@ -128,8 +131,12 @@ async def validate_llm_output(
                 block.language, "txt"
             )
             file_name = f"<llm-block-{block.block_index}>.{ext}"
-            result = await pipeline.validate_code(block.code, file_name)
-            results.append(result)
+            batch_slots.append(len(results))
+            results.append(ValidationResult(file=file_name, language=block.language))
+            batch.append((block.code, file_name))
+
+        for slot, result in zip(batch_slots, await pipeline.validate_many(batch), strict=True):
+            results[slot] = result
     finally:
         await pipeline.close()
 
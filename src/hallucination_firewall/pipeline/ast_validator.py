@@ -4,9 +4,7 @@ from __future__ import annotations
 
 import logging
 
-import tree_sitter_javascript as tsjavascript
-import tree_sitter_python as tspython
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Node
 
 from ..models import (
     IssueType,
@@ -17,131 +15,151 @@ from ..models import (
 from ..models import (
     Language as LangEnum,
 )
+from .parsed_document import ParsedDocument
+from .parser_pool import GRAMMAR_MODULES
+from .ts_queries import capture_nodes, match_captures, node_text
 
 logger = logging.getLogger(__name__)
 
-# Initialize languages
-PY_LANGUAGE = Language(tspython.language())
-JS_LANGUAGE = Language(tsjavascript.language())
+# Cap on syntax issues reported per file; a badly broken file stops here
+MAX_SYNTAX_ISSUES = 50
 
-LANGUAGE_MAP = {
-    LangEnum.PYTHON: PY_LANGUAGE,
-    LangEnum.JAVASCRIPT: JS_LANGUAGE,
-    LangEnum.TYPESCRIPT: JS_LANGUAGE,  # basic JS parsing for TS
-}
+PYTHON_IMPORT_QUERY = """
+(import_statement name: (dotted_name) @module)
+(import_from_statement module_name: (dotted_name) @module)
+"""
 
+JS_IMPORT_QUERY = """
+(import_statement source: (string) @source)
+"""
 
-def validate_syntax(code: str, language: LangEnum, file_path: str) -> list[ValidationIssue]:
-    """Parse code with tree-sitter and report syntax errors."""
-    ts_lang = LANGUAGE_MAP.get(language)
-    if ts_lang is None:
+PYTHON_ALIAS_QUERY = """
+(import_statement
+  name: (aliased_import name: (dotted_name) @name alias: (identifier) @alias))
+(import_from_statement
+  module_name: (dotted_name) @module
+  name: (aliased_import name: (dotted_name) @name alias: (identifier) @alias))
+"""
+
+
+def validate_syntax(
+    code: str,
+    language: LangEnum,
+    file_path: str,
+    document: ParsedDocument | None = None,
+) -> list[ValidationIssue]:
+    """Parse code with tree-sitter and report syntax errors.
+
+    Pass ``document`` to reuse a tree already parsed by the pipeline.
+    """
+    if language not in GRAMMAR_MODULES:
         return []
 
     try:
-        parser = Parser(ts_lang)
-        tree = parser.parse(code.encode("utf-8"))
+        doc = document or ParsedDocument(code, language)
+        if doc.tree is None:
+            return []
 
         issues: list[ValidationIssue] = []
-        _collect_errors(tree.root_node, file_path, issues)
+        _collect_errors(doc.tree.root_node, file_path, issues)
         return issues
     except Exception:
         logger.exception("tree-sitter parsing failed for %s", file_path)
         return []
 
 
-def _collect_errors(node: Node, file_path: str, issues: list[ValidationIssue]) -> None:
-    """Recursively collect ERROR and MISSING nodes from tree-sitter AST."""
-    if node.type == "ERROR" or node.is_missing:
-        issues.append(
-            ValidationIssue(
-                severity=Severity.ERROR,
-                issue_type=IssueType.SYNTAX_ERROR,
-                location=SourceLocation(
-                    file=file_path,
-                    line=node.start_point[0] + 1,
-                    column=node.start_point[1],
-                    end_line=node.end_point[0] + 1,
-                    end_column=node.end_point[1],
-                ),
-                message=f"Syntax error: unexpected {node.type} node",
-                confidence=1.0,
-                source="tree-sitter",
+def _collect_errors(
+    node: Node,
+    file_path: str,
+    issues: list[ValidationIssue],
+    limit: int = MAX_SYNTAX_ISSUES,
+) -> None:
+    """Collect ERROR and MISSING nodes with an iterative pre-order cursor walk.
+
+    Subtrees whose ``has_error`` flag is false are skipped, so a clean tree
+    costs O(1). Collection stops once ``limit`` issues have been gathered.
+    """
+    if not node.has_error:
+        return
+
+    cursor = node.walk()
+    while True:
+        current = cursor.node
+        if current is not None and (current.type == "ERROR" or current.is_missing):
+            issues.append(
+                ValidationIssue(
+                    severity=Severity.ERROR,
+                    issue_type=IssueType.SYNTAX_ERROR,
+                    location=SourceLocation(
+                        file=file_path,
+                        line=current.start_point[0] + 1,
+                        column=current.start_point[1],
+                        end_line=current.end_point[0] + 1,
+                        end_column=current.end_point[1],
+                    ),
+                    message=f"Syntax error: unexpected {current.type} node",
+                    confidence=1.0,
+                    source="tree-sitter",
+                )
             )
-        )
+            if len(issues) >= limit:
+                logger.debug("Syntax issue limit (%d) reached for %s", limit, file_path)
+                return
 
-    for child in node.children:
-        _collect_errors(child, file_path, issues)
+        # Only descend into subtrees that contain an error
+        if current is not None and current.has_error and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
 
 
-def extract_imports(code: str, language: LangEnum) -> list[str]:
+def extract_imports(
+    code: str, language: LangEnum, document: ParsedDocument | None = None,
+) -> list[str]:
     """Extract import names from code using tree-sitter AST."""
-    ts_lang = LANGUAGE_MAP.get(language)
-    if ts_lang is None:
+    if language not in GRAMMAR_MODULES:
         return []
 
     try:
-        parser = Parser(ts_lang)
-        tree = parser.parse(code.encode("utf-8"))
-
-        imports: list[str] = []
-        if language == LangEnum.PYTHON:
-            _extract_python_imports(tree.root_node, imports)
-        elif language in (LangEnum.JAVASCRIPT, LangEnum.TYPESCRIPT):
-            _extract_js_imports(tree.root_node, imports)
-
-        return imports
+        doc = document or ParsedDocument(code, language)
+        return list(doc.imports)
     except Exception:
         logger.exception("Import extraction failed for language %s", language)
         return []
 
 
 def _extract_python_imports(node: Node, imports: list[str]) -> None:
-    """Extract Python import statements from AST."""
-    if node.type == "import_statement":
-        for child in node.children:
-            if child.type == "dotted_name":
-                # Get root package name (first identifier)
-                parts = child.text.decode("utf-8").split(".")
-                if parts:
-                    imports.append(parts[0])
-
-    elif node.type == "import_from_statement":
-        # from X import Y → extract X
-        for child in node.children:
-            if child.type == "dotted_name":
-                parts = child.text.decode("utf-8").split(".")
-                if parts:
-                    imports.append(parts[0])
-                break  # only first dotted_name is the module
-
-    for child in node.children:
-        _extract_python_imports(child, imports)
+    """Extract root package names of Python import statements."""
+    # import X.Y → X; from X.Y import Z → X (relative imports are skipped)
+    for module in capture_nodes(LangEnum.PYTHON, PYTHON_IMPORT_QUERY, node, "module"):
+        root = node_text(module).split(".")[0]
+        if root:
+            imports.append(root)
 
 
 def _extract_js_imports(node: Node, imports: list[str]) -> None:
     """Extract JavaScript/TypeScript import statements from AST."""
-    if node.type == "import_statement":
-        for child in node.children:
-            if child.type == "string":
-                raw = child.text.decode("utf-8").strip("'\"")
-                # Get package name (handle scoped packages)
-                if raw.startswith("@"):
-                    parts = raw.split("/")
-                    if len(parts) >= 2:
-                        imports.append(f"{parts[0]}/{parts[1]}")
-                elif not raw.startswith("."):
-                    imports.append(raw.split("/")[0])
-
-    for child in node.children:
-        _extract_js_imports(child, imports)
-
-
-def extract_import_aliases(code: str, language: LangEnum) -> dict[str, str]:
+    for source in capture_nodes(LangEnum.JAVASCRIPT, JS_IMPORT_QUERY, node, "source"):
+        raw = node_text(source).strip("'\"")
+        # Get package name (handle scoped packages)
+        if raw.startswith("@"):
+            parts = raw.split("/")
+            if len(parts) >= 2:
+                imports.append(f"{parts[0]}/{parts[1]}")
+        elif not raw.startswith("."):
+            imports.append(raw.split("/")[0])
+
+
+def extract_import_aliases(
+    code: str, language: LangEnum, document: ParsedDocument | None = None,
+) -> dict[str, str]:
     """Extract import alias mappings from code (e.g. 'pd' -> 'pandas').
 
     Args:
         code: Source code to analyze
         language: Programming language
+        document: Already-parsed document to reuse instead of re-parsing
 
     Returns:
         Dict mapping alias names to full module paths.
@@ -150,17 +168,12 @@ def extract_import_aliases(code: str, language: LangEnum) -> dict[str, str]:
     if language != LangEnum.PYTHON:
         return {}
 
-    ts_lang = LANGUAGE_MAP.get(language)
-    if ts_lang is None:
+    if language not in GRAMMAR_MODULES:
         return {}
 
     try:
-        parser = Parser(ts_lang)
-        tree = parser.parse(code.encode("utf-8"))
-
-        aliases: dict[str, str] = {}
-        _extract_python_aliases(tree.root_node, aliases)
-        return aliases
+        doc = document or ParsedDocument(code, language)
+        return dict(doc.aliases)
     except Exception:
         logger.exception("Alias extraction failed")
         return {}
@@ -173,40 +186,11 @@ def _extract_python_aliases(node: Node, aliases: dict[str, str]) -> None:
     - import pandas as pd -> {"pd": "pandas"}
     - from matplotlib import pyplot as plt -> {"plt": "matplotlib.pyplot"}
     """
-    if node.type == "import_statement":
-        # import X as Y
-        for child in node.children:
-            if child.type == "aliased_import":
-                # aliased_import has: dotted_name "as" identifier
-                module_node = child.child_by_field_name("name")
-                alias_node = child.child_by_field_name("alias")
-                if module_node and alias_node:
-                    module_name = module_node.text.decode("utf-8")
-                    alias_name = alias_node.text.decode("utf-8")
-                    aliases[alias_name] = module_name
-
-    elif node.type == "import_from_statement":
-        # from X import Y as Z
-        # Get the module name (X)
-        module_name = None
-        for child in node.children:
-            if child.type == "dotted_name":
-                module_name = child.text.decode("utf-8")
-                break
-
-        if module_name:
-            # Look for aliased imports in the import list
-            for child in node.children:
-                if child.type == "aliased_import":
-                    # aliased_import has: dotted_name "as" identifier
-                    name_node = child.child_by_field_name("name")
-                    alias_node = child.child_by_field_name("alias")
-                    if name_node and alias_node:
-                        imported_name = name_node.text.decode("utf-8")
-                        alias_name = alias_node.text.decode("utf-8")
-                        full_name = f"{module_name}.{imported_name}"
-                        aliases[alias_name] = full_name
-
-    # Recurse into children
-    for child in node.children:
-        _extract_python_aliases(child, aliases)
+    for captures in match_captures(LangEnum.PYTHON, PYTHON_ALIAS_QUERY, node):
+        name = node_text(captures["name"][0])
+        alias = node_text(captures["alias"][0])
+        if "module" in captures:
+            module_name = node_text(captures["module"][0])
+            aliases[alias] = f"{module_name}.{name}"
+        else:
+            aliases[alias] = name
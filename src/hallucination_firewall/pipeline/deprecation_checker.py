@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from ..models import (
     IssueType,
@@ -11,7 +12,10 @@ from ..models import (
     ValidationIssue,
 )
 from ..models import Language as LangEnum
-from .signature_checker import FunctionCallExtractor
+from .parsed_document import ParsedDocument
+
+if TYPE_CHECKING:
+    from ..utils.git_diff import ChangedLines
 
 
 @dataclass(frozen=True)
@@ -51,16 +55,26 @@ async def check_deprecations(
     code: str,
     language: LangEnum,
     file_path: str,
+    document: ParsedDocument | None = None,
+    changed: ChangedLines | None = None,
 ) -> list[ValidationIssue]:
     """Check code for deprecated API usage. Entry point for pipeline."""
     if language != LangEnum.PYTHON:
         return []
 
-    extractor = FunctionCallExtractor()
-    calls = extractor.extract_calls(code)
+    return find_deprecations(document or ParsedDocument(code, language), file_path, changed)
+
+
+def find_deprecations(
+    document: ParsedDocument, file_path: str, changed: ChangedLines | None = None,
+) -> list[ValidationIssue]:
+    """Synchronous core of ``check_deprecations``; safe to run on a worker thread.
+
+    With ``changed``, only calls overlapping those lines are checked.
+    """
     issues: list[ValidationIssue] = []
 
-    for call in calls:
+    for call in document.calls_in(changed):
         rule = PYTHON_DEPRECATIONS.get(call.name)
         if rule:
             issues.append(
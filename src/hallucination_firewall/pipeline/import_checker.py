@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 import importlib.util
 import sys
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
 
 from ..models import (
     IssueType,
@@ -31,41 +32,22 @@ JS_BUILTINS = frozenset({
 })
 
 
+@dataclass
+class ResolvedPackages:
+    """Package existence answers shared by every document in a batch."""
+
+    python: dict[str, bool] = field(default_factory=dict)
+    javascript: dict[str, bool] = field(default_factory=dict)
+
+
 async def check_python_imports(
     imports: list[str],
     file_path: str,
     pypi: PyPIRegistry,
 ) -> list[ValidationIssue]:
     """Check Python imports against stdlib, local install, and PyPI."""
-    sem = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
-
-    async def _check_one(package_name: str) -> ValidationIssue | None:
-        if package_name in PYTHON_STDLIB:
-            return None
-
-        # Check if installed locally
-        if importlib.util.find_spec(package_name) is not None:
-            return None
-
-        # Check PyPI with semaphore
-        async with sem:
-            exists = await pypi.package_exists(_normalize_pypi_name(package_name))
-
-        if not exists:
-            return ValidationIssue(
-                severity=Severity.ERROR,
-                issue_type=IssueType.NONEXISTENT_PACKAGE,
-                location=SourceLocation(file=file_path, line=0),
-                message=f"Package '{package_name}' not found on PyPI or locally",
-                suggestion="Check spelling. Similar packages may exist.",
-                confidence=0.9,
-                source="PyPI registry",
-            )
-        return None
-
-    tasks = [_check_one(pkg) for pkg in imports]
-    results = await asyncio.gather(*tasks)
-    return [issue for issue in results if issue is not None]
+    exists = await resolve_python_packages(imports, pypi)
+    return python_import_issues(imports, file_path, exists)
 
 
 async def check_js_imports(
@@ -74,32 +56,87 @@ async def check_js_imports(
     npm: NpmRegistry,
 ) -> list[ValidationIssue]:
     """Check JavaScript/TypeScript imports against Node.js builtins and npm."""
-    sem = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+    exists = await resolve_js_packages(imports, npm)
+    return js_import_issues(imports, file_path, exists)
 
-    async def _check_one(package_name: str) -> ValidationIssue | None:
+
+async def resolve_python_packages(
+    packages: Iterable[str],
+    pypi: PyPIRegistry,
+) -> dict[str, bool]:
+    """Decide once per unique package whether it is stdlib, installed, or on PyPI."""
+    answers: dict[str, bool] = {}
+    remote: dict[str, str] = {}  # import name -> PyPI name
+    for package_name in dict.fromkeys(packages):
+        if package_name in PYTHON_STDLIB or importlib.util.find_spec(package_name) is not None:
+            answers[package_name] = True
+        else:
+            remote[package_name] = _normalize_pypi_name(package_name)
+
+    # One cache round trip for every remaining package, then PyPI for the misses
+    exists = await pypi.package_exists_many(remote.values(), MAX_CONCURRENT_CHECKS)
+    answers.update((name, exists[pypi_name]) for name, pypi_name in remote.items())
+    return answers
+
+
+async def resolve_js_packages(
+    packages: Iterable[str],
+    npm: NpmRegistry,
+) -> dict[str, bool]:
+    """Decide once per unique package whether it is a Node.js builtin or on npm."""
+    answers: dict[str, bool] = {}
+    remote = []
+    for package_name in dict.fromkeys(packages):
         # Skip Node.js builtins (with or without node: prefix)
-        clean_name = package_name.removeprefix("node:")
-        if clean_name in JS_BUILTINS:
-            return None
-
-        async with sem:
-            exists = await npm.package_exists(package_name)
-
-        if not exists:
-            return ValidationIssue(
-                severity=Severity.ERROR,
-                issue_type=IssueType.NONEXISTENT_PACKAGE,
-                location=SourceLocation(file=file_path, line=0),
-                message=f"Package '{package_name}' not found on npm",
-                suggestion="Check spelling or verify the package name.",
-                confidence=0.9,
-                source="npm registry",
-            )
-        return None
-
-    tasks = [_check_one(pkg) for pkg in imports]
-    results = await asyncio.gather(*tasks)
-    return [issue for issue in results if issue is not None]
+        if package_name.removeprefix("node:") in JS_BUILTINS:
+            answers[package_name] = True
+        else:
+            remote.append(package_name)
+
+    answers.update(await npm.package_exists_many(remote, MAX_CONCURRENT_CHECKS))
+    return answers
+
+
+def python_import_issues(
+    imports: list[str],
+    file_path: str,
+    exists: Mapping[str, bool],
+) -> list[ValidationIssue]:
+    """Build issues for imports resolved as nonexistent (unknown ones pass)."""
+    return [
+        ValidationIssue(
+            severity=Severity.ERROR,
+            issue_type=IssueType.NONEXISTENT_PACKAGE,
+            location=SourceLocation(file=file_path, line=0),
+            message=f"Package '{package_name}' not found on PyPI or locally",
+            suggestion="Check spelling. Similar packages may exist.",
+            confidence=0.9,
+            source="PyPI registry",
+        )
+        for package_name in imports
+        if not exists.get(package_name, True)
+    ]
+
+
+def js_import_issues(
+    imports: list[str],
+    file_path: str,
+    exists: Mapping[str, bool],
+) -> list[ValidationIssue]:
+    """Build issues for imports resolved as nonexistent (unknown ones pass)."""
+    return [
+        ValidationIssue(
+            severity=Severity.ERROR,
+            issue_type=IssueType.NONEXISTENT_PACKAGE,
+            location=SourceLocation(file=file_path, line=0),
+            message=f"Package '{package_name}' not found on npm",
+            suggestion="Check spelling or verify the package name.",
+            confidence=0.9,
+            source="npm registry",
+        )
+        for package_name in imports
+        if not exists.get(package_name, True)
+    ]
 
 
 def _normalize_pypi_name(name: str) -> str:
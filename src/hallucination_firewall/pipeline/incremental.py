@@ -0,0 +1,239 @@
+"""Per-file fingerprint store backing ``firewall check --incremental``."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..models import FirewallConfig, ValidationResult
+from .result_cache import config_fingerprint, dependency_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# A file modified this close to (or after) its check may have changed again
+# within the same mtime tick, so its stat data alone is not trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class FileFingerprint:
+    """What a file looked like when it was checked."""
+
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+@dataclass
+class _Entry:
+    fingerprint: FileFingerprint
+    config_hash: str
+    expires_at: float
+    checked_at_ns: int
+    result_json: str
+    # The file's python_dependencies and their fingerprint when it was checked
+    dependencies: list[str]
+    dependency_hash: str
+
+
+class IncrementalStore:
+    """Remembers each checked file's fingerprint and result between runs.
+
+    A file whose mtime and size are unchanged (or, failing that, whose
+    content hash is unchanged) under the same config fingerprint, and whose
+    imported packages and first-party modules are unchanged too (see
+    ``dependency_fingerprint``), has its stored result replayed instead of
+    being validated again. Results expire with the registry data they were
+    derived from. The whole table
+    is read on open and changes are written back by ``save``.
+    """
+
+    def __init__(
+        self, cache_dir: Path, config: FirewallConfig, project_root: Path | None = None,
+    ) -> None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "incremental.db"
+        self.config_hash = config_fingerprint(config)
+        # Where first-party imports are looked up; None: the current directory
+        self.project_root = project_root
+        self.replayed = 0
+        self.validated = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._dirty: set[str] = set()
+        self._load()
+
+    def lookup(self, file_path: str) -> tuple[ValidationResult | None, FileFingerprint | None]:
+        """Return the stored result if ``file_path`` is unchanged, plus its fingerprint.
+
+        The fingerprint is None when the file cannot be read; such files are
+        left to the pipeline, which reports the error.
+        """
+        key = os.path.abspath(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None, None
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and (
+            entry.config_hash != self.config_hash
+            or entry.expires_at <= time.time()
+            or not self._dependencies_unchanged(entry, key)
+        ):
+            entry = None
+        if (
+            entry is not None
+            and entry.fingerprint.mtime_ns == st.st_mtime_ns
+            and entry.fingerprint.size == st.st_size
+            and entry.checked_at_ns - st.st_mtime_ns > RACY_WINDOW_NS
+        ):
+            return self._replay(entry, file_path), entry.fingerprint
+
+        try:
+            with open(key, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None, None
+        fingerprint = FileFingerprint(st.st_mtime_ns, st.st_size, content_hash)
+        if entry is not None and entry.fingerprint.content_hash == content_hash:
+            # Same content under a new mtime (e.g. a fresh checkout): refresh stat data
+            with self._lock:
+                entry.fingerprint = fingerprint
+                entry.checked_at_ns = time.time_ns()
+                self._dirty.add(key)
+            return self._replay(entry, file_path), fingerprint
+        return None, fingerprint
+
+    def record(
+        self,
+        file_path: str,
+        fingerprint: FileFingerprint,
+        result: ValidationResult,
+        expires_at: float,
+        dependencies: list[str] | None = None,
+        dependency_hash: str = "",
+    ) -> None:
+        """Remember ``result`` for the file content described by ``fingerprint``.
+
+        ``dependencies`` and ``dependency_hash`` are the file's
+        ``python_dependencies`` and their ``dependency_fingerprint`` as
+        validated; a later change to them invalidates the entry.
+        """
+        key = os.path.abspath(file_path)
+        entry = _Entry(
+            fingerprint=fingerprint,
+            config_hash=self.config_hash,
+            expires_at=expires_at,
+            checked_at_ns=time.time_ns(),
+            result_json=result.model_dump_json(),
+            dependencies=list(dependencies or []),
+            dependency_hash=dependency_hash,
+        )
+        with self._lock:
+            self.validated += 1
+            self._entries[key] = entry
+            self._dirty.add(key)
+
+    def save(self) -> None:
+        """Write new and refreshed entries back to disk."""
+        with self._lock:
+            rows = [
+                (
+                    key,
+                    e.fingerprint.mtime_ns,
+                    e.fingerprint.size,
+                    e.fingerprint.content_hash,
+                    e.config_hash,
+                    e.expires_at,
+                    e.checked_at_ns,
+                    e.result_json,
+                    json.dumps(e.dependencies),
+                    e.dependency_hash,
+                )
+                for key, e in ((k, self._entries[k]) for k in self._dirty)
+            ]
+            self._dirty.clear()
+        if not rows:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows,
+                )
+        except sqlite3.Error:
+            logger.warning("Could not save incremental state to %s", self.db_path, exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {"replayed": self.replayed, "validated": self.validated}
+
+    def _dependencies_unchanged(self, entry: _Entry, path: str) -> bool:
+        if not entry.dependency_hash:
+            return True  # not a Python file
+        root = self.project_root or Path.cwd()
+        return dependency_fingerprint(path, entry.dependencies, root) == entry.dependency_hash
+
+    def _replay(self, entry: _Entry, file_path: str) -> ValidationResult | None:
+        try:
+            result = ValidationResult.model_validate_json(entry.result_json)
+        except ValueError:
+            return None
+        # Report the path as spelled on this run, which may differ from the last
+        result.file = file_path
+        for issue in result.issues:
+            issue.location.file = file_path
+        with self._lock:
+            self.replayed += 1
+        return result
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _load(self) -> None:
+        try:
+            with self._connect() as conn:
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+                if columns and "dependency_hash" not in columns:
+                    # State from before dependencies were tracked; start over
+                    conn.execute("DROP TABLE files")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        config_hash TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        checked_at_ns INTEGER NOT NULL,
+                        result TEXT NOT NULL,
+                        dependencies TEXT NOT NULL,
+                        dependency_hash TEXT NOT NULL
+                    )
+                """)
+                rows = conn.execute("SELECT * FROM files").fetchall()
+        except sqlite3.Error:
+            logger.warning("Ignoring unreadable incremental state %s", self.db_path, exc_info=True)
+            return
+        for (
+            path, mtime_ns, size, content_hash, config_hash, expires_at, checked, result,
+            dependencies, dependency_hash,
+        ) in rows:
+            self._entries[path] = _Entry(
+                FileFingerprint(mtime_ns, size, content_hash),
+                config_hash,
+                expires_at,
+                checked,
+                result,
+                json.loads(dependencies),
+                dependency_hash,
+            )
@@ -0,0 +1,152 @@
+"""Parse-once document shared by every pipeline layer."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import InitVar, dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+from tree_sitter import Tree
+
+from ..models import Language as LangEnum
+from .parser_pool import GRAMMAR_MODULES, default_pool
+
+if TYPE_CHECKING:
+    from ..utils.git_diff import ChangedLines
+    from .signature_checker import FunctionCall
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParsedDocument:
+    """Source code parsed once with tree-sitter, plus lazily derived facts.
+
+    ``tree`` is None when the language is unsupported or parsing failed;
+    the derived properties then return empty results (fail open). Given a
+    ``previous`` version of the same file, tree-sitter reparses incrementally,
+    reusing the subtrees outside the edited region.
+    """
+
+    code: str
+    language: LangEnum
+    previous: InitVar[ParsedDocument | None] = None
+    source: bytes = field(init=False, repr=False)
+    tree: Tree | None = field(init=False, default=None, repr=False)
+
+    def __post_init__(self, previous: ParsedDocument | None) -> None:
+        self.source = self.code.encode("utf-8")
+        if self.language not in GRAMMAR_MODULES:
+            return
+        old_tree = None
+        if previous is not None and previous.tree is not None and (
+            previous.language == self.language
+        ):
+            old_tree = previous.tree.copy()  # the previous document keeps its own tree
+            _apply_edit(old_tree, previous.source, self.source)
+        try:
+            with default_pool.parser(self.language) as parser:
+                if old_tree is None:
+                    self.tree = parser.parse(self.source)
+                else:
+                    self.tree = parser.parse(self.source, old_tree)
+        except Exception:
+            logger.exception("tree-sitter parsing failed for language %s", self.language)
+
+    @cached_property
+    def imports(self) -> list[str]:
+        """Root package names imported by the document."""
+        from .ast_validator import _extract_js_imports, _extract_python_imports
+
+        imports: list[str] = []
+        if self.tree is None:
+            return imports
+        if self.language == LangEnum.PYTHON:
+            _extract_python_imports(self.tree.root_node, imports)
+        elif self.language in (LangEnum.JAVASCRIPT, LangEnum.TYPESCRIPT):
+            _extract_js_imports(self.tree.root_node, imports)
+        return imports
+
+    @cached_property
+    def aliases(self) -> dict[str, str]:
+        """Import alias mappings (Python only), e.g. ``{"pd": "pandas"}``."""
+        from .ast_validator import _extract_python_aliases
+
+        aliases: dict[str, str] = {}
+        if self.tree is None or self.language != LangEnum.PYTHON:
+            return aliases
+        _extract_python_aliases(self.tree.root_node, aliases)
+        return aliases
+
+    @cached_property
+    def calls(self) -> list[FunctionCall]:
+        """Checkable function calls (Python only)."""
+        from .signature_checker import FunctionCallExtractor
+
+        if self.tree is None or self.language != LangEnum.PYTHON:
+            return []
+        return FunctionCallExtractor().extract_from_tree(self.tree)
+
+    def analyze(self) -> None:
+        """Compute every derived property now, from one thread.
+
+        ``cached_property`` takes no lock and tree-sitter trees are not
+        thread-safe, so layers running concurrently must only read results.
+        """
+        self.imports
+        self.aliases
+        self.calls
+
+    def calls_in(self, changed: ChangedLines | None) -> list[FunctionCall]:
+        """Calls whose span overlaps ``changed``; every call when it is None."""
+        if changed is None:
+            return self.calls
+        return [
+            call for call in self.calls
+            if changed.overlaps(call.line + 1, max(call.line, call.end_line) + 1)
+        ]
+
+
+def _apply_edit(tree: Tree, old: bytes, new: bytes) -> None:
+    """Describe ``old`` → ``new`` to ``tree`` as one edit spanning every change."""
+    start = _common_prefix(old, new)
+    # The common suffix may not overlap the prefix in either version
+    suffix = _common_suffix(old[start:], new[start:])
+    tree.edit(
+        start_byte=start,
+        old_end_byte=len(old) - suffix,
+        new_end_byte=len(new) - suffix,
+        start_point=_point(old, start),
+        old_end_point=_point(old, len(old) - suffix),
+        new_end_point=_point(new, len(new) - suffix),
+    )
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """Length of the common prefix, by binary search over C-speed slice compares."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: bytes, b: bytes) -> int:
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:] == b[len(b) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _point(source: bytes, offset: int) -> tuple[int, int]:
+    """(row, byte column) of ``offset`` in ``source``."""
+    row = source.count(b"\n", 0, offset)
+    return row, offset - (source.rfind(b"\n", 0, offset) + 1)
@@ -0,0 +1,130 @@
+"""Thread-safe pool of reusable tree-sitter parsers, one free-list per language."""
+
+from __future__ import annotations
+
+import importlib
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+
+from tree_sitter import Language, Parser
+
+from ..models import Language as LangEnum
+
+# Grammar package per language, imported the first time that language is parsed
+GRAMMAR_MODULES = {
+    LangEnum.PYTHON: "tree_sitter_python",
+    LangEnum.JAVASCRIPT: "tree_sitter_javascript",
+    LangEnum.TYPESCRIPT: "tree_sitter_javascript",  # basic JS parsing for TS
+}
+
+
+def ts_language(language: LangEnum) -> Language:
+    """The tree-sitter grammar for a supported ``language``, loaded on first use."""
+    return _load_grammar(GRAMMAR_MODULES[language])
+
+
+@cache
+def _load_grammar(module: str) -> Language:
+    return Language(importlib.import_module(module).language())
+
+
+# Upper bound on live parsers per language; further checkouts wait for a checkin
+DEFAULT_MAX_PER_LANGUAGE = max(4, (os.cpu_count() or 1) * 2)
+
+
+@dataclass
+class _LanguagePool:
+    """Free-list and counters for one language."""
+
+    idle: list[Parser] = field(default_factory=list)
+    created: int = 0
+    in_use: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+
+
+class ParserPool:
+    """Checkout/checkin pool so parsers are reused instead of built per call.
+
+    A ``tree_sitter.Parser`` is not safe to share between threads, so each
+    checkout gets exclusive use of one parser until it is returned.
+    """
+
+    def __init__(self, max_per_language: int = DEFAULT_MAX_PER_LANGUAGE) -> None:
+        self.max_per_language = max_per_language
+        self._pools: dict[LangEnum, _LanguagePool] = {}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def parser(self, language: LangEnum) -> Iterator[Parser]:
+        """Borrow a parser for ``language``; it is returned when the block exits."""
+        ts_lang = ts_language(language)
+        parser = self._checkout(language, ts_lang)
+        try:
+            yield parser
+        except BaseException:
+            parser.reset()  # drop any half-finished parse state before reuse
+            raise
+        finally:
+            self._checkin(language, parser)
+
+    def _checkout(self, language: LangEnum, ts_lang: Language) -> Parser:
+        with self._cond:
+            pool = self._pools.setdefault(language, _LanguagePool())
+            pool.checkouts += 1
+            if not pool.idle and pool.created >= self.max_per_language:
+                pool.waits += 1
+                started = time.perf_counter()
+                while not pool.idle:
+                    self._cond.wait()
+                pool.wait_seconds += time.perf_counter() - started
+            if pool.idle:
+                parser = pool.idle.pop()
+            else:
+                pool.created += 1
+                parser = None
+            pool.in_use += 1
+
+        if parser is None:
+            try:
+                parser = Parser(ts_lang)
+            except BaseException:
+                with self._cond:
+                    pool.created -= 1
+                    pool.in_use -= 1
+                    self._cond.notify()
+                raise
+        return parser
+
+    def _checkin(self, language: LangEnum, parser: Parser) -> None:
+        with self._cond:
+            pool = self._pools[language]
+            pool.in_use -= 1
+            pool.idle.append(parser)
+            self._cond.notify()
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-language pool size and contention counters."""
+        with self._cond:
+            return {
+                language.value: {
+                    "created": pool.created,
+                    "idle": len(pool.idle),
+                    "in_use": pool.in_use,
+                    "checkouts": pool.checkouts,
+                    "waits": pool.waits,
+                    "wait_ms": round(pool.wait_seconds * 1000, 2),
+                }
+                for language, pool in self._pools.items()
+            }
+
+
+# Process-wide pool shared by every pipeline module
+default_pool = ParserPool()
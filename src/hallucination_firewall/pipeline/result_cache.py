@@ -0,0 +1,219 @@
+"""Whole-file validation result cache keyed by content hash."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Literal
+
+from .. import __version__
+from ..models import FirewallConfig, Language, ValidationResult
+from ..registries.cache import RegistryCache, note_registry_read
+from ..utils.lru import MISSING, LRUCache, Missing
+from .deprecation_checker import PYTHON_DEPRECATIONS
+from .signature_cache import PYTHON_VERSION, UNKNOWN_VERSION, package_version
+
+logger = logging.getLogger(__name__)
+
+# Prefix for result entries stored in the registry cache database
+STORE_PREFIX = "result:"
+
+# Changes whenever the package or its deprecation rules change
+RULESET_VERSION = hashlib.sha256(
+    repr((__version__, sorted(PYTHON_DEPRECATIONS.items()))).encode("utf-8")
+).hexdigest()[:16]
+
+
+# Seconds a first-party module's newest mtime is reused, so checking many
+# files of one package does not walk that package once per file
+MTIME_TTL_SECONDS = 1.0
+
+_RELATIVE_IMPORT = re.compile(r"^[ \t]*from[ \t]+\.", re.MULTILINE)
+
+
+def config_fingerprint(config: FirewallConfig) -> str:
+    """Hash of the settings and rule-set version that affect validation results."""
+    # Worker settings and file discovery do not change a file's result
+    settings = config.model_dump_json(exclude={"workers", "exclude"})
+    return hashlib.sha256(f"{settings}\0{RULESET_VERSION}".encode()).hexdigest()
+
+
+def python_dependencies(code: str, imports: Iterable[str]) -> list[str]:
+    """Modules a Python file's result depends on besides its own code.
+
+    The imported root modules, plus ``"."`` (the file's own package) when
+    the code uses relative imports.
+    """
+    dependencies = sorted(set(imports))
+    if _RELATIVE_IMPORT.search(code):
+        dependencies.append(".")
+    return dependencies
+
+
+def dependency_fingerprint(file_path: str, dependencies: Iterable[str], root: Path) -> str:
+    """Describe the current state of a file's ``python_dependencies``.
+
+    Installed packages contribute their version; first-party modules, found
+    next to the file or under ``root`` (or ``root/src``), contribute the
+    newest modification time of their sources, and so does the file's own
+    package.
+    """
+    parts = [PYTHON_VERSION]
+    path = Path(file_path).absolute()
+    bases = [root, root / "src"]
+    if path.is_file():
+        bases.insert(0, path.parent)
+    for name in dependencies:
+        if name == ".":
+            if path.is_file():
+                parts.append(f".@{_newest_mtime(_package_root(path.parent))}")
+            continue
+        version = package_version(name)
+        if version == UNKNOWN_VERSION:
+            version = str(_first_party_mtime(name, bases))
+        parts.append(f"{name}@{version}")
+    return "\0".join(parts)
+
+
+_mtimes: LRUCache[Path, int] = LRUCache(1024, ttl_seconds=MTIME_TTL_SECONDS)
+
+
+def _first_party_mtime(name: str, bases: list[Path]) -> int:
+    """Newest mtime of the first-party module ``name``; 0 when it is not found."""
+    for base in bases:
+        module = base / f"{name}.py"
+        if module.is_file():
+            return module.stat().st_mtime_ns
+        if (base / name).is_dir():
+            return _newest_mtime(base / name)
+    return 0
+
+
+def _package_root(directory: Path) -> Path:
+    """The outermost package directory containing ``directory``."""
+    while directory.parent != directory and (directory.parent / "__init__.py").is_file():
+        directory = directory.parent
+    return directory
+
+
+def _newest_mtime(directory: Path) -> int:
+    """Newest mtime of the Python sources under ``directory``."""
+    newest = _mtimes.get(directory)
+    if newest is MISSING:
+        newest = 0
+        for parent, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+            for name in files:
+                if name.endswith((".py", ".pyi")):
+                    try:
+                        mtime = os.stat(os.path.join(parent, name)).st_mtime_ns
+                    except OSError:
+                        continue
+                    newest = max(newest, mtime)
+        _mtimes.set(directory, newest)
+    return newest
+
+
+class ResultCache:
+    """Two-level cache of ``ValidationResult`` objects.
+
+    Keys hash the code, file path, language, effective config, rule-set
+    version, the file's dependencies (see ``dependency_fingerprint``) and
+    the registry cache epoch, so any change to the inputs (or to a package
+    existence answer) misses. Each entry also carries an expiry:
+    the time the oldest registry entry it was derived from expires. When
+    ``persist`` is set, entries are also kept in the registry cache SQLite
+    file and survive restarts.
+    """
+
+    def __init__(self, max_size: int, registry: RegistryCache, persist: bool = True) -> None:
+        self.registry = registry
+        self.persist = persist
+        self._memory: LRUCache[str, tuple[ValidationResult, float]] = LRUCache(max_size)
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def key_for(
+        self,
+        code: str,
+        file_path: str,
+        language: Language,
+        config: FirewallConfig,
+        scope: str = "",
+        dependencies: str = "",
+    ) -> str:
+        """Hash every input that can change a file's validation result.
+
+        ``scope`` narrows what was checked (e.g. changed line ranges);
+        ``dependencies`` is the file's ``dependency_fingerprint``.
+        """
+        digest = hashlib.sha256()
+        for part in (
+            code,
+            file_path,
+            language.value,
+            config_fingerprint(config),
+            str(self.registry.epoch),
+            scope,
+            dependencies,
+        ):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> ValidationResult | None:
+        """Return a copy of the cached result, or None if absent or expired."""
+        entry = self._memory.get(key)
+        from_store = entry is MISSING and self.persist
+        if from_store:
+            entry = await self._load(key)
+        if entry is MISSING or entry[1] <= time.time():
+            self.misses += 1
+            return None
+        self.hits += 1
+        if from_store:
+            self.persistent_hits += 1
+        # Callers tracking registry reads inherit this entry's expiry
+        note_registry_read(entry[1] - self.registry.ttl_seconds)
+        return entry[0].model_copy(deep=True)
+
+    async def set(self, key: str, result: ValidationResult, expires_at: float) -> None:
+        """Store ``result`` until ``expires_at`` (a Unix timestamp)."""
+        self._memory.set(key, (result.model_copy(deep=True), expires_at))
+        if self.persist:
+            try:
+                await self.registry.aset(
+                    STORE_PREFIX + key,
+                    {"expires_at": expires_at, "result": result.model_dump(mode="json")},
+                )
+            except Exception:
+                logger.debug("Could not persist result for %s", result.file, exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for metrics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._memory),
+            "max_size": self._memory.max_size,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0,
+        }
+
+    async def _load(self, key: str) -> tuple[ValidationResult, float] | Literal[Missing.MISSING]:
+        raw = await self.registry.aget(STORE_PREFIX + key)
+        if raw is None:
+            return MISSING
+        try:
+            entry = (ValidationResult.model_validate(raw["result"]), float(raw["expires_at"]))
+        except (KeyError, TypeError, ValueError):
+            return MISSING
+        self._memory.set(key, entry)
+        return entry
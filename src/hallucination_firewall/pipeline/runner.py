@@ -1,7 +1,12 @@
-"""Pipeline orchestrator — runs validation stages in sequence."""
+"""Pipeline orchestrator — runs syntax validation, then the remaining layers concurrently."""
 
 from __future__ import annotations
 
+import asyncio
+import os
+from collections.abc import Awaitable, Iterable, Mapping, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -15,23 +20,57 @@ from ..models import (
     ValidationIssue,
     ValidationResult,
 )
-from ..registries.cache import RegistryCache
+from ..registries.cache import RegistryCache, track_registry_reads
 from ..registries.npm_registry import NpmRegistry
 from ..registries.pypi_registry import PyPIRegistry
+from ..utils.git_diff import ChangedLines
 from ..utils.language_detector import detect_language
 from .ast_validator import extract_imports, validate_syntax
-from .deprecation_checker import check_deprecations
-from .import_checker import check_js_imports, check_python_imports
+from .deprecation_checker import find_deprecations
+from .import_checker import (
+    ResolvedPackages,
+    check_js_imports,
+    check_python_imports,
+    js_import_issues,
+    python_import_issues,
+    resolve_js_packages,
+    resolve_python_packages,
+)
+from .incremental import IncrementalStore
+from .parsed_document import ParsedDocument
+from .result_cache import ResultCache, dependency_fingerprint, python_dependencies
+from .signature_cache import SignatureCache
 from .signature_checker import check_signatures
+from .signature_workers import SignatureResolver
+from .stdlib_index import default_index_path
+from .timing import LayerTimings
 
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
 
 
+@dataclass
+class _Dependencies:
+    """A validated file's ``python_dependencies`` and their fingerprint."""
+
+    names: list[str] = field(default_factory=list)
+    fingerprint: str = ""
+
+
+# Set while validating a file whose dependencies the caller wants to know
+_dependencies_seen: ContextVar[_Dependencies | None] = ContextVar(
+    "dependencies_seen", default=None,
+)
+
+
 class ValidationPipeline:
     """Orchestrates the multi-layer validation pipeline."""
 
-    def __init__(self, config: FirewallConfig | None = None) -> None:
+    def __init__(
+        self, config: FirewallConfig | None = None, project_root: Path | None = None,
+    ) -> None:
         self.config = config or load_config()
+        # Where first-party imports are looked up; None: the current directory
+        self.project_root = project_root
 
         # Apply strict CI policy overrides
         if self.config.ci_mode:
@@ -41,22 +80,150 @@ class ValidationPipeline:
         self.cache = RegistryCache(
             self.config.cache_dir,
             self.config.cache_ttl_seconds,
+            self.config.registry_cache_size,
+            self.config.registry_cache_max_entries,
+            self.config.registry_cache_max_mb * 1024 * 1024,
         )
         self.pypi = PyPIRegistry(self.config.registries, self.cache)
         self.npm = NpmRegistry(self.config.registries, self.cache)
+        self.signature_cache = SignatureCache(
+            self.config.signature_cache_size,
+            self.cache if self.config.signature_cache_persist else None,
+        )
+        # Jedi inference runs in worker processes, off the event loop.
+        # The stdlib index is built by `firewall index build-stdlib`.
+        self.signature_resolver = SignatureResolver(
+            self.config.workers,
+            stdlib_index_path=default_index_path(self.config.cache_dir),
+            stub_index_dir=self.config.cache_dir / "stub-index",
+            project_root=project_root,
+        )
+        self.result_cache = ResultCache(
+            self.config.result_cache_size,
+            self.cache,
+            persist=self.config.result_cache_persist,
+        )
+        self.timings = LayerTimings()
+        # When a dict (as in watch mode), each file's latest parse is kept so
+        # the next version of that file is reparsed incrementally
+        self.documents: dict[str, ParsedDocument] | None = None
 
-    async def validate_code(self, code: str, file_path: str = "<stdin>") -> ValidationResult:
-        """Run full validation pipeline on code string."""
+    async def validate_code(
+        self, code: str, file_path: str = "<stdin>", changed: ChangedLines | None = None,
+    ) -> ValidationResult:
+        """Run full validation pipeline on code string.
+
+        Byte-identical input under the same config is answered from the
+        result cache without running any layer. With ``changed``, the
+        signature and deprecation layers only check call sites on those
+        lines; the whole file is still parsed for context.
+        """
         language = detect_language(file_path)
+        # Parse once, off the event loop; the key needs the imports, and every
+        # layer reuses the same tree
+        doc = await asyncio.to_thread(self._parse, code, language, file_path)
+        key = await asyncio.to_thread(
+            self._result_key, code, file_path, language, doc, changed.key() if changed else "",
+        )
+        cached = await self.result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with track_registry_reads() as reads:
+            result = await self._run_layers(code, file_path, language, doc, changed=changed)
+        # Results that relied on a failed lookup (fail-open) are not reused
+        if reads.complete:
+            await self.result_cache.set(
+                key, result, reads.expires_at(self.config.cache_ttl_seconds),
+            )
+        return result
+
+    async def validate_many(self, items: Sequence[tuple[str, str]]) -> list[ValidationResult]:
+        """Validate ``(code, file_path)`` pairs as one unit of work.
+
+        All items are parsed first; the union of their imports is resolved
+        once per unique package, and the answers are shared by every item.
+        Results come back in input order.
+        """
+        ttl = self.config.cache_ttl_seconds
+        results: list[ValidationResult | None] = [None] * len(items)
+        pending: list[tuple[int, str, str, Language, str, ParsedDocument]] = []
+        for i, (code, file_path) in enumerate(items):
+            language = detect_language(file_path)
+            with self.timings.measure("parse"):
+                doc = await asyncio.to_thread(ParsedDocument, code, language)
+            key = await asyncio.to_thread(self._result_key, code, file_path, language, doc)
+            cached = await self.result_cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            pending.append((i, code, file_path, language, key, doc))
+
+        with track_registry_reads() as shared_reads, self.timings.measure("imports_batch"):
+            resolved = await self._resolve_packages(
+                [(code, language, doc) for _, code, _, language, _, doc in pending],
+            )
+
+        async def _one(
+            code: str, file_path: str, language: Language, key: str, doc: ParsedDocument,
+        ) -> ValidationResult:
+            with track_registry_reads() as reads:
+                result = await self._run_layers(code, file_path, language, doc, resolved)
+            if reads.complete and shared_reads.complete:
+                expires_at = min(reads.expires_at(ttl), shared_reads.expires_at(ttl))
+                await self.result_cache.set(key, result, expires_at)
+            return result
+
+        done = await asyncio.gather(*(_one(*item[1:]) for item in pending))
+        for item, result in zip(pending, done, strict=True):
+            results[item[0]] = result
+        return [r for r in results if r is not None]
+
+    async def _resolve_packages(
+        self, documents: list[tuple[str, Language, ParsedDocument]],
+    ) -> ResolvedPackages:
+        """Resolve the union of imports across syntactically valid documents."""
+        python: list[str] = []
+        javascript: list[str] = []
+        for code, language, doc in documents:
+            if doc.tree is None or doc.tree.root_node.has_error:
+                continue  # syntax layer stops these before imports
+            imports = extract_imports(code, language, document=doc)
+            if language == Language.PYTHON:
+                python.extend(imports)
+            elif language in (Language.JAVASCRIPT, Language.TYPESCRIPT):
+                javascript.extend(imports)
+
+        python_exists, js_exists = await asyncio.gather(
+            resolve_python_packages(python, self.pypi),
+            resolve_js_packages(javascript, self.npm),
+        )
+        return ResolvedPackages(python=python_exists, javascript=js_exists)
 
+    async def _run_layers(
+        self,
+        code: str,
+        file_path: str,
+        language: Language,
+        doc: ParsedDocument | None = None,
+        resolved: ResolvedPackages | None = None,
+        changed: ChangedLines | None = None,
+    ) -> ValidationResult:
         result = ValidationResult(
             file=file_path,
             language=language.value,
             checked_at=datetime.now(timezone.utc).isoformat(),
         )
 
+        # Parse once, off the event loop; every layer below reuses the same tree
+        if doc is None:
+            doc = await asyncio.to_thread(self._parse, code, language, file_path)
+
         # Layer 1: AST syntax validation
-        syntax_issues = validate_syntax(code, language, file_path)
+        with self.timings.measure("syntax"):
+            syntax_issues = await asyncio.to_thread(
+                validate_syntax, code, language, file_path, document=doc,
+            )
         result.issues.extend(syntax_issues)
 
         # If syntax errors, skip deeper checks (AST is unreliable)
@@ -64,32 +231,113 @@ class ValidationPipeline:
             result.passed = False
             return result
 
-        # Layer 2: Import/package existence check
-        imports = extract_imports(code, language)
-        if language == Language.PYTHON:
-            import_issues = await check_python_imports(imports, file_path, self.pypi)
-        elif language in (Language.JAVASCRIPT, Language.TYPESCRIPT):
-            import_issues = await check_js_imports(imports, file_path, self.npm)
-        else:
-            import_issues = []
+        # Layers 2-4 only read the parsed document, so they run concurrently:
+        # registry I/O overlaps the CPU-bound layers, which run on threads.
+        # The tree is walked once up front; issues keep layer order.
+        await asyncio.to_thread(doc.analyze)
+        layer_issues = await asyncio.gather(
+            self._timed(
+                "imports", self._check_imports(code, language, file_path, doc, resolved),
+            ),
+            self._timed(
+                "signatures", self._check_signatures(code, language, file_path, doc, changed),
+            ),
+            self._timed(
+                "deprecations", self._check_deprecations(language, file_path, doc, changed),
+            ),
+        )
+        for issues in layer_issues:
+            result.issues.extend(issues)
 
-        result.issues.extend(import_issues)
+        result.passed = result.error_count == 0
+        return result
 
-        # Layer 3: Signature validation
+    def _result_key(
+        self, code: str, file_path: str, language: Language, doc: ParsedDocument, scope: str = "",
+    ) -> str:
+        """Result cache key for ``code``, including what its Python imports resolve to."""
+        dependencies = ""
         if language == Language.PYTHON:
-            signature_issues = await check_signatures(code, language, file_path)
-            result.issues.extend(signature_issues)
+            names = python_dependencies(code, extract_imports(code, language, document=doc))
+            root = self.project_root or Path.cwd()
+            dependencies = dependency_fingerprint(file_path, names, root)
+            seen = _dependencies_seen.get()
+            if seen is not None:
+                seen.names, seen.fingerprint = names, dependencies
+        return self.result_cache.key_for(
+            code, file_path, language, self.config, scope, dependencies,
+        )
+
+    def _parse(self, code: str, language: Language, file_path: str) -> ParsedDocument:
+        with self.timings.measure("parse"):
+            if self.documents is None:
+                return ParsedDocument(code, language)
+            doc = ParsedDocument(code, language, self.documents.get(file_path))
+            self.documents[file_path] = doc
+            return doc
+
+    async def _timed(
+        self, layer: str, awaitable: Awaitable[list[ValidationIssue]],
+    ) -> list[ValidationIssue]:
+        with self.timings.measure(layer):
+            return await awaitable
 
-        # Layer 4: Deprecation detection
+    async def _check_imports(
+        self,
+        code: str,
+        language: Language,
+        file_path: str,
+        doc: ParsedDocument,
+        resolved: ResolvedPackages | None = None,
+    ) -> list[ValidationIssue]:
+        """Layer 2: Import/package existence check (``resolved`` answers from a batch)."""
+        imports = extract_imports(code, language, document=doc)
         if language == Language.PYTHON:
-            deprecation_issues = await check_deprecations(code, language, file_path)
-            result.issues.extend(deprecation_issues)
+            if resolved is not None:
+                return python_import_issues(imports, file_path, resolved.python)
+            return await check_python_imports(imports, file_path, self.pypi)
+        if language in (Language.JAVASCRIPT, Language.TYPESCRIPT):
+            if resolved is not None:
+                return js_import_issues(imports, file_path, resolved.javascript)
+            return await check_js_imports(imports, file_path, self.npm)
+        return []
 
-        result.passed = result.error_count == 0
-        return result
+    async def _check_signatures(
+        self,
+        code: str,
+        language: Language,
+        file_path: str,
+        doc: ParsedDocument,
+        changed: ChangedLines | None = None,
+    ) -> list[ValidationIssue]:
+        """Layer 3: Signature validation; Jedi itself runs in the resolver's pool."""
+        if language != Language.PYTHON:
+            return []
+        return await check_signatures(
+            code, language, file_path,
+            document=doc,
+            signature_cache=self.signature_cache,
+            resolver=self.signature_resolver,
+            timings=self.timings,
+            changed=changed,
+        )
 
-    async def validate_file(self, file_path: str) -> ValidationResult:
-        """Read and validate a file."""
+    async def _check_deprecations(
+        self,
+        language: Language,
+        file_path: str,
+        doc: ParsedDocument,
+        changed: ChangedLines | None = None,
+    ) -> list[ValidationIssue]:
+        """Layer 4: Deprecation detection."""
+        if language != Language.PYTHON:
+            return []
+        return await asyncio.to_thread(find_deprecations, doc, file_path, changed)
+
+    async def validate_file(
+        self, file_path: str, changed: ChangedLines | None = None,
+    ) -> ValidationResult:
+        """Read and validate a file (``changed`` as for ``validate_code``)."""
         path = Path(file_path)
         if path.stat().st_size > MAX_FILE_SIZE:
             return ValidationResult(
@@ -109,8 +357,7 @@ class ValidationPipeline:
             )
 
         try:
-            with open(file_path, encoding="utf-8") as f:
-                code = f.read()
+            code = await asyncio.to_thread(path.read_text, encoding="utf-8")
         except (UnicodeDecodeError, ValueError) as exc:
             return ValidationResult(
                 file=file_path,
@@ -127,9 +374,81 @@ class ValidationPipeline:
                     ),
                 ],
             )
-        return await self.validate_code(code, file_path)
+        return await self.validate_code(code, file_path, changed)
+
+    async def validate_files(
+        self,
+        file_paths: Iterable[str],
+        jobs: int = 1,
+        incremental: IncrementalStore | None = None,
+        changed_lines: Mapping[str, ChangedLines] | None = None,
+    ) -> list[ValidationResult]:
+        """Validate files with at most ``jobs`` in flight; results keep input order.
+
+        ``file_paths`` is consumed lazily on a thread, so a slow iterator
+        (such as a directory walk) overlaps with validation of the files it
+        has already produced. With an ``incremental`` store, unchanged files
+        replay their previous result. ``changed_lines`` (keyed by absolute
+        path) limits the call-site layers of the files it lists.
+        """
+        jobs = max(1, jobs)
+        queue: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue(maxsize=jobs * 2)
+        results: dict[int, ValidationResult] = {}
+        paths = iter(file_paths)
+
+        async def _produce() -> None:
+            index = 0
+            while (file_path := await asyncio.to_thread(next, paths, None)) is not None:
+                await queue.put((index, file_path))
+                index += 1
+            for _ in range(jobs):
+                await queue.put(None)
+
+        def _changed(file_path: str) -> ChangedLines | None:
+            changed = (changed_lines or {}).get(os.path.abspath(file_path))
+            return None if changed is None or changed.whole_file else changed
+
+        async def _consume() -> None:
+            while (item := await queue.get()) is not None:
+                if incremental is None:
+                    results[item[0]] = await self.validate_file(item[1], _changed(item[1]))
+                else:
+                    results[item[0]] = await self._validate_file_incremental(
+                        item[1], incremental,
+                    )
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(_produce())
+                for _ in range(jobs):
+                    group.create_task(_consume())
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None  # as if files ran one by one
+        return [results[i] for i in range(len(results))]
+
+    async def _validate_file_incremental(
+        self, file_path: str, incremental: IncrementalStore,
+    ) -> ValidationResult:
+        replayed, fingerprint = await asyncio.to_thread(incremental.lookup, file_path)
+        if replayed is not None:
+            return replayed
+        dependencies = _Dependencies()
+        token = _dependencies_seen.set(dependencies)
+        try:
+            with track_registry_reads() as reads:
+                result = await self.validate_file(file_path)
+        finally:
+            _dependencies_seen.reset(token)
+        if fingerprint is not None and reads.complete:
+            expires_at = reads.expires_at(self.config.cache_ttl_seconds)
+            incremental.record(
+                file_path, fingerprint, result, expires_at,
+                dependencies.names, dependencies.fingerprint,
+            )
+        return result
 
     async def close(self) -> None:
-        """Clean up HTTP clients."""
+        """Clean up HTTP clients and cache connections."""
         await self.pypi.close()
         await self.npm.close()
+        await self.cache.aclose()  # flushes queued registry writes
@@ -0,0 +1,157 @@
+"""Memoized signature lookups keyed by fully-qualified name and version."""
+
+from __future__ import annotations
+
+import importlib.metadata
+import logging
+import sys
+from collections.abc import Mapping
+from dataclasses import asdict
+from typing import Any, Literal
+
+from ..registries.cache import RegistryCache
+from ..utils.lru import MISSING, LRUCache, Missing
+from .signature_checker import ParamInfo, SignatureInfo
+
+logger = logging.getLogger(__name__)
+
+PYTHON_VERSION = f"py{sys.version_info.major}.{sys.version_info.minor}"
+
+# Prefix for signature entries stored in the registry cache database; bumped
+# when lookups change so entries from older releases are not served
+STORE_PREFIX = "sig2:"
+
+# Seconds an installed package version is trusted before it is read again,
+# so a long-running server notices ``pip install -U``
+VERSION_TTL_SECONDS = 30.0
+UNKNOWN_VERSION = "unknown"
+
+
+class SignatureCache:
+    """Two-level cache of resolved signatures shared across documents.
+
+    Keys combine the resolved dotted name with the interpreter version and
+    the installed version of the name's top-level package, so an upgrade
+    never serves a stale signature. Names without a known version, such as
+    first-party modules that can be edited at any time, are not cached.
+    Negative results (no signature found) are cached too. When ``store`` is
+    given, entries are also persisted in the registry cache SQLite file and
+    survive restarts.
+    """
+
+    def __init__(self, max_size: int = 4096, store: RegistryCache | None = None) -> None:
+        self.store = store
+        self._memory: LRUCache[str, SignatureInfo | None] = LRUCache(max_size)
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def key_for(self, name: str) -> str | None:
+        """Build the version-qualified cache key for a resolved name.
+
+        None when the name's package has no known version, so it is not cached.
+        """
+        version = package_version(name.split(".", 1)[0])
+        if version == UNKNOWN_VERSION:
+            return None
+        return f"{PYTHON_VERSION}:{name}@{version}"
+
+    async def get(self, name: str) -> SignatureInfo | None | Literal[Missing.MISSING]:
+        """Return the cached signature (possibly None) or ``MISSING``."""
+        key = self.key_for(name)
+        if key is None:
+            self.misses += 1
+            return MISSING
+        value = self._memory.get(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+
+        if self.store is not None:
+            raw = await self.store.aget(STORE_PREFIX + key)
+            if raw is not None:
+                sig = _decode(raw)
+                self._memory.set(key, sig)
+                self.hits += 1
+                self.persistent_hits += 1
+                return sig
+
+        self.misses += 1
+        return MISSING
+
+    async def set(self, name: str, sig: SignatureInfo | None) -> None:
+        """Remember the lookup result for ``name``."""
+        key = self.key_for(name)
+        if key is None:
+            return
+        self._memory.set(key, sig)
+        if self.store is not None:
+            try:
+                await self.store.aset(STORE_PREFIX + key, _encode(sig))
+            except Exception:
+                logger.debug("Could not persist signature for %s", name, exc_info=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for metrics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._memory),
+            "max_size": self._memory.max_size,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0,
+        }
+
+
+_versions: LRUCache[str, str] = LRUCache(4096, ttl_seconds=VERSION_TTL_SECONDS)
+_distributions: LRUCache[None, Mapping[str, list[str]]] = LRUCache(
+    1, ttl_seconds=VERSION_TTL_SECONDS,
+)
+
+
+def package_version(module: str) -> str:
+    """Installed distribution version providing ``module``, or a stable marker.
+
+    Answers are reused for ``VERSION_TTL_SECONDS``.
+    """
+    if module in sys.stdlib_module_names:
+        return "stdlib"
+    version = _versions.get(module)
+    if version is MISSING:
+        version = _read_version(module)
+        _versions.set(module, version)
+    return version
+
+
+def _read_version(module: str) -> str:
+    for dist in _module_distributions().get(module, []):
+        try:
+            return importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return UNKNOWN_VERSION
+
+
+def _module_distributions() -> Mapping[str, list[str]]:
+    mapping = _distributions.get(None)
+    if mapping is MISSING:
+        mapping = importlib.metadata.packages_distributions()
+        _distributions.set(None, mapping)
+    return mapping
+
+
+def _encode(sig: SignatureInfo | None) -> dict[str, Any]:
+    if sig is None:
+        return {"missing": True}
+    return asdict(sig)
+
+
+def _decode(raw: dict[str, Any]) -> SignatureInfo | None:
+    if raw.get("missing"):
+        return None
+    return SignatureInfo(
+        params=[ParamInfo(**p) for p in raw.get("params", [])],
+        has_var_positional=raw.get("has_var_positional", False),
+        has_var_keyword=raw.get("has_var_keyword", False),
+    )
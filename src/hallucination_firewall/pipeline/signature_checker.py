@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import inspect
 import logging
+import os
 from dataclasses import dataclass, field
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
-import jedi
-import tree_sitter_python as tspython
-from tree_sitter import Language, Parser
+from tree_sitter import Node, Tree
 
 from ..models import (
     IssueType,
@@ -17,10 +18,23 @@ from ..models import (
     ValidationIssue,
 )
 from ..models import Language as LangEnum
+from ..utils.lru import MISSING
+from .parsed_document import ParsedDocument
+from .ts_queries import capture_nodes, node_text
+
+if TYPE_CHECKING:
+    import jedi
+
+    from ..utils.git_diff import ChangedLines
+    from .signature_cache import SignatureCache
+    from .signature_workers import SignatureResolver
+    from .stdlib_index import StdlibIndex
+    from .stub_index import StubIndex
+    from .timing import LayerTimings
 
 logger = logging.getLogger(__name__)
 
-PY_LANGUAGE = Language(tspython.language())
+CALL_QUERY = "(call) @call"
 
 
 @dataclass
@@ -33,6 +47,8 @@ class FunctionCall:
     has_star_args: bool = False
     has_star_kwargs: bool = False
     line: int = 0
+    column: int = 0  # end of the function name, where the argument list opens
+    end_line: int = 0  # last line of the argument list
 
 
 @dataclass
@@ -56,29 +72,26 @@ class SignatureInfo:
 class FunctionCallExtractor:
     """Extract function calls from tree-sitter AST."""
 
-    def __init__(self) -> None:
-        self.parser = Parser(PY_LANGUAGE)
-
     def extract_calls(self, code: str) -> list[FunctionCall]:
         """Extract all function calls from Python code."""
-        tree = self.parser.parse(code.encode("utf-8"))
-        calls: list[FunctionCall] = []
-        self._walk(tree.root_node, calls)
-        return calls
+        doc = ParsedDocument(code, LangEnum.PYTHON)
+        if doc.tree is None:
+            return []
+        return self.extract_from_tree(doc.tree)
 
-    def _walk(self, node: object, calls: list[FunctionCall]) -> None:
-        """Recursively walk AST to find call nodes."""
-        if node.type == "call":  # type: ignore[union-attr]
+    def extract_from_tree(self, tree: Tree) -> list[FunctionCall]:
+        """Extract all function calls from an already-parsed Python tree."""
+        calls: list[FunctionCall] = []
+        for node in capture_nodes(LangEnum.PYTHON, CALL_QUERY, tree.root_node, "call"):
             call = self._parse_call(node)
             if call:
                 calls.append(call)
-        for child in node.children:  # type: ignore[union-attr]
-            self._walk(child, calls)
+        return calls
 
-    def _parse_call(self, node: object) -> FunctionCall | None:
+    def _parse_call(self, node: Node) -> FunctionCall | None:
         """Parse a call node into FunctionCall."""
-        func_node = node.child_by_field_name("function")  # type: ignore[union-attr]
-        args_node = node.child_by_field_name("arguments")  # type: ignore[union-attr]
+        func_node = node.child_by_field_name("function")
+        args_node = node.child_by_field_name("arguments")
         if not func_node:
             return None
 
@@ -92,11 +105,11 @@ class FunctionCallExtractor:
         has_star_kwargs = False
 
         if args_node:
-            for child in args_node.children:  # type: ignore[union-attr]
+            for child in args_node.children:
                 if child.type == "keyword_argument":
                     key_node = child.child_by_field_name("name")
                     if key_node:
-                        keywords.append(key_node.text.decode("utf-8"))
+                        keywords.append(node_text(key_node))
                 elif child.type == "list_splat":
                     has_star_args = True
                 elif child.type == "dictionary_splat":
@@ -110,21 +123,25 @@ class FunctionCallExtractor:
             keywords=keywords,
             has_star_args=has_star_args,
             has_star_kwargs=has_star_kwargs,
-            line=func_node.start_point[0],  # type: ignore[union-attr]
+            line=func_node.start_point[0],
+            column=func_node.end_point[1],
+            end_line=node.end_point[0],
         )
 
-    def _get_name(self, node: object) -> str:
-        """Get dotted function name from AST node."""
-        if node.type == "identifier":  # type: ignore[union-attr]
-            return node.text.decode("utf-8")  # type: ignore[union-attr]
-        if node.type == "attribute":  # type: ignore[union-attr]
-            obj = node.child_by_field_name("object")  # type: ignore[union-attr]
-            attr = node.child_by_field_name("attribute")  # type: ignore[union-attr]
-            if obj and attr:
-                obj_name = self._get_name(obj)
-                attr_name = attr.text.decode("utf-8")  # type: ignore[union-attr]
-                return f"{obj_name}.{attr_name}" if obj_name else attr_name
-        return ""
+    def _get_name(self, node: Node) -> str:
+        """Get dotted function name from AST node (iterative over attribute chains)."""
+        parts: list[str] = []
+        while node.type == "attribute":
+            obj = node.child_by_field_name("object")
+            attr = node.child_by_field_name("attribute")
+            if not (obj and attr):
+                break
+            parts.append(node_text(attr))
+            node = obj
+        else:
+            if node.type == "identifier":
+                parts.append(node_text(node))
+        return ".".join(reversed(parts))
 
     def _is_checkable(self, name: str) -> bool:
         """Filter out names unlikely to have resolvable signatures."""
@@ -134,26 +151,77 @@ class FunctionCallExtractor:
 
 
 class SignatureLookup:
-    """Look up function signatures using Jedi + inspect fallback."""
+    """Look up function signatures using offline indexes, Jedi + inspect fallback.
+
+    One instance serves one document: the ``jedi.Script`` built for the first
+    lookup is reused for every later call site in the same code.
+    """
 
-    def get_signature(self, func_name: str, code: str, line: int) -> SignatureInfo | None:
+    def __init__(
+        self,
+        project: jedi.Project | None = None,
+        stdlib_index: StdlibIndex | None = None,
+        imported_roots: set[str] | None = None,
+        stub_index: StubIndex | None = None,
+    ) -> None:
+        self.project = project
+        self.stdlib_index = stdlib_index
+        self.stub_index = stub_index
+        # When set, indexes only answer for names rooted at these modules
+        self.imported_roots = imported_roots
+        self._script: jedi.Script | None = None
+        self._script_code: str | None = None
+
+    def _get_script(self, code: str) -> jedi.Script:
+        """Return the Script for ``code``, building it only when the code changes."""
+        if self._script is None or self._script_code != code:
+            import jedi
+
+            project = self.project or _default_project(os.getcwd())
+            self._script = jedi.Script(code, project=project)
+            self._script_code = code
+        return self._script
+
+    def get_signature(
+        self, func_name: str, code: str, line: int, column: int = 0,
+    ) -> SignatureInfo | None:
         """Get signature for function at given location in code."""
-        # Try Jedi first
-        sig = self._jedi_lookup(func_name, code, line)
+        # Prebuilt stdlib index: no imports, no inference
+        sig = self._index_lookup(func_name)
+        if sig:
+            return sig
+        # Try Jedi next
+        sig = self._jedi_lookup(func_name, code, line, column)
         if sig:
             return sig
         # Fallback: inspect installed module
         return self._inspect_lookup(func_name)
 
-    def _jedi_lookup(self, func_name: str, code: str, line: int) -> SignatureInfo | None:
+    def _index_lookup(self, func_name: str) -> SignatureInfo | None:
+        """Answer from the offline indexes when the name's module is imported."""
+        if self.imported_roots is not None:
+            if func_name.split(".", 1)[0] not in self.imported_roots:
+                return None
+        if self.stdlib_index is not None:
+            sig = self.stdlib_index.get(func_name)
+            if sig is not None:
+                return sig
+        if self.stub_index is not None:
+            return self.stub_index.get(func_name)
+        return None
+
+    def _jedi_lookup(
+        self, func_name: str, code: str, line: int, column: int = 0,
+    ) -> SignatureInfo | None:
         """Use Jedi to resolve signature."""
         try:
-            script = jedi.Script(code)
-            # Find the call at line+1 (Jedi uses 1-indexed lines)
-            sigs = script.get_signatures(line + 1, 0)
+            script = self._get_script(code)
+            # Inside the call's parentheses (Jedi uses 1-indexed lines); at
+            # column 0 Jedi would answer for whichever call starts the line
+            sigs = script.get_signatures(line + 1, column + 1 if column else 0)
             if not sigs:
                 # Try goto to find the function definition
-                names = script.goto(line + 1, 0, follow_imports=True)
+                names = script.goto(line + 1, column, follow_imports=True)
                 if names:
                     for name in names:
                         try:
@@ -168,13 +236,13 @@ class SignatureLookup:
             logger.debug("Jedi lookup failed for %s", func_name)
             return None
 
-    def _jedi_sig_to_info(self, sig: object) -> SignatureInfo:
+    def _jedi_sig_to_info(self, sig: Any) -> SignatureInfo:
         """Convert Jedi signature to SignatureInfo."""
         params: list[ParamInfo] = []
         has_var_pos = False
         has_var_kw = False
 
-        for p in sig.params:  # type: ignore[union-attr]
+        for p in sig.params:
             kind = str(getattr(p, "kind", "POSITIONAL_OR_KEYWORD"))
             if "VAR_POSITIONAL" in kind:
                 has_var_pos = True
@@ -182,9 +250,10 @@ class SignatureLookup:
             if "VAR_KEYWORD" in kind:
                 has_var_kw = True
                 continue
-            required = not hasattr(p, "default") or p.description.find("=") == -1  # type: ignore[union-attr]
+            # Jedi params have no ``default`` attribute; defaults show in the description
+            required = "=" not in p.description
             params.append(ParamInfo(
-                name=p.name,  # type: ignore[union-attr]
+                name=p.name,
                 required=required,
                 kind=kind,
             ))
@@ -293,26 +362,78 @@ async def check_signatures(
     code: str,
     language: LangEnum,
     file_path: str,
+    document: ParsedDocument | None = None,
+    signature_cache: SignatureCache | None = None,
+    stdlib_index: StdlibIndex | None = None,
+    stub_index: StubIndex | None = None,
+    resolver: SignatureResolver | None = None,
+    timings: LayerTimings | None = None,
+    changed: ChangedLines | None = None,
 ) -> list[ValidationIssue]:
-    """Check function signatures in code. Entry point for pipeline."""
+    """Check function signatures in code. Entry point for pipeline.
+
+    With ``signature_cache``, calls on imported modules are memoized by their
+    resolved name, so repeat lookups skip Jedi entirely. ``stdlib_index`` and
+    ``stub_index`` answer stdlib and stubbed third-party calls before Jedi is
+    consulted. With ``resolver``, lookups run in its worker pool instead of
+    on the event loop. Each unique signature is resolved once and shared by
+    all of its call sites; ``timings`` records how many that saved. With
+    ``changed``, only call sites overlapping those lines are checked.
+    """
     if language != LangEnum.PYTHON:
         return []
 
     from .ast_validator import extract_import_aliases
 
-    extractor = FunctionCallExtractor()
-    lookup = SignatureLookup()
+    doc = document or ParsedDocument(code, language)
     validator = SignatureValidator()
 
-    calls = extractor.extract_calls(code)
-    aliases = extract_import_aliases(code, language)
+    calls = doc.calls_in(changed)
+    aliases = extract_import_aliases(code, language, document=doc)
+    imported = _imported_roots(doc.imports, aliases)
+    # Resolve aliases to real module names
+    names = [_resolve_alias(call.name, aliases) for call in calls]
+
+    # Group call sites that share one signature. A name rooted at an imported
+    # module means the same thing everywhere in the file; anything else
+    # (methods on local objects) depends on where it is called.
+    keys: list[str | tuple[str, int, int]] = [
+        name if name.split(".", 1)[0] in imported else (name, call.line, call.column)
+        for call, name in zip(calls, names, strict=True)
+    ]
+    first_site: dict[str | tuple[str, int, int], int] = {}
+    for i, key in enumerate(keys):
+        first_site.setdefault(key, i)
+    if timings is not None:
+        timings.record_signature_calls(len(calls), len(first_site))
+
+    resolved: dict[str | tuple[str, int, int], SignatureInfo | None] = {}
+    pending: list[str | tuple[str, int, int]] = []
+    for key in first_site:
+        # Only names rooted at an imported module are stable across documents
+        if signature_cache is not None and isinstance(key, str):
+            cached = await signature_cache.get(key)
+            if cached is not MISSING:
+                resolved[key] = cached
+                continue
+        pending.append(key)
+
+    if pending:
+        sites = [first_site[key] for key in pending]
+        targets = [(names[i], calls[i].line, calls[i].column) for i in sites]
+        if resolver is not None:
+            found = await resolver.resolve(code, targets, imported)
+        else:
+            found = resolve_signatures(code, targets, imported, stdlib_index, stub_index)
+        # None means the resolver gave up (timeout, dead worker): fail open
+        for key, sig in zip(pending, found or [], strict=False):
+            resolved[key] = sig
+            if signature_cache is not None and isinstance(key, str):
+                await signature_cache.set(key, sig)
+
+    sigs = [resolved.get(key) for key in keys]
     issues: list[ValidationIssue] = []
-
-    for call in calls:
-        # Resolve alias to real module name
-        resolved_name = _resolve_alias(call.name, aliases)
-
-        sig = lookup.get_signature(resolved_name, code, call.line)
+    for call, sig in zip(calls, sigs, strict=True):
         if not sig:
             continue  # Fail-open: skip unknown functions
 
@@ -330,6 +451,44 @@ async def check_signatures(
     return issues
 
 
+def resolve_signatures(
+    code: str,
+    targets: list[tuple[str, int, int]],
+    imported_roots: set[str],
+    stdlib_index: StdlibIndex | None = None,
+    stub_index: StubIndex | None = None,
+    project_root: str | None = None,
+) -> list[SignatureInfo | None]:
+    """Look up ``(resolved_name, line, column)`` targets against one shared Script.
+
+    Synchronous and picklable end to end, so it can run in a worker process.
+    Jedi resolves first-party imports against ``project_root`` (default: the
+    current directory).
+    """
+    lookup = SignatureLookup(
+        project=_default_project(project_root) if project_root else None,
+        stdlib_index=stdlib_index,
+        imported_roots=imported_roots,
+        stub_index=stub_index,
+    )
+    return [lookup.get_signature(name, code, line, column) for name, line, column in targets]
+
+
+@cache
+def _default_project(path: str) -> jedi.Project:
+    """One Jedi project per workspace directory for the whole process."""
+    import jedi
+
+    return jedi.get_default_project(path)
+
+
+def _imported_roots(imports: list[str], aliases: dict[str, str]) -> set[str]:
+    """Top-level module names bound by the document's import statements."""
+    roots = set(imports)
+    roots.update(target.split(".", 1)[0] for target in aliases.values())
+    return roots
+
+
 def _resolve_alias(call_name: str, aliases: dict[str, str]) -> str:
     """Resolve import alias to real module name.
 
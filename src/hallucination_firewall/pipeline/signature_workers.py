@@ -0,0 +1,220 @@
+"""Worker pool that runs Jedi signature inference off the event loop.
+
+Jedi inference is CPU-bound and synchronous; run inline it blocks every
+other request on the server's event loop. Lookups are sent in one batch per
+document to a ``ProcessPoolExecutor`` whose workers import Jedi, load the
+signature indexes on first use and prime Jedi's stdlib caches at startup.
+Stub indexes for newly imported packages are built by a separate, untimed
+job before the batch, so indexing a large package never counts against
+(or times out) the batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+from ..models import WorkerConfig
+from .signature_checker import SignatureInfo, resolve_signatures
+from .stdlib_index import load_stdlib_index
+from .stub_index import StubIndex
+
+logger = logging.getLogger(__name__)
+
+# Executors are shared per pool size across pipelines in one process
+_executors: dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+_WARMUP_CODE = "import os\nos.path.join('a', 'b')\n"
+
+
+class SignatureResolver:
+    """Dispatch batched signature lookups to worker processes.
+
+    With ``max_workers`` unset or 0 lookups run on a thread in this process
+    instead, which keeps the event loop free without extra processes.
+    A batch that exceeds ``timeout_seconds`` or hits a crashed worker
+    resolves to None and the caller fails open; a pool whose job timed out
+    is replaced, since the job would otherwise keep its worker busy.
+    """
+
+    def __init__(
+        self,
+        config: WorkerConfig,
+        stdlib_index_path: Path | None = None,
+        stub_index_dir: Path | None = None,
+        project_root: Path | None = None,
+    ) -> None:
+        self.config = config
+        self.stdlib_index_path = stdlib_index_path
+        self.stub_index_dir = stub_index_dir
+        # Workspace Jedi resolves first-party imports in; None: the current directory
+        self.project_root = project_root
+        self.batches = 0
+        self.timeouts = 0
+        self.failures = 0
+        # Roots whose stub indexes were already loaded or built
+        self._indexed_roots: set[str] = set()
+
+    async def resolve(
+        self,
+        code: str,
+        targets: list[tuple[str, int, int]],
+        imported_roots: set[str],
+    ) -> list[SignatureInfo | None] | None:
+        """Resolve ``(name, line, column)`` targets; None if the batch did not complete."""
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        executor = self._executor()
+        await self._prepare_stub_indexes(executor, imported_roots)
+        future = loop.run_in_executor(
+            executor, _resolve_with_indexes,
+            code, targets, imported_roots, self.stdlib_index_path, self.stub_index_dir,
+            str(self.project_root) if self.project_root else None,
+        )
+
+        try:
+            return await asyncio.wait_for(future, self.config.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(
+                "Signature inference timed out after %ss (%d targets)",
+                self.config.timeout_seconds, len(targets),
+            )
+            if executor is not None:
+                self._discard_executor(executor, terminate=True)
+        except BrokenProcessPool:
+            self.failures += 1
+            logger.warning("Signature worker crashed; restarting pool")
+            self._discard_executor(executor)
+        except Exception:
+            self.failures += 1
+            logger.debug("Signature inference failed", exc_info=True)
+        return None
+
+    async def _prepare_stub_indexes(
+        self, executor: ProcessPoolExecutor | None, roots: set[str],
+    ) -> None:
+        """Load or build stub indexes for roots not seen before, outside the batch timeout."""
+        new_roots = sorted(roots - self._indexed_roots)
+        if self.stub_index_dir is None or not new_roots:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                executor, _prepare_stub_index, self.stub_index_dir, new_roots,
+            )
+        except Exception:
+            # The batch still indexes lazily (and fails open) on its own
+            logger.debug("Preparing stub indexes failed", exc_info=True)
+            return
+        self._indexed_roots.update(new_roots)
+
+    def stats(self) -> dict[str, Any]:
+        """Return dispatch counters for metrics."""
+        return {
+            "max_workers": self.config.max_workers or 0,
+            "batches": self.batches,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+    def _executor(self) -> ProcessPoolExecutor | None:
+        """The shared process pool, or None to use the default thread pool."""
+        size = self.config.max_workers or 0
+        if size <= 0:
+            return None
+        with _executors_lock:
+            executor = _executors.get(size)
+            if executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=size,
+                    # spawn: forking a process that runs threads can deadlock
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                _executors[size] = executor
+            return executor
+
+    def _discard_executor(
+        self, executor: ProcessPoolExecutor | None = None, terminate: bool = False,
+    ) -> None:
+        """Shut down ``executor`` (default: the shared pool) so the next batch starts a new one.
+
+        ``terminate`` also kills its processes, stopping jobs still running.
+        """
+        size = self.config.max_workers or 0
+        with _executors_lock:
+            if executor is None:
+                executor = _executors.get(size)
+            if executor is None:
+                return
+            if _executors.get(size) is executor:  # not already replaced by another resolver
+                del _executors[size]
+        # ProcessPoolExecutor has no public way to stop a job that is running
+        processes = list((executor._processes or {}).values()) if terminate else []
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+
+def shutdown_worker_pools() -> None:
+    """Stop every shared worker pool (registered to run at exit)."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_worker_pools)
+
+
+_stub_indexes: dict[Path, StubIndex] = {}
+
+
+def _stub_index_for(index_dir: Path | None) -> StubIndex | None:
+    """One StubIndex per directory and process, reused across batches."""
+    if index_dir is None:
+        return None
+    index = _stub_indexes.get(index_dir)
+    if index is None:
+        index = _stub_indexes.setdefault(index_dir, StubIndex(index_dir))
+    return index
+
+
+def _prepare_stub_index(index_dir: Path, roots: list[str]) -> None:
+    """Load or build (and persist) the stub indexes for ``roots`` in this process."""
+    index = _stub_index_for(index_dir)
+    if index is not None:
+        index.prepare(roots)
+
+
+def _init_worker() -> None:
+    """Import Jedi and warm its stdlib caches once per worker process."""
+    try:
+        resolve_signatures(_WARMUP_CODE, [("os.path.join", 1, 12)], set())
+    except Exception:
+        logger.debug("Signature worker warm-up failed", exc_info=True)
+
+
+def _resolve_with_indexes(
+    code: str,
+    targets: list[tuple[str, int, int]],
+    imported_roots: set[str],
+    stdlib_index_path: Path | None,
+    stub_index_dir: Path | None,
+    project_root: str | None = None,
+) -> list[SignatureInfo | None]:
+    """Run a batch with the indexes at the given locations (loaded once per process)."""
+    stdlib_index = load_stdlib_index(stdlib_index_path) if stdlib_index_path else None
+    return resolve_signatures(
+        code, targets, imported_roots, stdlib_index, _stub_index_for(stub_index_dir),
+        project_root,
+    )
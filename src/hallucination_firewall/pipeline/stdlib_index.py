@@ -0,0 +1,209 @@
+"""Prebuilt offline index of standard-library signatures.
+
+Built once per interpreter with ``firewall index build-stdlib``; at runtime
+lookups are a dict access with no imports.
+"""
+
+from __future__ import annotations
+
+import gzip
+import inspect
+import json
+import logging
+import pkgutil
+import sys
+import warnings
+from collections.abc import Iterator
+from functools import cache
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from .signature_checker import ParamInfo, SignatureInfo, SignatureLookup
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+# Modules with import-time side effects, GUI toolkits, or the stdlib test suite
+EXCLUDED_MODULES = frozenset({
+    "antigravity", "this", "idlelib", "tkinter", "turtle", "turtledemo",
+    "test", "ensurepip", "pydoc_data", "lib2to3", "msilib", "winreg",
+    "winsound", "msvcrt", "_winapi",
+})
+
+# Packages whose submodules are implementation detail (codec tables)
+PACKAGES_WITHOUT_SUBMODULES = frozenset({"encodings"})
+
+# Bit flags stored per entry
+_VAR_POSITIONAL = 1
+_VAR_KEYWORD = 2
+
+
+def default_index_path(cache_dir: Path) -> Path:
+    """Location of the index for the running interpreter."""
+    return cache_dir / f"stdlib-index-py{PYTHON_VERSION}.json.gz"
+
+
+class StdlibIndex:
+    """Name → SignatureInfo mapping loaded from a prebuilt index file."""
+
+    def __init__(self, entries: dict[str, list[Any]]) -> None:
+        self._entries = entries
+        self._decoded: dict[str, SignatureInfo] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str) -> SignatureInfo | None:
+        """Return the indexed signature for a dotted name, if any."""
+        sig = self._decoded.get(name)
+        if sig is not None:
+            return sig
+        raw = self._entries.get(name)
+        if raw is None:
+            return None
+        flags, params = raw
+        sig = SignatureInfo(
+            params=[ParamInfo(name=p, required=bool(r)) for p, r in params],
+            has_var_positional=bool(flags & _VAR_POSITIONAL),
+            has_var_keyword=bool(flags & _VAR_KEYWORD),
+        )
+        self._decoded[name] = sig
+        return sig
+
+
+@cache
+def load_stdlib_index(path: Path) -> StdlibIndex | None:
+    """Load an index file once per process; None if missing or unusable."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable stdlib index at %s", path)
+        return None
+    if data.get("format") != INDEX_FORMAT_VERSION or data.get("python") != PYTHON_VERSION:
+        logger.warning("Ignoring stdlib index built for another interpreter: %s", path)
+        return None
+    return StdlibIndex(data["entries"])
+
+
+def build_stdlib_index(path: Path) -> int:
+    """Walk the standard library and write the index. Returns the entry count."""
+    converter = SignatureLookup()
+    entries: dict[str, list[Any]] = {}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for mod_name, module in _iter_stdlib_modules():
+            _index_namespace(mod_name, module, entries, converter)
+            # Submodules registered under an alias, e.g. os.path → posixpath
+            for attr, value in _public_members(module):
+                alias = f"{mod_name}.{attr}"
+                if (
+                    isinstance(value, ModuleType)
+                    and value.__name__ != alias
+                    and sys.modules.get(alias) is value
+                ):
+                    _index_namespace(alias, value, entries, converter)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"format": INDEX_FORMAT_VERSION, "python": PYTHON_VERSION, "entries": entries}
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"))
+    load_stdlib_index.cache_clear()
+    return len(entries)
+
+
+def _iter_stdlib_modules() -> Iterator[tuple[str, ModuleType]]:
+    """Yield importable public stdlib modules and their public submodules."""
+    for top in sorted(sys.stdlib_module_names):
+        if top.startswith("_") or top in EXCLUDED_MODULES:
+            continue
+        module = _safe_import(top)
+        if module is None:
+            continue
+        yield top, module
+        search_path = getattr(module, "__path__", None)
+        if search_path is None or top in PACKAGES_WITHOUT_SUBMODULES:
+            continue
+        for info in pkgutil.walk_packages(search_path, prefix=f"{top}.", onerror=lambda _: None):
+            parts = info.name.split(".")
+            if any(part.startswith("_") or part in ("test", "tests") for part in parts):
+                continue
+            submodule = _safe_import(info.name)
+            if submodule is not None:
+                yield info.name, submodule
+
+
+def _safe_import(name: str) -> ModuleType | None:
+    try:
+        __import__(name)
+        return sys.modules[name]
+    except BaseException:  # noqa: BLE001 - some modules raise SystemExit on import
+        logger.debug("Skipping stdlib module %s", name)
+        return None
+
+
+def _public_members(namespace: object) -> Iterator[tuple[str, Any]]:
+    for attr in dir(namespace):
+        if attr.startswith("_"):
+            continue
+        try:
+            yield attr, getattr(namespace, attr)
+        except Exception:
+            continue
+
+
+def _index_namespace(
+    prefix: str,
+    module: ModuleType,
+    entries: dict[str, list[Any]],
+    converter: SignatureLookup,
+) -> None:
+    """Record public callables of ``module`` and the public methods of its classes.
+
+    Only names the module exports (``__all__``) or defines itself are indexed,
+    so helpers it merely imports are not duplicated under every importer.
+    """
+    exported = getattr(module, "__all__", None)
+    for attr, value in _public_members(module):
+        if isinstance(value, ModuleType) or not callable(value):
+            continue
+        if exported is not None:
+            if attr not in exported:
+                continue
+        elif getattr(value, "__module__", None) != module.__name__:
+            continue
+        name = f"{prefix}.{attr}"
+        _add_entry(name, value, entries, converter)
+        if inspect.isclass(value):
+            # Own methods only; inherited ones would duplicate the base class entries
+            for method_name in vars(value):
+                method = getattr(value, method_name, None)
+                if (
+                    not method_name.startswith("_")
+                    and callable(method)
+                    and not inspect.isclass(method)
+                ):
+                    _add_entry(f"{name}.{method_name}", method, entries, converter)
+
+
+def _add_entry(
+    name: str, obj: object, entries: dict[str, list[Any]], converter: SignatureLookup,
+) -> None:
+    try:
+        sig = inspect.signature(obj)  # type: ignore[arg-type]
+    except Exception:
+        return  # no introspectable signature; Jedi handles these at runtime
+    info = converter._inspect_sig_to_info(sig)
+    flags = (_VAR_POSITIONAL if info.has_var_positional else 0) | (
+        _VAR_KEYWORD if info.has_var_keyword else 0
+    )
+    entries[name] = [flags, [[p.name, int(p.required)] for p in info.params]]
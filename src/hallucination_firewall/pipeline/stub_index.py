@@ -0,0 +1,414 @@
+"""Signature index for third-party packages built from ``.pyi`` stubs.
+
+Stubs come from, in order of preference: PEP 561 ``<pkg>-stubs`` packages,
+``py.typed`` packages in site-packages, and the typeshed copy bundled with
+Jedi. Only ``.pyi`` files are indexed: the ``.py`` sources of a ``py.typed``
+package define signatures at runtime too (decorators that rewrap
+functions, generated methods), which static parsing would get wrong, so
+those names are left to Jedi. Files are parsed with the same tree-sitter Python grammar as the rest
+of the pipeline. Each top-level package is indexed on first use and stored
+under ``index_dir``; it is re-indexed only when its installed version changes.
+"""
+
+from __future__ import annotations
+
+import importlib.metadata
+import importlib.util
+import json
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from tree_sitter import Node
+
+from ..models import Language as LangEnum
+from .parsed_document import ParsedDocument
+from .signature_cache import UNKNOWN_VERSION, package_version
+from .signature_checker import ParamInfo, SignatureInfo
+from .ts_queries import node_text
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 2  # 2: .py sources no longer indexed
+
+# Bounds on how much of one package is parsed
+MAX_FILES_PER_PACKAGE = 2000
+MAX_STUB_FILE_SIZE = 1024 * 1024  # 1 MB
+
+
+def _jedi_typeshed_dir() -> Path | None:
+    """Typeshed's third-party stubs bundled with Jedi, located without importing it."""
+    spec = importlib.util.find_spec("jedi")
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin).parent / "third_party" / "typeshed" / "third_party"
+
+
+TYPESHED_DIR = _jedi_typeshed_dir()
+TYPESHED_SUBDIRS = ("3", "2and3")
+
+# Marker for names defined more than once (overloads, version branches)
+_AMBIGUOUS: dict[str, Any] = {"ambiguous": True}
+
+
+class StubIndex:
+    """Name → SignatureInfo lookups backed by per-package stub indexes."""
+
+    def __init__(self, index_dir: Path, typeshed_dir: Path | None = TYPESHED_DIR) -> None:
+        self.index_dir = index_dir
+        self.typeshed_dir = typeshed_dir
+        self._packages: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> SignatureInfo | None:
+        """Return the stub signature for a dotted name, if one is unambiguous."""
+        root = name.split(".", 1)[0]
+        raw = self._entries_for(root).get(name)
+        if raw is None or raw.get("ambiguous"):
+            return None
+        return SignatureInfo(
+            params=[ParamInfo(**p) for p in raw["params"]],
+            has_var_positional=raw["has_var_positional"],
+            has_var_keyword=raw["has_var_keyword"],
+        )
+
+    def prepare(self, roots: Iterable[str]) -> None:
+        """Load or build the indexes for ``roots`` ahead of lookups."""
+        for root in roots:
+            self._entries_for(root)
+
+    def _entries_for(self, root: str) -> dict[str, Any]:
+        entries = self._packages.get(root)
+        if entries is not None:
+            return entries
+        with self._lock:
+            if root not in self._packages:
+                self._packages[root] = self._load_or_build(root)
+            return self._packages[root]
+
+    def _load_or_build(self, root: str) -> dict[str, Any]:
+        """Reuse the stored index when the stub provider's version is unchanged."""
+        source = self._find_stub_source(root)
+        if source is None:
+            return {}
+        stub_root, origin = source
+        # Key on the distribution shipping the .pyi files, not the runtime package
+        version = _stubs_version(root) if origin == "stubs" else package_version(root)
+        version = f"{origin}:{version}"
+        path = self.index_dir / f"{root}.json"
+
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+            if stored.get("format") == INDEX_FORMAT_VERSION and stored.get("version") == version:
+                return stored["entries"]  # type: ignore[no-any-return]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            logger.warning("Rebuilding unreadable stub index %s", path)
+
+        entries = index_package(root, stub_root)
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            payload = {"format": INDEX_FORMAT_VERSION, "version": version, "entries": entries}
+            path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        except OSError:
+            logger.debug("Could not persist stub index for %s", root, exc_info=True)
+        return entries
+
+    def _find_stub_source(self, root: str) -> tuple[Path, str] | None:
+        """Locate the directory (or single .pyi file) holding stubs for ``root``."""
+        try:
+            stubs_spec = importlib.util.find_spec(f"{root}-stubs")
+        except (ImportError, ValueError):
+            stubs_spec = None
+        if stubs_spec is not None and stubs_spec.submodule_search_locations:
+            return Path(list(stubs_spec.submodule_search_locations)[0]), "stubs"
+
+        try:
+            spec = importlib.util.find_spec(root)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is not None and spec.submodule_search_locations:
+            package_dir = Path(list(spec.submodule_search_locations)[0])
+            if (package_dir / "py.typed").exists():
+                return package_dir, "py.typed"
+
+        if self.typeshed_dir is not None:
+            for subdir in TYPESHED_SUBDIRS:
+                for candidate in (
+                    self.typeshed_dir / subdir / root,
+                    self.typeshed_dir / subdir / f"{root}.pyi",
+                ):
+                    if candidate.exists():
+                        return candidate, f"typeshed-jedi{importlib.metadata.version('jedi')}"
+        return None
+
+
+def _stubs_version(root: str) -> str:
+    """Version of the distribution installing ``<root>-stubs`` (e.g. types-<root>)."""
+    version = package_version(f"{root}-stubs")
+    if version != UNKNOWN_VERSION:
+        return version
+    # Stub-only wheels often lack top_level.txt, so try the conventional names
+    for dist in (f"{root}-stubs", f"types-{root}"):
+        try:
+            return importlib.metadata.version(dist)
+        except importlib.metadata.PackageNotFoundError:
+            continue
+    return UNKNOWN_VERSION
+
+
+def index_package(root: str, stub_root: Path) -> dict[str, Any]:
+    """Parse every stub module of one package into a flat name → entry map."""
+    modules: dict[str, _ModuleStubs] = {}
+    for module_name, path in _iter_stub_files(root, stub_root):
+        try:
+            code = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        doc = ParsedDocument(code, LangEnum.PYTHON)
+        if doc.tree is not None:
+            modules[module_name] = _parse_module(module_name, doc.tree.root_node)
+
+    entries: dict[str, Any] = {}
+    for stubs in modules.values():
+        entries.update(stubs.definitions)
+    _resolve_reexports(modules, entries)
+    return entries
+
+
+def _iter_stub_files(root: str, stub_root: Path) -> list[tuple[str, Path]]:
+    """Map the .pyi files under ``stub_root`` to module names."""
+    if stub_root.is_file():
+        return [(root, stub_root)]
+
+    chosen: dict[str, Path] = {}
+    for path in sorted(stub_root.rglob("*.pyi")):
+        if len(chosen) >= MAX_FILES_PER_PACKAGE:
+            break
+        rel = path.relative_to(stub_root).with_suffix("")
+        parts = [root, *rel.parts]
+        if parts[-1] == "__init__":
+            parts.pop()
+        if any(p.startswith("_") and p != "__init__" for p in parts[1:]):
+            continue
+        try:
+            if path.stat().st_size > MAX_STUB_FILE_SIZE:
+                continue
+        except OSError:
+            continue
+        chosen[".".join(parts)] = path
+    return sorted(chosen.items())
+
+
+class _ModuleStubs:
+    """Definitions and re-exports found in one stub module."""
+
+    def __init__(self) -> None:
+        self.definitions: dict[str, Any] = {}
+        # local name → (source module, source name); name "*" means star import
+        self.reexports: dict[str, tuple[str, str]] = {}
+        self.star_imports: list[str] = []
+
+
+def _parse_module(module_name: str, root: Node) -> _ModuleStubs:
+    stubs = _ModuleStubs()
+    for node in _top_level_statements(root):
+        if node.type in ("function_definition", "decorated_definition"):
+            _add_function(stubs.definitions, module_name, node, is_method=False)
+        elif node.type == "class_definition":
+            _add_class(stubs.definitions, module_name, node)
+        elif node.type == "import_from_statement":
+            _add_reexport(stubs, module_name, node)
+    return stubs
+
+
+def _top_level_statements(root: Node) -> list[Node]:
+    """Module statements, flattening ``if sys.version_info`` style branches."""
+    statements: list[Node] = []
+    pending = list(reversed(root.named_children))
+    while pending:
+        node = pending.pop()
+        if node.type == "if_statement":
+            blocks = [node.child_by_field_name("consequence")]
+            for clause in node.children_by_field_name("alternative"):
+                blocks.append(clause.child_by_field_name("consequence"))
+                blocks.append(clause.child_by_field_name("body"))
+            for block in reversed(blocks):
+                if block is not None:
+                    pending.extend(reversed(block.named_children))
+        else:
+            statements.append(node)
+    return statements
+
+
+def _add_function(
+    definitions: dict[str, Any], prefix: str, node: Node, is_method: bool,
+) -> str | None:
+    decorators: set[str] = set()
+    if node.type == "decorated_definition":
+        for dec in node.named_children:
+            if dec.type == "decorator":
+                decorators.add(node_text(dec).lstrip("@").strip())
+        node = node.child_by_field_name("definition")  # type: ignore[assignment]
+        if node is None or node.type != "function_definition":
+            return None
+
+    name_node = node.child_by_field_name("name")
+    params_node = node.child_by_field_name("parameters")
+    if name_node is None or params_node is None:
+        return None
+    name = node_text(name_node)
+    full_name = f"{prefix}.{name}"
+
+    if full_name in definitions or any(d.endswith("overload") for d in decorators):
+        definitions[full_name] = _AMBIGUOUS
+        return name
+    drop_first = is_method and "staticmethod" not in decorators
+    definitions[full_name] = asdict(_parse_parameters(params_node, drop_first))
+    return name
+
+
+def _add_class(definitions: dict[str, Any], module_name: str, node: Node) -> None:
+    name_node = node.child_by_field_name("name")
+    body = node.child_by_field_name("body")
+    if name_node is None or body is None:
+        return
+    class_name = f"{module_name}.{node_text(name_node)}"
+    for child in body.named_children:
+        if child.type not in ("function_definition", "decorated_definition"):
+            continue
+        method = _add_function(definitions, class_name, child, is_method=True)
+        if method == "__init__":
+            # Calling the class takes __init__'s parameters
+            definitions[class_name] = definitions[f"{class_name}.__init__"]
+    for key in [k for k in definitions if k.startswith(f"{class_name}._")]:
+        del definitions[key]
+
+
+def _add_reexport(stubs: _ModuleStubs, module_name: str, node: Node) -> None:
+    module_node = node.child_by_field_name("module_name")
+    if module_node is None:
+        return
+    source = _absolute_module(module_name, module_node)
+    if source is None:
+        return
+    if any(child.type == "wildcard_import" for child in node.named_children):
+        stubs.star_imports.append(source)
+        return
+    for child in node.children_by_field_name("name"):
+        if child.type == "aliased_import":
+            original = child.child_by_field_name("name")
+            alias = child.child_by_field_name("alias")
+            if original is None or alias is None:
+                continue
+            imported, local = node_text(original), node_text(alias)
+        else:
+            imported = local = node_text(child)
+        stubs.reexports[local] = (source, imported)
+
+
+def _absolute_module(module_name: str, module_node: Node) -> str | None:
+    """Resolve ``from .x import`` relative to the importing stub module."""
+    text = node_text(module_node)
+    if module_node.type != "relative_import":
+        return text
+    dots = len(text) - len(text.lstrip("."))
+    package = module_name.split(".")
+    # A package __init__ is its own package; a plain module's package is its parent
+    base = package[: len(package) - dots + 1] if dots else package
+    if not base:
+        return None
+    remainder = text[dots:]
+    return ".".join(base + ([remainder] if remainder else []))
+
+
+def _resolve_reexports(modules: dict[str, _ModuleStubs], entries: dict[str, Any]) -> None:
+    """Expose re-exported names (``from .api import get as get``) under the importer."""
+    for _ in range(4):  # re-export chains are short; bound the passes
+        changed = False
+        for module_name, stubs in modules.items():
+            for local, (source, imported) in stubs.reexports.items():
+                changed |= _alias_entries(
+                    entries, f"{source}.{imported}", f"{module_name}.{local}",
+                )
+            for source in stubs.star_imports:
+                prefix = f"{source}."
+                names = {
+                    key[len(prefix):].split(".", 1)[0]
+                    for key in entries if key.startswith(prefix)
+                }
+                for name in names:
+                    changed |= _alias_entries(entries, prefix + name, f"{module_name}.{name}")
+        if not changed:
+            break
+
+
+def _alias_entries(entries: dict[str, Any], source: str, alias: str) -> bool:
+    """Copy ``source`` and its members (class methods) under ``alias``."""
+    added = False
+    for key in [k for k in entries if k == source or k.startswith(source + ".")]:
+        alias_key = alias + key[len(source):]
+        if alias_key not in entries:
+            entries[alias_key] = entries[key]
+            added = True
+    return added
+
+
+def _parse_parameters(params: Node, drop_first: bool) -> SignatureInfo:
+    """Convert a tree-sitter ``parameters`` node into SignatureInfo."""
+    result: list[ParamInfo] = []
+    has_var_pos = False
+    has_var_kw = False
+    keyword_only = False
+    first = True
+
+    for child in params.named_children:
+        kind_node = child
+        if child.type == "typed_parameter" and child.named_children:
+            kind_node = child.named_children[0]
+
+        if kind_node.type == "list_splat_pattern":
+            has_var_pos = True
+            keyword_only = True
+            first = False
+            continue
+        if kind_node.type == "dictionary_splat_pattern":
+            has_var_kw = True
+            continue
+        if child.type == "keyword_separator":
+            keyword_only = True
+            continue
+        if child.type == "positional_separator":
+            for param in result:
+                param.kind = "POSITIONAL_ONLY"
+            continue
+
+        if child.type in ("default_parameter", "typed_default_parameter"):
+            name_node = child.child_by_field_name("name")
+            required = False
+        elif child.type == "typed_parameter":
+            name_node = kind_node
+            required = True
+        elif child.type == "identifier":
+            name_node = child
+            required = True
+        else:
+            continue
+        if name_node is None:
+            continue
+
+        if first and drop_first:
+            first = False
+            continue
+        first = False
+        result.append(ParamInfo(
+            name=node_text(name_node),
+            required=required,
+            kind="KEYWORD_ONLY" if keyword_only else "POSITIONAL_OR_KEYWORD",
+        ))
+
+    return SignatureInfo(params=result, has_var_positional=has_var_pos, has_var_keyword=has_var_kw)
@@ -0,0 +1,77 @@
+"""Per-layer wall-clock timings for the validation pipeline."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _LayerStat:
+    runs: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class LayerTimings:
+    """Accumulates wall-clock time per pipeline layer across runs.
+
+    Also counts signature call sites against the signatures actually
+    resolved for them, so the effect of call-site deduplication is visible.
+    """
+
+    def __init__(self) -> None:
+        self._layers: dict[str, _LayerStat] = {}
+        self.signature_calls_total = 0
+        self.signature_calls_unique = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, layer: str) -> Iterator[None]:
+        """Time the enclosed block and record it under ``layer``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(layer, (time.perf_counter() - start) * 1000)
+
+    def record(self, layer: str, elapsed_ms: float) -> None:
+        """Add one run of ``layer`` taking ``elapsed_ms``."""
+        with self._lock:
+            stat = self._layers.setdefault(layer, _LayerStat())
+            stat.runs += 1
+            stat.total_ms += elapsed_ms
+            stat.max_ms = max(stat.max_ms, elapsed_ms)
+
+    def record_signature_calls(self, total: int, unique: int) -> None:
+        """Count ``total`` call sites that needed ``unique`` signatures."""
+        with self._lock:
+            self.signature_calls_total += total
+            self.signature_calls_unique += unique
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-layer totals and the signature unique/total ratio."""
+        with self._lock:
+            layers = {
+                name: {
+                    "runs": stat.runs,
+                    "total_ms": round(stat.total_ms, 2),
+                    "avg_ms": round(stat.total_ms / stat.runs, 2),
+                    "max_ms": round(stat.max_ms, 2),
+                }
+                for name, stat in self._layers.items()
+            }
+            total = self.signature_calls_total
+            unique = self.signature_calls_unique
+        return {
+            "layers": layers,
+            "signature_calls": {
+                "total": total,
+                "unique": unique,
+                "unique_ratio": round(unique / total, 3) if total else 0,
+            },
+        }
@@ -0,0 +1,45 @@
+"""Compiled tree-sitter queries shared by the extraction layers."""
+
+from __future__ import annotations
+
+from functools import cache
+
+from tree_sitter import Node, Query, QueryCursor
+
+from ..models import Language as LangEnum
+from .parser_pool import ts_language
+
+
+@cache
+def compile_query(language: LangEnum, source: str) -> Query:
+    """Compile a query once per (language, source) and keep it for reuse."""
+    return Query(ts_language(language), source)
+
+
+def node_text(node: Node) -> str:
+    """Source text of ``node``; empty if the tree was parsed without its source bytes."""
+    return node.text.decode("utf-8") if node.text is not None else ""
+
+
+def capture_nodes(language: LangEnum, source: str, node: Node, name: str) -> list[Node]:
+    """Return nodes captured as ``@name`` under ``node`` in document order.
+
+    tree-sitter reports captures roughly by start position; sorting by
+    (start, -end) makes ancestors precede their descendants, matching a
+    pre-order walk.
+    """
+    captures = QueryCursor(compile_query(language, source)).captures(node)
+    return sorted(captures.get(name, []), key=lambda n: (n.start_byte, -n.end_byte))
+
+
+def match_captures(
+    language: LangEnum, source: str, node: Node,
+) -> list[dict[str, list[Node]]]:
+    """Return the capture dict of every match under ``node`` in document order."""
+    matches = QueryCursor(compile_query(language, source)).matches(node)
+    groups = [captures for _, captures in matches]
+    return sorted(groups, key=_match_start)
+
+
+def _match_start(captures: dict[str, list[Node]]) -> int:
+    return min(n.start_byte for nodes in captures.values() for n in nodes)
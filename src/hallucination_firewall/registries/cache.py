@@ -2,79 +2,681 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
 import logging
+import os
 import sqlite3
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+
+from ..utils.lru import MISSING, LRUCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Run on every new connection. WAL lets readers overlap the writer; with WAL,
+# synchronous=NORMAL stays consistent after a crash and only an OS crash can
+# lose the most recent writes, which for a cache just means refetching.
+CONNECTION_PRAGMAS = (
+    # Lets prune() return free pages to the filesystem. Must precede WAL to
+    # apply to a new database; existing ones switch on the next vacuum().
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=67108864",  # 64 MB
+    "PRAGMA cache_size=-8192",  # KiB, so 8 MB of page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+DEFAULT_MEMORY_SIZE = 4096  # entries in the in-process tier
+# Larger values (persisted validation results) are served from SQLite only;
+# their owners keep their own in-memory copies
+MAX_MEMORY_VALUE_BYTES = 1024
+# How long a key missing from SQLite is remembered as missing. Short, since
+# another process sharing the database may fill it in meanwhile.
+NEGATIVE_TTL_SECONDS = 30.0
+
+# Values queued by ``aset`` are written in one transaction once this much
+# time has passed since the first of them, or once this many are queued
+WRITE_BEHIND_INTERVAL = 0.05  # seconds
+WRITE_BEHIND_BATCH = 64
+
+# Keys per ``get_many`` query, well under SQLite's bound-parameter limit
+MAX_QUERY_KEYS = 500
+
+# Size bounds enforced by ``prune``; 0 disables a bound. The size counts
+# stored key and value bytes, not SQLite's page overhead.
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Seconds between background prunes, started by a write once this has passed
+MAINTENANCE_INTERVAL = 300.0
+
+_INSERT = (
+    "INSERT OR REPLACE INTO cache (key, value, created_at, last_access) VALUES (?1, ?2, ?3, ?3)"
+)
+
+# Memory-tier value for "not in SQLite"; negative entries hold it
+_ABSENT = object()
+
+# Marks keys holding package existence answers, see ``RegistryCache.epoch``
+EXISTENCE_KEY_MARKER = ":exists:"
+
+
+@dataclass
+class PruneResult:
+    """What one ``RegistryCache.prune`` removed."""
+
+    expired: int = 0
+    evicted: int = 0
+    freed_bytes: int = 0  # returned to the filesystem by the incremental vacuum
+
+
+@dataclass
+class RegistryReads:
+    """Registry cache entries a computation depended on.
+
+    Collected by ``track_registry_reads`` so results derived from registry
+    data can expire together with the oldest entry they used.
+    """
+
+    oldest: float | None = None
+    # Keys that missed and were never filled in (e.g. a network error)
+    unresolved: set[str] = field(default_factory=set)
+
+    @property
+    def complete(self) -> bool:
+        """True when every lookup was answered from, or stored to, the cache."""
+        return not self.unresolved
+
+    def expires_at(self, ttl_seconds: float) -> float:
+        """When the oldest entry read (or one created now) expires."""
+        created = self.oldest if self.oldest is not None else time.time()
+        return created + ttl_seconds
+
+    def merge(self, other: RegistryReads) -> None:
+        """Fold the reads of a nested block into this one."""
+        if other.oldest is not None:
+            self._saw(other.oldest)
+        self.unresolved |= other.unresolved
+
+    def _saw(self, created_at: float) -> None:
+        if self.oldest is None or created_at < self.oldest:
+            self.oldest = created_at
+
+
+_registry_reads: ContextVar[RegistryReads | None] = ContextVar("registry_reads", default=None)
+
+
+@contextmanager
+def track_registry_reads() -> Iterator[RegistryReads]:
+    """Record registry cache reads and writes made inside the block.
+
+    Tasks and threads started inside the block inherit the tracker, and an
+    enclosing tracker also receives everything recorded here.
+    """
+    parent = _registry_reads.get()
+    reads = RegistryReads()
+    token = _registry_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _registry_reads.reset(token)
+        if parent is not None:
+            parent.merge(reads)
+
+
+def note_registry_read(created_at: float) -> None:
+    """Record a dependency on registry data created at ``created_at``.
+
+    Used by caches of derived results, whose hits stand in for the registry
+    reads that produced them.
+    """
+    reads = _registry_reads.get()
+    if reads is not None:
+        reads._saw(created_at)
+
 
 class RegistryCache:
-    """SQLite-backed cache for registry lookups with TTL support."""
+    """SQLite-backed cache for registry lookups with TTL support.
+
+    A bounded in-process LRU sits in front of SQLite: writes go to both,
+    reads fall through to SQLite on a memory miss and fill the memory tier,
+    including negative entries for keys SQLite does not have. Memory
+    entries keep their SQLite creation time, so both tiers expire together.
+
+    Each thread keeps one SQLite connection open until ``close()``, so
+    lookups reuse it and the statements it has already prepared.
 
-    def __init__(self, cache_dir: Path, ttl_seconds: int = 3600) -> None:
+    Coroutines use ``aget``/``aset``, which never block the event loop on
+    SQLite: lookups the memory tier cannot answer run on a dedicated I/O
+    thread, and writes are queued and flushed in batched transactions
+    (write-behind) on that thread. ``close()`` flushes whatever is queued.
+
+    The database stays bounded: ``prune`` deletes expired entries, evicts
+    the least recently used ones beyond ``max_entries``/``max_bytes`` and
+    returns the freed pages to the filesystem. Writes start it on the I/O
+    thread every ``MAINTENANCE_INTERVAL`` seconds. Read times are batched in
+    memory and written with the next flush.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: int = 3600,
+        memory_size: int = DEFAULT_MEMORY_SIZE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
         self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         cache_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = cache_dir / "registry_cache.db"
+        # Bumped whenever a known existence answer changes, so results derived
+        # from it can be keyed on it. Removing or expiring entries does not
+        # bump it: derived results expire with the oldest entry they read.
+        self.epoch = 0
+        # key -> (decoded value or _ABSENT, created_at)
+        self._memory: LRUCache[str, tuple[Any, float]] = LRUCache(memory_size)
+        self.memory_hits = 0
+        self.negative_hits = 0
+        self.sqlite_hits = 0
+        self.sqlite_misses = 0
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # key -> (JSON, created_at) queued by aset; visible to reads until written
+        self._pending: dict[str, tuple[str, float]] = {}
+        # key -> when it was last read; written to last_access by flush
+        self._accessed: dict[str, float] = {}
+        self._next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_loop: asyncio.AbstractEventLoop | None = None
+        self._executor: ThreadPoolExecutor | None = None
         self._init_db()
 
     def _connect(self) -> sqlite3.Connection:
-        """Create a connection with WAL mode for concurrent access."""
-        conn = sqlite3.connect(self.db_path, timeout=10)
-        conn.execute("PRAGMA journal_mode=WAL")
+        """This thread's connection, opened in autocommit mode on first use."""
+        if self._pid != os.getpid():
+            # Connections must not cross a fork; the child opens its own
+            self._local = threading.local()
+            self._connections = []
+            self._pid = os.getpid()
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is off only so close() may run on any thread
+            conn = sqlite3.connect(
+                self.db_path, timeout=10, isolation_level=None, check_same_thread=False,
+            )
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
         return conn
 
+    def close(self) -> None:
+        """Flush queued writes and close every thread's connection.
+
+        Later calls reopen connections (and the I/O thread) on demand.
+        """
+        self._cancel_flush_timer()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+        self.flush()
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    async def aclose(self) -> None:
+        """``close`` for coroutines: waiting for the I/O thread and flushing run off the loop."""
+        self._cancel_flush_timer()  # the timer belongs to this loop
+        await asyncio.to_thread(self.close)
+
     def _init_db(self) -> None:
-        with self._connect() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cache (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
-                    created_at REAL NOT NULL
-                )
-            """)
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL DEFAULT 0
+            )
+        """)
+        if "last_access" not in self._columns(conn):
+            # Databases from before eviction: count every entry as read when written
+            with self._transaction():
+                if "last_access" not in self._columns(conn):  # another process may have won
+                    conn.execute(
+                        "ALTER TABLE cache ADD COLUMN last_access REAL NOT NULL DEFAULT 0",
+                    )
+                    conn.execute("UPDATE cache SET last_access = created_at")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """This thread's connection inside one write transaction, rolled back on error."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _columns(conn: sqlite3.Connection) -> set[str]:
+        return {row[1] for row in conn.execute("PRAGMA table_info(cache)")}
 
     def get(self, key: str) -> Any | None:
-        """Get cached value if not expired."""
-        with self._connect() as conn:
-            row = conn.execute(
+        """Get cached value if not expired.
+
+        Values from the memory tier are shared between callers; do not mutate them.
+        """
+        value = self._get_memory(key)
+        return self._get_stored(key) if value is MISSING else value
+
+    async def aget(self, key: str) -> Any | None:
+        """``get`` for coroutines: only memory-tier hits are answered on the loop."""
+        value = self._get_memory(key)
+        if value is not MISSING:
+            return value
+        return await self._run_io(self._get_stored, key)
+
+    def _get_memory(self, key: str) -> Any:
+        """The memory tier's answer for ``key``, or ``MISSING`` to ask SQLite."""
+        entry = self._memory.get(key)
+        if entry is MISSING:
+            return MISSING
+        reads = _registry_reads.get()
+        value, created_at = entry
+        age = time.time() - created_at
+        if value is _ABSENT and age <= NEGATIVE_TTL_SECONDS:
+            self.negative_hits += 1
+            if reads is not None:
+                reads.unresolved.add(key)
+            return None
+        if value is not _ABSENT and age <= self.ttl_seconds:
+            self.memory_hits += 1
+            with self._lock:  # flush() swaps the dict out from the I/O thread
+                self._accessed[key] = time.time()
+            if reads is not None:
+                reads._saw(created_at)
+            return value
+        self._memory.delete(key)
+        return MISSING
+
+    def _get_stored(self, key: str) -> Any | None:
+        """Look ``key`` up in the write queue, then SQLite, filling the memory tier."""
+        with self._lock:
+            row = self._pending.get(key)
+        if row is None:
+            row = self._connect().execute(
                 "SELECT value, created_at FROM cache WHERE key = ?", (key,)
             ).fetchone()
+        return self._load(key, row)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """``get`` for several keys; only hits are returned.
+
+        Keys the memory tier cannot answer are read with a single query.
+        """
+        found, remaining = self._get_many_memory(keys)
+        if remaining:
+            found.update(self._get_many_stored(remaining))
+        return found
+
+    async def aget_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """``get_many`` for coroutines, querying SQLite on the I/O thread."""
+        found, remaining = self._get_many_memory(keys)
+        if remaining:
+            found.update(await self._run_io(self._get_many_stored, remaining))
+        return found
+
+    def _get_many_memory(self, keys: Iterable[str]) -> tuple[dict[str, Any], list[str]]:
+        """Memory-tier hits, and the keys left to look up in SQLite."""
+        found: dict[str, Any] = {}
+        remaining = []
+        for key in dict.fromkeys(keys):
+            value = self._get_memory(key)
+            if value is MISSING:
+                remaining.append(key)
+            elif value is not None:
+                found[key] = value
+        return found, remaining
 
+    def _get_many_stored(self, keys: list[str]) -> dict[str, Any]:
+        with self._lock:
+            rows = {key: self._pending[key] for key in keys if key in self._pending}
+        query = [key for key in keys if key not in rows]
+        conn = self._connect()
+        for start in range(0, len(query), MAX_QUERY_KEYS):
+            chunk = query[start:start + MAX_QUERY_KEYS]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(
+                f"SELECT key, value, created_at FROM cache WHERE key IN ({placeholders})", chunk,
+            )
+            rows.update((key, (raw, created_at)) for key, raw, created_at in cursor)
+        found = {}
+        for key in keys:
+            value = self._load(key, rows.get(key))
+            if value is not None:
+                found[key] = value
+        return found
+
+    def _load(self, key: str, row: tuple[str, float] | None) -> Any | None:
+        """Decode a stored ``(value, created_at)`` row for ``key``; None for a miss."""
+        reads = _registry_reads.get()
         if row is None:
+            self.sqlite_misses += 1
+            self._memory.set(key, (_ABSENT, time.time()))
+            if reads is not None:
+                reads.unresolved.add(key)
             return None
 
-        value, created_at = row
+        raw, created_at = row
         if time.time() - created_at > self.ttl_seconds:
+            self.sqlite_misses += 1
             self.delete(key)
+            if reads is not None:
+                reads.unresolved.add(key)
             return None
 
         try:
-            return json.loads(value)
+            value = json.loads(raw)
         except (json.JSONDecodeError, TypeError):
             logger.warning("Corrupted cache entry for key '%s', removing", key)
+            self.sqlite_misses += 1
             self.delete(key)
             return None
+        self.sqlite_hits += 1
+        with self._lock:
+            self._accessed[key] = time.time()
+        if len(raw) <= MAX_MEMORY_VALUE_BYTES:
+            self._memory.set(key, (value, created_at))
+        if reads is not None:
+            reads._saw(created_at)
+        return value
 
     def set(self, key: str, value: Any) -> None:
-        """Store value in cache."""
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
-                (key, json.dumps(value), time.time()),
+        """Store value in cache (write-through to SQLite)."""
+        now = time.time()
+        raw = json.dumps(value)
+        with self._lock:
+            self._pending.pop(key, None)  # an older queued value must not overwrite this
+        self._connect().execute(_INSERT, (key, raw, now))
+        self._remember(key, raw, now)
+
+    def set_many(self, items: Mapping[str, Any]) -> None:
+        """``set`` for several entries, written in a single transaction."""
+        now = time.time()
+        rows = [(key, json.dumps(value), now) for key, value in items.items()]
+        with self._lock:
+            for key, _, _ in rows:
+                self._pending.pop(key, None)
+        self._write(rows)
+        for key, raw, _ in rows:
+            self._remember(key, raw, now)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """``set`` for coroutines: the SQLite write is queued, see ``flush``."""
+        await self.aset_many({key: value})
+
+    async def aset_many(self, items: Mapping[str, Any]) -> None:
+        """``set_many`` for coroutines: the SQLite writes are queued, see ``flush``."""
+        if not items:
+            return
+        now = time.time()
+        rows = {key: json.dumps(value) for key, value in items.items()}
+        with self._lock:
+            for key, raw in rows.items():
+                self._pending[key] = (raw, now)
+            full = len(self._pending) >= WRITE_BEHIND_BATCH
+        for key, raw in rows.items():
+            self._remember(key, raw, now)
+        loop = asyncio.get_running_loop()
+        if full:
+            self._cancel_flush_timer()
+            self._io_executor().submit(self.flush)
+        elif self._flush_timer is None or self._flush_loop is not loop:
+            self._flush_loop = loop
+            self._flush_timer = loop.call_later(WRITE_BEHIND_INTERVAL, self._flush_later)
+
+    def flush(self) -> int:
+        """Write the values queued by ``aset`` in one transaction; returns how many.
+
+        Read times recorded since the last flush are written along with them.
+        Fails open: on a database error the batch is dropped and logged.
+        """
+        with self._lock:
+            batch = list(self._pending.items())
+            accessed, self._accessed = self._accessed, {}
+        if not batch and not accessed:
+            return 0
+        try:
+            self._write(
+                [(key, raw, created_at) for key, (raw, created_at) in batch],
+                [(at, key) for key, at in accessed.items()],
             )
+        except sqlite3.Error:
+            logger.warning("Dropping %d queued registry cache writes", len(batch), exc_info=True)
+        with self._lock:
+            for key, entry in batch:
+                if self._pending.get(key) is entry:  # not replaced while writing
+                    del self._pending[key]
+        return len(batch)
+
+    async def aflush(self) -> int:
+        """``flush`` on the I/O thread."""
+        self._cancel_flush_timer()
+        return await self._run_io(self.flush)
+
+    def _write(
+        self, rows: list[tuple[str, str, float]], accessed: Iterable[tuple[float, str]] = (),
+    ) -> None:
+        """Insert or replace ``(key, JSON, created_at)`` rows in one transaction.
+
+        ``accessed`` holds ``(last_access, key)`` updates for existing rows.
+        """
+        with self._transaction() as conn:
+            conn.executemany(_INSERT, rows)
+            conn.executemany("UPDATE cache SET last_access = ? WHERE key = ?", accessed)
+
+    def _flush_later(self) -> None:
+        self._flush_timer = None
+        self._io_executor().submit(self.flush)
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _io_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="registry-cache-io")
+            return self._executor
+
+    async def _run_io(self, func: Callable[..., T], *args: Any) -> T:
+        """Run ``func`` on the I/O thread, in this context so read tracking carries over."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._io_executor(), context.run, func, *args,
+        )
+
+    def _remember(self, key: str, raw: str, created_at: float) -> None:
+        """Put a value just written into the memory tier and the read tracker."""
+        value = json.loads(raw)  # a copy the caller cannot mutate
+        # Under the lock prune() holds while invalidating evicted keys
+        with self._lock:
+            if EXISTENCE_KEY_MARKER in key:
+                previous = self._memory.get(key)
+                if previous is not MISSING and previous[0] is not _ABSENT and previous[0] != value:
+                    self.epoch += 1
+            if len(raw) <= MAX_MEMORY_VALUE_BYTES:
+                self._memory.set(key, (value, created_at))
+            else:
+                self._memory.delete(key)
+        reads = _registry_reads.get()
+        if reads is not None:
+            reads.unresolved.discard(key)
+            reads._saw(created_at)
+        if time.monotonic() >= self._next_maintenance:
+            self._next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+            self._io_executor().submit(self._maintain)
 
     def delete(self, key: str) -> None:
         """Remove key from cache."""
-        with self._connect() as conn:
-            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        self._memory.delete(key)
+        with self._lock:
+            self._pending.pop(key, None)
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
 
     def clear_expired(self) -> int:
         """Remove all expired entries. Returns count of removed entries."""
+        self.flush()
+        cutoff = time.time() - self.ttl_seconds
+        cursor = self._connect().execute("DELETE FROM cache WHERE created_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def prune(self) -> PruneResult:
+        """Delete expired entries and evict least recently used ones over the bounds.
+
+        Free pages are then returned to the filesystem (incremental vacuum).
+        """
+        self.flush()  # queued writes and read times count
+        conn = self._connect()
+        result = PruneResult()
+        cutoff = time.time() - self.ttl_seconds
+        result.expired = conn.execute(
+            "DELETE FROM cache WHERE created_at < ?", (cutoff,),
+        ).rowcount
+        if self.max_entries or self.max_bytes:
+            evicted = self._evict(conn)
+            result.evicted = len(evicted)
+            with self._lock:
+                for key in evicted:
+                    if key not in self._pending:  # written again since; that value stands
+                        self._memory.delete(key)
+        result.freed_bytes = self._incremental_vacuum(conn)
+        return result
+
+    def _evict(self, conn: sqlite3.Connection) -> list[str]:
+        """Delete least recently used entries until both bounds hold."""
+        count, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(key) + length(value)), 0) FROM cache",
+        ).fetchone()
+        max_entries = self.max_entries or count
+        max_bytes = self.max_bytes or size
+        evict = []
+        if count > max_entries or size > max_bytes:
+            rows = conn.execute(
+                "SELECT key, length(key) + length(value) FROM cache ORDER BY last_access",
+            )
+            for key, length in rows:
+                if count <= max_entries and size <= max_bytes:
+                    break
+                evict.append(key)
+                count -= 1
+                size -= length
+            rows.close()
+        if evict:
+            with self._transaction():
+                conn.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in evict])
+        return evict
+
+    def _incremental_vacuum(self, conn: sqlite3.Connection) -> int:
+        """Release free pages (in incremental auto-vacuum mode); returns bytes freed."""
+        (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        (free_before,) = conn.execute("PRAGMA freelist_count").fetchone()
+        # execute() would step it once, freeing a single page; a script runs it to the end
+        conn.executescript("PRAGMA incremental_vacuum")
+        (free_after,) = conn.execute("PRAGMA freelist_count").fetchone()
+        return int(free_before - free_after) * int(page_size)
+
+    def _maintain(self) -> None:
+        """Background prune; fails open since the cache still works unpruned."""
+        try:
+            result = self.prune()
+        except sqlite3.Error:
+            logger.warning("Registry cache maintenance failed", exc_info=True)
+            return
+        logger.debug("Registry cache maintenance: %s", result)
+
+    def vacuum(self) -> tuple[int, int]:
+        """Rebuild the database file; returns its size in bytes before and after.
+
+        Also switches databases created before incremental auto-vacuum to it.
+        """
+        self.flush()
+        before = self.file_bytes()
+        conn = self._connect()
+        conn.execute("VACUUM")  # also applies auto_vacuum, see CONNECTION_PRAGMAS
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return before, self.file_bytes()
+
+    def file_bytes(self) -> int:
+        """Size of the database file plus its write-ahead log."""
+        return sum(
+            path.stat().st_size
+            for path in (self.db_path, self.db_path.with_name(self.db_path.name + "-wal"))
+            if path.exists()
+        )
+
+    def disk_usage(self) -> dict[str, Any]:
+        """Entry counts and sizes on disk; scans the whole table, unlike ``stats``."""
+        self.flush()
+        conn = self._connect()
         cutoff = time.time() - self.ttl_seconds
-        with self._connect() as conn:
-            cursor = conn.execute("DELETE FROM cache WHERE created_at < ?", (cutoff,))
-            return cursor.rowcount
+        entries, expired, data_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(created_at < ?), 0),"
+            " COALESCE(SUM(length(key) + length(value)), 0) FROM cache",
+            (cutoff,),
+        ).fetchone()
+        (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        (free_pages,) = conn.execute("PRAGMA freelist_count").fetchone()
+        return {
+            "path": str(self.db_path),
+            "entries": entries,
+            "expired": expired,
+            "data_bytes": data_bytes,
+            "file_bytes": self.file_bytes(),
+            "free_bytes": free_pages * page_size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Per-tier counters: lookups answered by memory, and by SQLite after a memory miss."""
+        return {
+            "memory": {
+                "size": len(self._memory),
+                "max_size": self._memory.max_size,
+                "hits": self.memory_hits,
+                "negative_hits": self.negative_hits,
+                "evictions": self._memory.evictions,
+            },
+            "sqlite": {
+                "hits": self.sqlite_hits,
+                "misses": self.sqlite_misses,
+                "pending_writes": len(self._pending),
+            },
+        }
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-import httpx
+import asyncio
+from collections.abc import Iterable
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 from ..models import RegistryConfig
 from .cache import RegistryCache
 
+if TYPE_CHECKING:
+    import httpx
+
 NPM_REGISTRY_URL = "https://registry.npmjs.org"
 
 
@@ -16,7 +22,13 @@ class NpmRegistry:
     def __init__(self, config: RegistryConfig, cache: RegistryCache) -> None:
         self.config = config
         self.cache = cache
-        self.client = httpx.AsyncClient(timeout=config.timeout_seconds)
+
+    @cached_property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, created (and httpx imported) on the first network lookup."""
+        import httpx
+
+        return httpx.AsyncClient(timeout=self.config.timeout_seconds)
 
     async def package_exists(self, package_name: str) -> bool:
         """Check if a package exists on npm."""
@@ -24,25 +36,68 @@ class NpmRegistry:
             return False
 
         cache_key = f"npm:exists:{package_name}"
-        cached = self.cache.get(cache_key)
+        cached = await self.cache.aget(cache_key)
         if cached is not None:
             return cached
 
+        exists = await self._fetch(package_name)
+        if exists is None:
+            # Network error — don't cache, return True (fail open)
+            return True
+        await self.cache.aset(cache_key, exists)
+        return exists
+
+    async def _fetch(self, package_name: str) -> bool | None:
+        """Ask npm whether the package exists; None on a network error."""
+        import httpx  # only once a lookup misses the cache
+
         try:
             response = await self.client.get(f"{NPM_REGISTRY_URL}/{package_name}")
-            exists = response.status_code == 200
-            self.cache.set(cache_key, exists)
-            return exists
         except httpx.HTTPError:
-            return True  # fail open
+            return None
+        return response.status_code == 200
+
+    async def package_exists_many(
+        self, package_names: Iterable[str], max_concurrent: int = 10,
+    ) -> dict[str, bool]:
+        """``package_exists`` for several packages.
+
+        Cached answers are read in one round trip; only the misses are
+        looked up on npm, at most ``max_concurrent`` at a time.
+        """
+        names = list(dict.fromkeys(package_names))
+        cached = await self.cache.aget_many(f"npm:exists:{name}" for name in names)
+        answers = {
+            name: cached[key] for name in names if (key := f"npm:exists:{name}") in cached
+        }
+        missing = [name for name in names if name not in answers]
+        sem = asyncio.Semaphore(max_concurrent)
+
+        async def _lookup(package_name: str) -> bool | None:
+            if not package_name.strip():
+                return False
+            async with sem:
+                return await self._fetch(package_name)
+
+        found = dict(zip(missing, await asyncio.gather(*map(_lookup, missing)), strict=True))
+        await self.cache.aset_many({
+            f"npm:exists:{name}": exists
+            for name, exists in found.items()
+            if exists is not None and name.strip()
+        })
+        # Network errors are not cached and fail open
+        answers.update((name, True if exists is None else exists) for name, exists in found.items())
+        return answers
 
     async def get_package_info(self, package_name: str) -> dict | None:
         """Get package metadata from npm."""
         cache_key = f"npm:info:{package_name}"
-        cached = self.cache.get(cache_key)
+        cached = await self.cache.aget(cache_key)
         if cached is not None:
             return cached
 
+        import httpx  # only once a lookup misses the cache
+
         try:
             response = await self.client.get(f"{NPM_REGISTRY_URL}/{package_name}")
             if response.status_code != 200:
@@ -54,10 +109,11 @@ class NpmRegistry:
                 "version": latest,
                 "description": data.get("description", ""),
             }
-            self.cache.set(cache_key, info)
+            await self.cache.aset(cache_key, info)
             return info
         except httpx.HTTPError:
             return None
 
     async def close(self) -> None:
-        await self.client.aclose()
+        if "client" in self.__dict__:
+            await self.client.aclose()
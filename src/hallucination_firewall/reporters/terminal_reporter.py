@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -9,6 +11,9 @@ from rich.text import Text
 
 from ..models import Severity, ValidationResult
 
+if TYPE_CHECKING:
+    from ..watch import IssueChanges
+
 SEVERITY_STYLES = {
     Severity.ERROR: "bold red",
     Severity.WARNING: "bold yellow",
@@ -83,3 +88,69 @@ def print_summary(results: list[ValidationResult], console: Console | None = Non
             f"[bold red]{failed}/{total_files} files failed[/] — "
             f"{total_errors} errors, {total_warnings} warnings"
         )
+
+
+def print_issue_changes(
+    changes: list[IssueChanges], elapsed: float, console: Console | None = None,
+) -> None:
+    """Print one watch-mode re-check: only the issues that appeared or were resolved."""
+    console = console or Console()
+
+    for change in changes:
+        if not (change.added or change.resolved or change.deleted):
+            continue
+        console.print(f"[bold]{change.file}[/]" + (" [dim](deleted)[/]" if change.deleted else ""))
+        for issue in change.added:
+            style = SEVERITY_STYLES[issue.severity]
+            console.print(
+                Text.assemble(
+                    (f"  + {SEVERITY_ICONS[issue.severity]} ", style),
+                    (f"L{issue.location.line}:{issue.location.column} ", "dim"),
+                    f"{issue.issue_type.value}: {issue.message}",
+                ),
+            )
+        for issue in change.resolved:
+            console.print(
+                Text.assemble(
+                    ("  - ✓ ", "green"),
+                    f"L{issue.location.line}:{issue.location.column} "
+                    f"{issue.issue_type.value}: {issue.message}",
+                    style="dim",
+                ),
+            )
+
+    checked = sum(1 for c in changes if not c.deleted)
+    added = sum(len(c.added) for c in changes)
+    resolved = sum(len(c.resolved) for c in changes)
+    console.print(
+        f"[dim]Re-checked {checked} file(s) in {elapsed * 1000:.0f} ms: "
+        f"{added} new, {resolved} resolved[/]",
+    )
+
+
+def print_timings(stats: dict[str, Any], console: Console | None = None) -> None:
+    """Print per-layer pipeline timings from ``LayerTimings.stats()``."""
+    console = console or Console()
+
+    table = Table(title="Layer timings", show_header=True, header_style="bold")
+    table.add_column("Layer")
+    table.add_column("Runs", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Avg ms", justify="right")
+    table.add_column("Max ms", justify="right")
+    for name, layer in stats["layers"].items():
+        table.add_row(
+            name,
+            str(layer["runs"]),
+            f"{layer['total_ms']:.1f}",
+            f"{layer['avg_ms']:.1f}",
+            f"{layer['max_ms']:.1f}",
+        )
+    console.print(table)
+
+    calls = stats["signature_calls"]
+    if calls["total"]:
+        console.print(
+            f"Signature call sites: {calls['total']} total, {calls['unique']} unique "
+            f"(ratio {calls['unique_ratio']:.2f})"
+        )
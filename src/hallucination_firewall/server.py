@@ -6,22 +6,27 @@ import logging
 import time
 from collections import defaultdict
 from contextlib import asynccontextmanager
+from functools import partial
 from typing import Any, AsyncGenerator
 
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
 from .config import load_config
 from .models import ValidationResult
+from .pipeline.parser_pool import default_pool
 from .pipeline.runner import ValidationPipeline
 
 logger = logging.getLogger(__name__)
 
 RATE_LIMIT = 60  # requests per window
 RATE_WINDOW = 60  # seconds
+# Snippets per /validate/batch request; the per-IP item budget per window
+# is ``batch_item_limit`` in the firewall config
+MAX_BATCH_ITEMS = 10_000
 
 
 class MetricsCollector:
@@ -31,8 +36,6 @@ class MetricsCollector:
         self.request_count = 0
         self.error_count = 0
         self.total_latency_ms = 0.0
-        self.cache_hits = 0
-        self.cache_misses = 0
         self.latency_histogram = {
             "<100ms": 0,
             "<500ms": 0,
@@ -58,33 +61,45 @@ class MetricsCollector:
         else:
             self.latency_histogram[">1000ms"] += 1
 
-    def record_cache_hit(self) -> None:
-        """Record a cache hit."""
-        self.cache_hits += 1
+    def get_metrics(self, registry_cache: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Return all metrics as a dictionary.
 
-    def record_cache_miss(self) -> None:
-        """Record a cache miss."""
-        self.cache_misses += 1
-
-    def get_metrics(self) -> dict[str, Any]:
-        """Return all metrics as a dictionary."""
+        ``registry_cache`` is ``RegistryCache.stats()``. Each tier gets a hit
+        rate over the lookups that reached it, and ``cache_hit_rate`` covers
+        every lookup: answered by either tier, or missed by both.
+        """
         avg_latency = (
             self.total_latency_ms / self.request_count if self.request_count > 0 else 0
         )
-        return {
+        data: dict[str, Any] = {
             "request_count": self.request_count,
             "error_count": self.error_count,
             "avg_latency_ms": round(avg_latency, 2),
             "total_latency_ms": round(self.total_latency_ms, 2),
-            "cache_hits": self.cache_hits,
-            "cache_misses": self.cache_misses,
-            "cache_hit_rate": (
-                round(self.cache_hits / (self.cache_hits + self.cache_misses), 3)
-                if (self.cache_hits + self.cache_misses) > 0
-                else 0
-            ),
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "cache_hit_rate": 0,
             "latency_histogram": self.latency_histogram,
         }
+        if registry_cache is not None:
+            memory, sqlite = registry_cache["memory"], registry_cache["sqlite"]
+            memory_misses = sqlite["hits"] + sqlite["misses"]
+            memory["hit_rate"] = _rate(memory["hits"] + memory["negative_hits"], memory_misses)
+            sqlite["hit_rate"] = _rate(sqlite["hits"], sqlite["misses"])
+            hits = memory["hits"] + sqlite["hits"]
+            misses = memory["negative_hits"] + sqlite["misses"]
+            data.update(
+                cache_hits=hits,
+                cache_misses=misses,
+                cache_hit_rate=_rate(hits, misses),
+                registry_cache=registry_cache,
+            )
+        return data
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 3) if total else 0
 
 
 metrics = MetricsCollector()
@@ -98,24 +113,48 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.limit = limit
         self.window = window
         self._requests: dict[str, list[float]] = defaultdict(list)
+        # (timestamp, item count) per accepted batch
+        self._batch_items: dict[str, list[tuple[float, int]]] = defaultdict(list)
 
     async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         client_ip = request.client.host if request.client else "unknown"
-        now = time.time()
-        # Prune old timestamps
-        recent = [t for t in self._requests[client_ip] if now - t < self.window]
-        if not recent:
-            self._requests.pop(client_ip, None)
-            recent = []
-        else:
-            self._requests[client_ip] = recent
-        if len(recent) >= self.limit:
+        if not self.charge(client_ip):
             return JSONResponse(
                 {"detail": "Rate limit exceeded"}, status_code=429
             )
-        self._requests[client_ip].append(now)
+        # Batch endpoints charge their items against a separate budget
+        request.state.charge_batch_items = partial(self.charge_batch_items, client_ip)
         return await call_next(request)
 
+    def charge(self, client_ip: str) -> bool:
+        """Count one request from ``client_ip``; False (counting none) if over the limit."""
+        now = time.time()
+        # Prune old timestamps
+        recent = [t for t in self._requests[client_ip] if now - t < self.window]
+        if len(recent) >= self.limit:
+            if recent:
+                self._requests[client_ip] = recent
+            else:
+                self._requests.pop(client_ip, None)
+            return False
+        recent.append(now)
+        self._requests[client_ip] = recent
+        return True
+
+    def charge_batch_items(self, client_ip: str, count: int, limit: int) -> bool:
+        """Count ``count`` batch items from ``client_ip`` against ``limit`` per window."""
+        now = time.time()
+        recent = [(t, n) for t, n in self._batch_items[client_ip] if now - t < self.window]
+        if sum(n for _, n in recent) + count > limit:
+            if recent:
+                self._batch_items[client_ip] = recent
+            else:
+                self._batch_items.pop(client_ip, None)
+            return False
+        recent.append((now, count))
+        self._batch_items[client_ip] = recent
+        return True
+
 pipeline: ValidationPipeline | None = None
 
 
@@ -124,21 +163,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage pipeline lifecycle."""
     global pipeline
     config = load_config()
+    config.workers.use_pool()
     pipeline = ValidationPipeline(config)
 
-    # Wrap cache.get to track hits/misses
-    original_get = pipeline.cache.get
-
-    def wrapped_get(key: str) -> Any:
-        result = original_get(key)
-        if result is not None:
-            metrics.record_cache_hit()
-        else:
-            metrics.record_cache_miss()
-        return result
-
-    pipeline.cache.get = wrapped_get  # type: ignore[method-assign]
-
     yield
     try:
         await pipeline.close()
@@ -164,6 +191,12 @@ class ValidateRequest(BaseModel):
     language: str | None = None
 
 
+class BatchValidateRequest(BaseModel):
+    """Request body for validating many snippets at once."""
+
+    items: list[ValidateRequest] = Field(max_length=MAX_BATCH_ITEMS)
+
+
 class HealthResponse(BaseModel):
     status: str = "ok"
     version: str = "0.1.0"
@@ -184,11 +217,7 @@ async def validate(request: ValidateRequest) -> ValidationResult:
     is_error = False
 
     try:
-        file_path = request.file_path
-        if request.language:
-            file_path = f"{file_path}.{request.language}"
-
-        result = await pipeline.validate_code(request.code, file_path)
+        result = await pipeline.validate_code(request.code, _request_file_path(request))
         return result
 
     except Exception:
@@ -200,7 +229,54 @@ async def validate(request: ValidateRequest) -> ValidationResult:
         metrics.record_request(latency_ms, is_error)
 
 
+@app.post("/validate/batch", response_model=list[ValidationResult])
+async def validate_batch(
+    request: BatchValidateRequest, http_request: Request,
+) -> list[ValidationResult]:
+    """Validate many snippets, resolving each distinct package only once.
+
+    The request counts once against the rate limit; its snippets count
+    against the separate ``batch_item_limit`` budget.
+    """
+    if pipeline is None:
+        raise HTTPException(status_code=503, detail="Pipeline not initialized")
+    charge = getattr(http_request.state, "charge_batch_items", None)
+    limit = pipeline.config.batch_item_limit
+    if charge is not None and not charge(len(request.items), limit):
+        raise HTTPException(status_code=429, detail="Batch item limit exceeded")
+
+    start_time = time.time()
+    is_error = False
+
+    try:
+        return await pipeline.validate_many(
+            [(item.code, _request_file_path(item)) for item in request.items],
+        )
+
+    except Exception:
+        is_error = True
+        raise
+
+    finally:
+        latency_ms = (time.time() - start_time) * 1000
+        metrics.record_request(latency_ms, is_error)
+
+
+def _request_file_path(request: ValidateRequest) -> str:
+    """File path used for language detection, with the optional language suffix."""
+    if request.language:
+        return f"{request.file_path}.{request.language}"
+    return request.file_path
+
+
 @app.get("/metrics")
 async def get_metrics() -> dict[str, Any]:
     """Return server metrics."""
-    return metrics.get_metrics()
+    data = metrics.get_metrics(pipeline.cache.stats() if pipeline is not None else None)
+    data["parser_pool"] = default_pool.stats()
+    if pipeline is not None:
+        data["signature_cache"] = pipeline.signature_cache.stats()
+        data["signature_workers"] = pipeline.signature_resolver.stats()
+        data["layer_timings"] = pipeline.timings.stats()
+        data["result_cache"] = pipeline.result_cache.stats()
+    return data
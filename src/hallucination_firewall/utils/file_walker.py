@@ -0,0 +1,260 @@
+"""Discover source files under directories and globs, honouring .gitignore."""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from ..models import Language
+from .language_detector import detect_language
+
+# Never descended into, whatever the ignore files say
+DEFAULT_EXCLUDE = (
+    ".git/", ".hg/", ".svn/", ".tox/", ".nox/", ".venv/", "venv/",
+    "node_modules/", "__pycache__/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/",
+)
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+@dataclass
+class IgnoreRule:
+    """One gitignore-style pattern, relative to the directory it was read in."""
+
+    regex: re.Pattern[str]
+    negated: bool = False
+    dir_only: bool = False
+
+
+@dataclass
+class IgnoreRules:
+    """Rules from one ignore file (or the config ``exclude`` list) and their base."""
+
+    base: str  # absolute, os.sep-separated directory the patterns are relative to
+    rules: list[IgnoreRule] = field(default_factory=list)
+
+    @classmethod
+    def from_patterns(cls, base: str, patterns: Iterable[str]) -> IgnoreRules:
+        rules = []
+        for line in patterns:
+            rule = parse_ignore_pattern(line)
+            if rule is not None:
+                rules.append(rule)
+        return cls(base, rules)
+
+    @classmethod
+    def from_file(cls, path: str) -> IgnoreRules | None:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        rules = cls.from_patterns(os.path.dirname(path), lines)
+        return rules if rules.rules else None
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """True/False if a rule decides ``path`` (last match wins), None if none does."""
+        rel = os.path.relpath(path, self.base)
+        if rel.startswith(".."):
+            return None
+        rel = rel.replace(os.sep, "/")
+        decision = None
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(rel):
+                decision = not rule.negated
+        return decision
+
+
+def parse_ignore_pattern(line: str) -> IgnoreRule | None:
+    """Parse one line of a .gitignore file; blank lines and comments give None."""
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]  # "\#" and "\!" escape a leading special character
+    dir_only = line.endswith("/")
+    line = line.strip("/") if dir_only else line
+    if not line:
+        return None
+    # A slash anywhere but the end anchors the pattern to its base directory
+    anchored = "/" in line.rstrip("/")
+    return IgnoreRule(
+        _compile_glob(line.lstrip("/"), anchored=anchored), negated, dir_only,
+    )
+
+
+@lru_cache(maxsize=512)
+def _compile_glob(pattern: str, anchored: bool = True) -> re.Pattern[str]:
+    """Translate a gitignore-style glob (with ``**``) into a path regex."""
+    out = [] if anchored else ["(?:.*/)?"]
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile("".join(out) + "$")
+
+
+def has_glob(target: str) -> bool:
+    """True when ``target`` contains glob characters."""
+    return _GLOB_CHARS.search(target) is not None
+
+
+def iter_source_files(
+    targets: Iterable[str],
+    exclude: Iterable[str] = (),
+    root: Path | None = None,
+    filter_files: bool = False,
+) -> Iterator[str]:
+    """Yield files to validate for each target, lazily and in a stable order.
+
+    Explicit file paths are yielded as given. Directories are walked
+    recursively, and globs (``src/**/*.py``) are matched while walking their
+    literal prefix. Discovered files are limited to supported languages and
+    skip anything matched by ``DEFAULT_EXCLUDE``, ``exclude`` (gitignore
+    syntax, relative to ``root``) or a ``.gitignore`` between the repository
+    root and the file. Each file is yielded at most once. ``filter_files``
+    applies the language, default and ``exclude`` filters to explicit file
+    paths too.
+    """
+    root_dir = os.path.abspath(root or Path.cwd())
+    base_rules = [
+        IgnoreRules.from_patterns(root_dir, DEFAULT_EXCLUDE),
+        IgnoreRules.from_patterns(root_dir, exclude),
+    ]
+    seen: set[str] = set()
+    for target in targets:
+        if os.path.isfile(target):
+            if filter_files and not _keep_file(target, base_rules):
+                continue
+            paths: Iterable[str] = [target]
+        elif os.path.isdir(target):
+            paths = _walk(target, None, base_rules)
+        elif has_glob(target):
+            base, pattern = _split_glob(target)
+            paths = _walk(base, _compile_glob(pattern), base_rules)
+        else:
+            continue
+        for path in paths:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                yield path
+
+
+def _split_glob(target: str) -> tuple[str, str]:
+    """Split ``src/pkg/**/*.py`` into the directory to walk and the pattern."""
+    parts = target.replace(os.sep, "/").split("/")
+    split = next(i for i, part in enumerate(parts) if has_glob(part))
+    base = "/".join(parts[:split])
+    if not base:
+        base = "/" if target.startswith("/") else "."
+    return base, "/".join(parts[split:])
+
+
+def _walk(
+    top: str, pattern: re.Pattern[str] | None, base_rules: list[IgnoreRules],
+) -> Iterator[str]:
+    """Depth-first scandir walk in sorted order, pruning ignored directories."""
+    rules = [*base_rules, *_ancestor_gitignores(top)]
+    stack: list[tuple[str, list[IgnoreRules]]] = [(top, rules)]
+    while stack:
+        directory, rules = stack.pop()
+        local = IgnoreRules.from_file(os.path.join(directory, ".gitignore"))
+        if local is not None:
+            rules = [*rules, local]
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if _ignored(os.path.abspath(entry.path), is_dir, rules):
+                continue
+            if is_dir:
+                subdirs.append(entry.path)
+            elif detect_language(entry.name) != Language.UNKNOWN and (
+                pattern is None
+                or pattern.match(os.path.relpath(entry.path, top).replace(os.sep, "/"))
+            ):
+                yield os.path.normpath(entry.path)
+        stack.extend((d, rules) for d in reversed(subdirs))
+
+
+def _keep_file(path: str, rules: list[IgnoreRules]) -> bool:
+    """Apply the language filter and ``rules`` (also to its parents) to a file."""
+    if detect_language(path) == Language.UNKNOWN:
+        return False
+    path = os.path.abspath(path)
+    parents = []
+    parent = os.path.dirname(path)
+    while parent != os.path.dirname(parent):
+        parents.append(parent)
+        parent = os.path.dirname(parent)
+    return not any(
+        _ignored(directory, True, rules) for directory in reversed(parents)
+    ) and not _ignored(path, False, rules)
+
+
+def _ignored(path: str, is_dir: bool, rules: list[IgnoreRules]) -> bool:
+    ignored = False
+    for ruleset in rules:
+        decision = ruleset.match(path, is_dir)
+        if decision is not None:
+            ignored = decision
+    return ignored
+
+
+def _ancestor_gitignores(top: str) -> list[IgnoreRules]:
+    """Ignore files above ``top``, up to the enclosing repository root."""
+    current = os.path.abspath(top)
+    chain = []
+    while not os.path.exists(os.path.join(current, ".git")):
+        parent = os.path.dirname(current)
+        if parent == current:
+            return []  # not inside a repository: only ignore files below top apply
+        current = parent
+        chain.append(current)
+    rules = []
+    for directory in reversed(chain):
+        ruleset = IgnoreRules.from_file(os.path.join(directory, ".gitignore"))
+        if ruleset is not None:
+            rules.append(ruleset)
+    return rules
@@ -0,0 +1,237 @@
+"""Wait for source files to change: inotify on Linux, stat polling elsewhere."""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Protocol
+
+from ..models import Language
+from .file_walker import DEFAULT_EXCLUDE, _split_glob, has_glob, iter_source_files
+from .language_detector import detect_language
+
+POLL_INTERVAL = 0.5  # seconds between scans when inotify is unavailable
+DEBOUNCE = 0.05  # seconds of quiet that end a burst of events (one editor save)
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then a NUL-padded name
+_SKIP_DIRS = frozenset(pattern.rstrip("/") for pattern in DEFAULT_EXCLUDE)
+
+# (mtime_ns, size): a file counts as changed when either differs
+_Stat = tuple[int, int]
+
+
+class Watcher(Protocol):
+    kind: str
+
+    def wait(self, timeout: float) -> set[str] | None:
+        """Absolute paths touched within ``timeout``; None if anything may have changed."""
+
+    def close(self) -> None: ...
+
+
+def watch_roots(targets: Iterable[str]) -> list[tuple[str, bool]]:
+    """Directories to watch for ``targets``, and whether to watch recursively."""
+    roots = []
+    for target in targets:
+        if os.path.isdir(target):
+            roots.append((target, True))
+        elif has_glob(target):
+            roots.append((_split_glob(target)[0], True))
+        else:
+            roots.append((os.path.dirname(target) or ".", False))
+    return roots
+
+
+def create_watcher(roots: list[tuple[str, bool]], polling: bool = False) -> Watcher:
+    """inotify watcher for ``roots`` when available, else one that polls."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except OSError:
+            pass  # no inotify in this libc, or out of watches: poll instead
+    return PollingWatcher()
+
+
+class PollingWatcher:
+    """Reports "anything may have changed" every ``interval`` seconds."""
+
+    kind = "polling"
+
+    def __init__(self, interval: float = POLL_INTERVAL) -> None:
+        self.interval = interval
+
+    def wait(self, timeout: float) -> set[str] | None:
+        time.sleep(min(timeout, self.interval))
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes; new subdirectories are watched as they appear."""
+
+    kind = "inotify"
+
+    def __init__(self, roots: list[tuple[str, bool]]) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise _oserror()
+        self._dirs: dict[int, tuple[str, bool]] = {}  # watch descriptor -> (dir, recursive)
+        try:
+            for root, recursive in roots:
+                self._watch(os.path.abspath(root), recursive)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout: float) -> set[str] | None:
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        touched: set[str] | None = set()
+        # Keep reading until the burst of events from one save is over
+        while select.select([self._fd], [], [], DEBOUNCE)[0]:
+            for path in self._read():
+                if path is None:
+                    touched = None
+                elif touched is not None:
+                    touched.add(path)
+        return touched
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch(self, directory: str, recursive: bool) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = _oserror()
+            if error.errno in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return  # vanished or unreadable: nothing to report from it
+            raise error
+        self._dirs[wd] = (directory, recursive)
+        if not recursive:
+            return
+        with contextlib.suppress(OSError), os.scandir(directory) as it:
+            for entry in it:
+                if entry.name not in _SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                    self._watch(entry.path, True)
+
+    def _read(self) -> list[str | None]:
+        """Touched paths from the pending events; None stands for "rescan"."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths: list[str | None] = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            raw = data[offset + _EVENT.size:offset + _EVENT.size + length]
+            offset += _EVENT.size + length
+            name = os.fsdecode(raw.rstrip(b"\0"))
+            if mask & IN_Q_OVERFLOW:
+                paths.append(None)  # events were dropped
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if wd not in self._dirs or not name:
+                continue
+            directory, recursive = self._dirs[wd]
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if recursive and mask & (IN_CREATE | IN_MOVED_TO) and name not in _SKIP_DIRS:
+                    with contextlib.suppress(OSError):  # out of watches: rescans still see it
+                        self._watch(path, True)
+                    paths.append(None)  # files may have landed before the watch did
+            elif not mask & IN_CREATE:  # a new file is reported once it is written
+                paths.append(path)
+        return paths
+
+
+class WatchedFiles:
+    """The files ``targets`` expand to, with their stat signature at the last check."""
+
+    def __init__(self, targets: Iterable[str], exclude: Iterable[str] = ()) -> None:
+        self.targets = list(targets)
+        self.exclude = list(exclude)
+        self.files = self._scan()
+        self._outside: set[str] = set()  # touched paths a rescan showed are not watched
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def update(self, touched: set[str] | None) -> tuple[list[str], list[str]]:
+        """Return ``(changed, removed)`` paths since the last call.
+
+        ``touched`` lists absolute paths a watcher saw change; None means
+        unknown, and every target is rescanned. So is a touched source file
+        not seen before, since the walk decides whether it belongs.
+        """
+        previous = self.files
+        if touched is None or any(
+            path not in previous and path not in self._outside
+            and detect_language(path) != Language.UNKNOWN
+            for path in touched
+        ):
+            current = self._scan()
+            self._outside = {p for p in touched or () if p not in current}
+        else:
+            current = dict(previous)
+            for path in touched & previous.keys():
+                spelling = previous[path][0]
+                stat = _stat(spelling)
+                if stat is None:
+                    del current[path]
+                else:
+                    current[path] = (spelling, stat)
+        self.files = current
+        changed = [spelling for path, (spelling, stat) in current.items()
+                   if path not in previous or previous[path][1] != stat]
+        removed = [spelling for path, (spelling, _) in previous.items() if path not in current]
+        return changed, removed
+
+    def _scan(self) -> dict[str, tuple[str, _Stat]]:
+        files = {}
+        for path in iter_source_files(self.targets, self.exclude):
+            stat = _stat(path)
+            if stat is not None:
+                files[os.path.abspath(path)] = (path, stat)
+        return files
+
+
+def _stat(path: str) -> _Stat | None:
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _oserror() -> OSError:
+    code = ctypes.get_errno()
+    return OSError(code, os.strerror(code))
@@ -0,0 +1,124 @@
+"""Changed files and line ranges from git, for ``check --changed-since``."""
+
+from __future__ import annotations
+
+import ast
+import bisect
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitDiffError(Exception):
+    """Git could not be run or rejected the revision."""
+
+
+@dataclass
+class ChangedLines:
+    """1-based, inclusive line ranges changed in one file; ``None`` ranges means all."""
+
+    ranges: list[tuple[int, int]] | None = field(default_factory=list)
+
+    @property
+    def whole_file(self) -> bool:
+        return self.ranges is None
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """True if any line in ``start..end`` (1-based, inclusive) changed."""
+        if self.ranges is None:
+            return True
+        # Last range starting at or before ``end``
+        i = bisect.bisect_right(self.ranges, (end, float("inf"))) - 1
+        return i >= 0 and self.ranges[i][1] >= start
+
+    def key(self) -> str:
+        """Stable text form, used in cache keys."""
+        if self.ranges is None:
+            return "*"
+        return ",".join(f"{a}-{b}" for a, b in self.ranges)
+
+
+def changed_lines(ref: str, cwd: str | None = None) -> dict[str, ChangedLines]:
+    """Map each file changed since ``ref`` (absolute path) to its changed lines.
+
+    Compares the working tree against the merge base of ``ref`` and HEAD,
+    so on a branch only the branch's own changes count. Untracked files
+    that are not ignored count as entirely changed; deleted files are left
+    out.
+    """
+    top = _git(["rev-parse", "--show-toplevel"], cwd).strip()
+    try:
+        base = _git(["merge-base", ref, "HEAD"], cwd).strip()
+    except GitDiffError:
+        base = ref  # not a commit (or unrelated history): diff against it directly
+    diff = _git(
+        [
+            "-c", "core.quotePath=false", "diff", "--no-color", "--no-ext-diff",
+            "--unified=0", "--diff-filter=d", base, "--",
+        ],
+        cwd,
+    )
+    changes = {
+        os.path.join(top, path): lines for path, lines in parse_unified_diff(diff).items()
+    }
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "-z"], top)
+    for path in filter(None, untracked.split("\0")):
+        changes[os.path.join(top, path)] = ChangedLines(None)
+    return changes
+
+
+def parse_unified_diff(diff: str) -> dict[str, ChangedLines]:
+    """Parse ``git diff --unified=0`` output into new-side line ranges per path."""
+    changes: dict[str, ChangedLines] = {}
+    current: ChangedLines | None = None
+    in_header = False  # "+++ " only names a file between "diff --git" and the first hunk
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            in_header = True
+            current = None
+        elif in_header and line.startswith("+++ "):
+            in_header = False
+            path = line[4:]
+            if path == "/dev/null":
+                current = None
+                continue
+            if path.startswith('"'):
+                path = ast.literal_eval(path)
+            path = path[2:] if path.startswith("b/") else path
+            current = changes.setdefault(path, ChangedLines())
+        elif line.startswith("@@ ") and current is not None and current.ranges is not None:
+            match = _HUNK_HEADER.match(line)
+            if not match:
+                continue
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            if count:
+                current.ranges.append((start, start + count - 1))
+            else:
+                # Lines were only removed, after line ``start``: mark the lines
+                # on both sides, so a statement that lost lines still overlaps
+                current.ranges.append((max(start, 1), start + 1))
+    for lines in changes.values():
+        if lines.ranges is not None:
+            lines.ranges.sort()
+    return changes
+
+
+def _git(args: list[str], cwd: str | None) -> str:
+    try:
+        proc = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",  # diffs can contain arbitrary bytes
+            check=False,
+        )
+    except OSError as exc:
+        raise GitDiffError(f"Cannot run git: {exc}") from exc
+    if proc.returncode != 0:
+        raise GitDiffError(proc.stderr.strip() or f"git {args[0]} failed")
+    return proc.stdout
@@ -0,0 +1,89 @@
+"""Bounded, thread-safe in-memory LRU cache with optional TTL."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Generic, Literal, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class Missing(Enum):
+    """Sentinel type for cache misses."""
+
+    MISSING = "missing"
+
+
+# Returned by LRUCache.get on a miss, so None can be cached as a real value
+MISSING: Literal[Missing.MISSING] = Missing.MISSING
+
+
+class LRUCache(Generic[K, V]):
+    """Least-recently-used cache bounded by entry count.
+
+    Entries older than ``ttl_seconds`` (when set) count as misses and are
+    dropped on access.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float | None = None) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | Literal[Missing.MISSING]:
+        """Return the cached value or ``MISSING``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Insert or refresh ``key``, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        """Return size and hit/miss/eviction counters."""
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,149 @@
+"""``firewall check --watch``: re-validate files as they are saved.
+
+The first pass checks every target like ``firewall check``. After that,
+only changed files are validated again (reparsed incrementally from their
+previous tree-sitter tree) and only the issues that appeared or went away
+are printed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .models import FirewallConfig, ValidationIssue, ValidationResult
+from .utils.file_watcher import WatchedFiles, create_watcher, watch_roots
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from .pipeline.incremental import IncrementalStore
+    from .pipeline.runner import ValidationPipeline
+
+WAIT_TIMEOUT = 1.0  # seconds per watcher wait; only bounds a loop iteration
+
+
+@dataclass
+class IssueChanges:
+    """How one re-checked file's issues differ from its previous check."""
+
+    file: str
+    added: list[ValidationIssue] = field(default_factory=list)
+    resolved: list[ValidationIssue] = field(default_factory=list)
+    deleted: bool = False
+
+
+def diff_issues(
+    old: list[ValidationIssue], new: list[ValidationIssue],
+) -> tuple[list[ValidationIssue], list[ValidationIssue]]:
+    """Return ``(added, resolved)`` going from ``old`` to ``new``.
+
+    Issues match on type, severity and message, ignoring location, so an
+    edit that only shifts an issue to another line does not report it.
+    """
+    added = _unmatched(new, Counter(_identity(i) for i in old))
+    resolved = _unmatched(old, Counter(_identity(i) for i in new))
+    return added, resolved
+
+
+def _unmatched(
+    issues: list[ValidationIssue], others: Counter[tuple[str, ...]],
+) -> list[ValidationIssue]:
+    unmatched = []
+    for issue in issues:
+        key = _identity(issue)
+        if others[key]:
+            others[key] -= 1
+        else:
+            unmatched.append(issue)
+    return unmatched
+
+
+def _identity(issue: ValidationIssue) -> tuple[str, ...]:
+    return issue.issue_type.value, issue.severity.value, issue.message
+
+
+class WatchSession:
+    """Validates the watched files once, then only the ones that change."""
+
+    def __init__(self, pipeline: ValidationPipeline, files: WatchedFiles, jobs: int = 1) -> None:
+        self.pipeline = pipeline
+        self.files = files
+        self.jobs = jobs
+        self.results: dict[str, ValidationResult] = {}
+        if pipeline.documents is None:
+            pipeline.documents = {}
+
+    async def start(self, incremental: IncrementalStore | None = None) -> list[ValidationResult]:
+        """Check every watched file."""
+        paths = [spelling for spelling, _ in self.files.files.values()]
+        results = await self.pipeline.validate_files(paths, self.jobs, incremental)
+        self.results = {result.file: result for result in results}
+        return results
+
+    async def update(self, touched: set[str] | None) -> list[IssueChanges]:
+        """Re-check changed files (see ``WatchedFiles.update``); one entry per file."""
+        changed, removed = await asyncio.to_thread(self.files.update, touched)
+        changes = []
+        for result in await self.pipeline.validate_files(changed, self.jobs):
+            previous = self.results.get(result.file)
+            self.results[result.file] = result
+            added, resolved = diff_issues(previous.issues if previous else [], result.issues)
+            changes.append(IssueChanges(result.file, added, resolved))
+        for path in removed:
+            previous = self.results.pop(path, None)
+            if self.pipeline.documents is not None:
+                self.pipeline.documents.pop(path, None)
+            changes.append(
+                IssueChanges(path, resolved=previous.issues if previous else [], deleted=True),
+            )
+        return changes
+
+
+def run_watch(
+    config: FirewallConfig,
+    targets: tuple[str, ...],
+    jobs: int,
+    console: Console,
+    incremental: bool = False,
+    polling: bool = False,
+) -> None:
+    """Check ``targets``, then keep re-checking what changes until interrupted."""
+    from .pipeline.incremental import IncrementalStore
+    from .pipeline.runner import ValidationPipeline
+    from .reporters.terminal_reporter import print_issue_changes, print_result, print_summary
+
+    files = WatchedFiles(targets, config.exclude)
+    # Watching starts before the first pass, so saves made during it are seen
+    watcher = create_watcher(watch_roots(targets), polling)
+    with asyncio.Runner() as runner:
+        pipeline = ValidationPipeline(config)
+        session = WatchSession(pipeline, files, jobs)
+        try:
+            store = IncrementalStore(config.cache_dir, config) if incremental else None
+            results = runner.run(session.start(store))
+            if store is not None:
+                store.save()
+            for result in results:
+                print_result(result, console)
+            if len(results) > 1:
+                print_summary(results, console)
+            console.print(
+                f"[dim]Watching {len(files)} files ({watcher.kind}), Ctrl-C to stop[/]",
+            )
+            while True:
+                touched = watcher.wait(WAIT_TIMEOUT)
+                if touched is not None and not touched:
+                    continue
+                started = time.perf_counter()
+                changes = runner.run(session.update(touched))
+                if changes:
+                    print_issue_changes(changes, time.perf_counter() - started, console)
+        except KeyboardInterrupt:
+            console.print("[dim]Stopped watching[/]")
+        finally:
+            watcher.close()
+            runner.run(pipeline.close())
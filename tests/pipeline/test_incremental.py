@@ -0,0 +1,116 @@
+"""Tests for the --incremental fingerprint store."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from hallucination_firewall.models import FirewallConfig, Severity
+from hallucination_firewall.pipeline import incremental as incremental_module
+from hallucination_firewall.pipeline.incremental import IncrementalStore
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+
+
+@pytest.fixture
+def config(tmp_path):
+    return FirewallConfig(cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("def foo(\n")
+    # Old enough that stat data alone is trusted
+    old = time.time_ns() - 10 * incremental_module.RACY_WINDOW_NS
+    os.utime(path, ns=(old, old))
+    return path
+
+
+async def _run(config, paths):
+    pipeline = ValidationPipeline(config)
+    store = IncrementalStore(config.cache_dir, config)
+    try:
+        results = await pipeline.validate_files([str(p) for p in paths], 2, store)
+    finally:
+        store.save()
+        await pipeline.close()
+    return results, store
+
+
+class TestIncrementalStore:
+    async def test_unchanged_file_is_replayed(self, config, source, monkeypatch) -> None:
+        first, store = await _run(config, [source])
+        assert store.stats() == {"replayed": 0, "validated": 1}
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("file was read")
+
+        monkeypatch.setattr("builtins.open", _fail)  # stat data alone is enough
+        second, store = await _run(config, [source])
+        assert store.stats() == {"replayed": 1, "validated": 0}
+        assert second == first
+
+    async def test_touched_file_with_same_content_is_replayed(self, config, source) -> None:
+        await _run(config, [source])
+        os.utime(source)  # e.g. a fresh CI checkout
+        _, store = await _run(config, [source])
+        assert store.stats() == {"replayed": 1, "validated": 0}
+
+    async def test_changed_file_is_validated(self, config, source) -> None:
+        await _run(config, [source])
+        source.write_text("x = 1\n")
+        results, store = await _run(config, [source])
+        assert store.stats() == {"replayed": 0, "validated": 1}
+        assert results[0].passed
+
+    async def test_config_change_revalidates(self, config, source) -> None:
+        await _run(config, [source])
+        changed = config.model_copy(update={"severity_threshold": Severity.ERROR})
+        _, store = await _run(changed, [source])
+        assert store.stats()["validated"] == 1
+
+    async def test_expired_entry_revalidates(self, config, source, monkeypatch) -> None:
+        await _run(config, [source])
+        later = time.time() + config.cache_ttl_seconds + 1
+        monkeypatch.setattr(incremental_module.time, "time", lambda: later)
+        _, store = await _run(config, [source])
+        assert store.stats()["validated"] == 1
+
+    async def test_replay_uses_current_path_spelling(self, config, source, monkeypatch) -> None:
+        await _run(config, [source])
+        monkeypatch.chdir(source.parent)
+        results, _ = await _run(config, [source.name])
+        assert results[0].file == "mod.py"
+        assert results[0].issues[0].location.file == "mod.py"
+
+    async def test_changed_first_party_import_revalidates(
+        self, config, tmp_path, monkeypatch,
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.syspath_prepend(str(tmp_path))  # found locally by the import layer
+        lib = tmp_path / "mylib_xyz.py"
+        lib.write_text("def f(a):\n    pass\n")
+        caller = tmp_path / "a.py"
+        caller.write_text("import mylib_xyz\nmylib_xyz.f(1)\n")
+        old = time.time_ns() - 10 * incremental_module.RACY_WINDOW_NS
+        for path in (lib, caller):
+            os.utime(path, ns=(old, old))
+        first, _ = await _run(config, [caller])
+        assert first[0].issues == []
+
+        lib.write_text("def f(a, b):\n    pass\n")  # a.py itself is untouched
+        results, store = await _run(config, [caller])
+        assert store.stats() == {"replayed": 0, "validated": 1}
+        assert "Missing required argument(s): b" in results[0].issues[0].message
+
+    def test_unreadable_file_is_left_to_pipeline(self, config, tmp_path) -> None:
+        store = IncrementalStore(config.cache_dir, config)
+        assert store.lookup(str(tmp_path / "missing.py")) == (None, None)
+
+    def test_corrupt_database_is_ignored(self, config) -> None:
+        config.cache_dir.mkdir(parents=True)
+        (config.cache_dir / "incremental.db").write_bytes(b"not a database" * 100)
+        store = IncrementalStore(config.cache_dir, config)
+        assert store.stats() == {"replayed": 0, "validated": 0}
@@ -0,0 +1,119 @@
+"""Tests for the parse-once ParsedDocument."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from hallucination_firewall.models import FirewallConfig, Language
+from hallucination_firewall.pipeline import parsed_document
+from hallucination_firewall.pipeline.parsed_document import ParsedDocument
+from hallucination_firewall.pipeline.parser_pool import ParserPool
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+
+
+class TestParsedDocument:
+    def test_source_is_utf8_bytes(self) -> None:
+        doc = ParsedDocument("x = 'é'\n", Language.PYTHON)
+        assert doc.source == "x = 'é'\n".encode("utf-8")
+        assert doc.tree is not None
+
+    def test_python_derived_facts(self) -> None:
+        code = "import os\nimport pandas as pd\npd.read_csv('a')\nos.path.join('a', 'b')\n"
+        doc = ParsedDocument(code, Language.PYTHON)
+        assert doc.imports == ["os"]
+        assert doc.aliases == {"pd": "pandas"}
+        assert [c.name for c in doc.calls] == ["pd.read_csv", "os.path.join"]
+
+    def test_analyze_fills_every_derived_fact(self) -> None:
+        doc = ParsedDocument("import os as o\no.getcwd()\n", Language.PYTHON)
+        doc.analyze()
+        assert {"imports", "aliases", "calls"} <= vars(doc).keys()
+
+    def test_javascript_imports(self) -> None:
+        doc = ParsedDocument('import React from "react";\n', Language.JAVASCRIPT)
+        assert doc.imports == ["react"]
+        assert doc.aliases == {}
+        assert doc.calls == []
+
+    def test_unknown_language_has_no_tree(self) -> None:
+        doc = ParsedDocument("fn main() {}", Language.UNKNOWN)
+        assert doc.tree is None
+        assert doc.imports == []
+        assert doc.calls == []
+
+    def test_parser_crash_fails_open(self, monkeypatch) -> None:
+        monkeypatch.setattr(
+            parsed_document.default_pool, "parser",
+            lambda *a: (_ for _ in ()).throw(RuntimeError("crash")),
+        )
+        doc = ParsedDocument("import os\n", Language.PYTHON)
+        assert doc.tree is None
+        assert doc.imports == []
+
+
+class TestIncrementalReparse:
+    BASE = "import os\n\ndef f(x):\n    return os.getcwd(x)\n\ny = 'é'\n"
+
+    @pytest.mark.parametrize(
+        "edited",
+        [
+            "import os\n\ndef f(x, y):\n    return os.getcwd(x)\n\ny = 'é'\n",  # insert
+            "import os\n\ndef f():\n    return os.getcwd()\n\ny = 'é'\n",  # delete
+            "import os\n\ny = 'éé'\nos.popen('ls')\n",  # replace after multibyte text
+            "",
+            BASE,
+        ],
+    )
+    def test_matches_full_parse(self, edited) -> None:
+        previous = ParsedDocument(self.BASE, Language.PYTHON)
+        before = str(previous.tree.root_node)
+        incremental = ParsedDocument(edited, Language.PYTHON, previous)
+        full = ParsedDocument(edited, Language.PYTHON)
+        assert str(incremental.tree.root_node) == str(full.tree.root_node)
+        assert incremental.calls == full.calls
+        assert str(previous.tree.root_node) == before  # the old tree is left untouched
+
+    def test_reuses_unchanged_subtrees(self) -> None:
+        previous = ParsedDocument(self.BASE, Language.PYTHON)
+        edited = self.BASE.replace("getcwd(x)", "getcwd(x, 1)")
+        doc = ParsedDocument(edited, Language.PYTHON, previous)
+        changed = previous.tree.changed_ranges(doc.tree)
+        assert changed and all(r.start_point.row == 3 for r in changed)
+
+    def test_other_language_parses_from_scratch(self) -> None:
+        previous = ParsedDocument("x = 1\n", Language.PYTHON)
+        doc = ParsedDocument("let x = 1;\n", Language.JAVASCRIPT, previous)
+        assert doc.tree.root_node.type == "program"
+
+    def test_edit_span(self) -> None:
+        tree = MagicMock()
+        parsed_document._apply_edit(tree, b"ab\ncd\n", b"ab\ncXd\n")
+        tree.edit.assert_called_once_with(
+            start_byte=4, old_end_byte=4, new_end_byte=5,
+            start_point=(1, 1), old_end_point=(1, 1), new_end_point=(1, 2),
+        )
+
+
+class TestPipelineParsesOnce:
+    @pytest.mark.asyncio
+    async def test_validate_code_parses_once(self, monkeypatch, tmp_path) -> None:
+        pool = ParserPool()
+        monkeypatch.setattr(parsed_document, "default_pool", pool)
+        pipeline = ValidationPipeline(FirewallConfig(cache_dir=tmp_path))
+        code = "import os\nos.system('ls')\nos.path.join('a', 'b')\n"
+        await pipeline.validate_code(code, "test.py")
+        await pipeline.close()
+        assert pool.stats()["python"]["checkouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retained_documents_reparse_incrementally(self, tmp_path) -> None:
+        pipeline = ValidationPipeline(FirewallConfig(cache_dir=tmp_path))
+        pipeline.documents = {}
+        await pipeline.validate_code("import os\nos.getcwd()\n", "a.py")
+        first = pipeline.documents["a.py"]
+        result = await pipeline.validate_code("import os\nos.popen('ls')\n", "a.py")
+        await pipeline.close()
+        assert pipeline.documents["a.py"] is not first
+        assert [i.location.line for i in result.issues] == [2]
@@ -0,0 +1,72 @@
+"""Tests for the tree-sitter parser pool."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from hallucination_firewall.models import Language
+from hallucination_firewall.pipeline.parser_pool import ParserPool
+
+
+class TestParserPool:
+    def test_parser_is_reused(self) -> None:
+        pool = ParserPool()
+        with pool.parser(Language.PYTHON) as first:
+            first.parse(b"x = 1\n")
+        with pool.parser(Language.PYTHON) as second:
+            second.parse(b"y = 2\n")
+        assert first is second
+        stats = pool.stats()["python"]
+        assert stats["created"] == 1
+        assert stats["checkouts"] == 2
+        assert stats["idle"] == 1
+        assert stats["in_use"] == 0
+
+    def test_concurrent_checkouts_get_distinct_parsers(self) -> None:
+        pool = ParserPool()
+        with pool.parser(Language.PYTHON) as a, pool.parser(Language.PYTHON) as b:
+            assert a is not b
+            assert pool.stats()["python"]["in_use"] == 2
+
+    def test_languages_are_pooled_separately(self) -> None:
+        pool = ParserPool()
+        with pool.parser(Language.PYTHON):
+            pass
+        with pool.parser(Language.JAVASCRIPT) as parser:
+            tree = parser.parse(b"const x = 1;")
+        assert not tree.root_node.has_error
+        assert set(pool.stats()) == {"python", "javascript"}
+
+    def test_exhausted_pool_waits_for_checkin(self) -> None:
+        pool = ParserPool(max_per_language=1)
+        acquired = threading.Event()
+
+        def _borrow() -> None:
+            with pool.parser(Language.PYTHON):
+                acquired.set()
+
+        with pool.parser(Language.PYTHON):
+            worker = threading.Thread(target=_borrow)
+            worker.start()
+            assert not acquired.wait(0.05)
+        worker.join(timeout=5)
+        assert acquired.is_set()
+        stats = pool.stats()["python"]
+        assert stats["created"] == 1
+        assert stats["waits"] == 1
+
+    def test_parser_returned_after_exception(self) -> None:
+        pool = ParserPool()
+        with pytest.raises(RuntimeError):
+            with pool.parser(Language.PYTHON):
+                raise RuntimeError("boom")
+        assert pool.stats()["python"]["idle"] == 1
+        assert pool.stats()["python"]["in_use"] == 0
+
+    def test_unsupported_language_raises(self) -> None:
+        pool = ParserPool()
+        with pytest.raises(KeyError):
+            with pool.parser(Language.UNKNOWN):
+                pass
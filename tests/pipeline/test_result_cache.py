@@ -0,0 +1,211 @@
+"""Tests for the whole-file validation result cache."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from hallucination_firewall.models import (
+    FirewallConfig,
+    IssueType,
+    Language,
+    Severity,
+    SourceLocation,
+    ValidationIssue,
+    ValidationResult,
+)
+from hallucination_firewall.pipeline import result_cache
+from hallucination_firewall.pipeline.result_cache import (
+    STORE_PREFIX,
+    ResultCache,
+    dependency_fingerprint,
+    python_dependencies,
+)
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+from hallucination_firewall.registries.cache import RegistryCache, track_registry_reads
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return RegistryCache(tmp_path, ttl_seconds=3600)
+
+
+def _result(message: str = "boom") -> ValidationResult:
+    return ValidationResult(
+        file="t.py",
+        language="python",
+        passed=False,
+        issues=[ValidationIssue(
+            severity=Severity.ERROR,
+            issue_type=IssueType.NONEXISTENT_PACKAGE,
+            location=SourceLocation(file="t.py", line=1),
+            message=message,
+            source="import_checker",
+        )],
+    )
+
+
+class TestKey:
+    def test_inputs_change_key(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        config = FirewallConfig()
+        base = cache.key_for("x = 1\n", "t.py", Language.PYTHON, config)
+        assert base == cache.key_for("x = 1\n", "t.py", Language.PYTHON, config)
+        assert base != cache.key_for("x = 2\n", "t.py", Language.PYTHON, config)
+        assert base != cache.key_for("x = 1\n", "u.py", Language.PYTHON, config)
+        assert base != cache.key_for(
+            "x = 1\n", "t.py", Language.PYTHON, FirewallConfig(ci_mode=True),
+        )
+
+    def test_worker_settings_do_not_change_key(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        config = FirewallConfig()
+        base = cache.key_for("x", "t.py", Language.PYTHON, config)
+        config.workers.max_workers = 8
+        assert base == cache.key_for("x", "t.py", Language.PYTHON, config)
+
+    def test_changed_existence_answer_changes_key(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        registry.set("pypi:exists:foo", False)
+        before = cache.key_for("x", "t.py", Language.PYTHON, FirewallConfig())
+        registry.delete("pypi:exists:bar")
+        assert before == cache.key_for("x", "t.py", Language.PYTHON, FirewallConfig())
+        registry.set("pypi:exists:foo", True)
+        assert before != cache.key_for("x", "t.py", Language.PYTHON, FirewallConfig())
+
+
+class TestDependencyFingerprint:
+    def test_installed_package_version(self, tmp_path) -> None:
+        fingerprint = dependency_fingerprint("t.py", ["os", "pytest"], tmp_path)
+        assert f"pytest@{pytest.__version__}" in fingerprint
+        assert "os@stdlib" in fingerprint
+
+    def test_first_party_module_edit_changes_fingerprint(self, tmp_path) -> None:
+        helper = tmp_path / "helper.py"
+        helper.write_text("def f(): pass\n")
+        main = tmp_path / "main.py"
+        main.write_text("import helper\n")
+        before = dependency_fingerprint(str(main), ["helper"], tmp_path)
+        os.utime(helper, ns=(0, 10**9))
+        after = dependency_fingerprint(str(main), ["helper"], tmp_path)
+        assert before != after
+
+    def test_relative_import_covers_own_package(self, tmp_path) -> None:
+        package = tmp_path / "pkg"
+        (package / "sub").mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        (package / "sub" / "__init__.py").write_text("")
+        (package / "util.py").write_text("")
+        main = package / "sub" / "main.py"
+        code = "from ..util import f\n"
+        main.write_text(code)
+        dependencies = python_dependencies(code, [])
+        assert dependencies == ["."]
+        before = dependency_fingerprint(str(main), dependencies, tmp_path)
+        mtime = main.stat().st_mtime_ns + 10**9
+        os.utime(package / "util.py", ns=(mtime, mtime))
+        result_cache._mtimes.clear()  # skip the reuse window
+        assert before != dependency_fingerprint(str(main), dependencies, tmp_path)
+
+
+class TestGetSet:
+    async def test_roundtrip_returns_copy(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        await cache.set("k", _result(), time.time() + 60)
+        first = await cache.get("k")
+        assert first is not None
+        first.issues.clear()
+        second = await cache.get("k")
+        assert second is not None
+        assert second.issues[0].message == "boom"
+        assert cache.stats()["hits"] == 2
+
+    async def test_expired_entry_misses(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        await cache.set("k", _result(), time.time() - 1)
+        assert await cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+
+    async def test_disk_tier_survives_restart(self, registry) -> None:
+        await ResultCache(8, registry).set("k", _result(), time.time() + 60)
+        fresh = ResultCache(8, registry)
+        result = await fresh.get("k")
+        assert result is not None
+        assert result.issues[0].issue_type == IssueType.NONEXISTENT_PACKAGE
+        assert fresh.stats()["persistent_hits"] == 1
+
+    async def test_memory_only(self, registry) -> None:
+        await ResultCache(8, registry, persist=False).set("k", _result(), time.time() + 60)
+        assert registry.get(STORE_PREFIX + "k") is None
+        assert await ResultCache(8, registry, persist=False).get("k") is None
+
+    async def test_corrupt_store_entry_ignored(self, registry) -> None:
+        registry.set(STORE_PREFIX + "k", {"result": "nope"})
+        assert await ResultCache(8, registry).get("k") is None
+
+
+class TestRegistryReads:
+    def test_expiry_follows_oldest_read(self, registry) -> None:
+        registry.set("pypi:exists:old", True)
+        with track_registry_reads() as reads:
+            registry.get("pypi:exists:old")
+        assert reads.complete
+        assert reads.expires_at(3600) <= time.time() + 3600
+
+    def test_unfilled_miss_is_incomplete(self, registry) -> None:
+        with track_registry_reads() as reads:
+            registry.get("pypi:exists:unknown")
+        assert not reads.complete
+
+    def test_miss_then_set_is_complete(self, registry) -> None:
+        with track_registry_reads() as reads:
+            registry.get("pypi:exists:new")
+            registry.set("pypi:exists:new", True)
+        assert reads.complete
+
+    def test_nested_tracker_reports_to_parent(self, registry) -> None:
+        with track_registry_reads() as outer:
+            with track_registry_reads() as inner:
+                registry.get("pypi:exists:missing")
+        assert not inner.complete
+        assert not outer.complete
+
+    async def test_result_cache_hit_carries_expiry(self, registry) -> None:
+        cache = ResultCache(8, registry)
+        expires_at = time.time() + 60
+        await cache.set("k", _result(), expires_at)
+        with track_registry_reads() as reads:
+            await cache.get("k")
+        assert reads.expires_at(registry.ttl_seconds) == pytest.approx(expires_at)
+
+
+class TestPipelineIntegration:
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        return ValidationPipeline(FirewallConfig(cache_dir=tmp_path))
+
+    async def test_repeat_skips_layers(self, pipeline, monkeypatch) -> None:
+        code = "import os\nos.getcwd(1)\n"
+        first = await pipeline.validate_code(code, "t.py")
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("layer ran")
+
+        monkeypatch.setattr(pipeline, "_run_layers", _fail)
+        second = await pipeline.validate_code(code, "t.py")
+        assert second == first
+        assert pipeline.result_cache.stats()["hits"] == 1
+
+    async def test_fail_open_result_not_cached(self, pipeline, monkeypatch) -> None:
+        async def _network_down(name):
+            return None
+
+        monkeypatch.setattr(pipeline.pypi, "_fetch", _network_down)
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.import_checker.importlib.util.find_spec",
+            lambda name: None,
+        )
+        await pipeline.validate_code("import notreal_pkg_xyz\n", "t.py")
+        assert pipeline.result_cache.stats()["size"] == 0
@@ -0,0 +1,115 @@
+"""Tests for the memoized signature cache."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from hallucination_firewall.models import Language
+from hallucination_firewall.pipeline.signature_cache import PYTHON_VERSION, SignatureCache
+from hallucination_firewall.pipeline.signature_checker import (
+    ParamInfo,
+    SignatureInfo,
+    SignatureLookup,
+    check_signatures,
+)
+from hallucination_firewall.registries.cache import RegistryCache
+from hallucination_firewall.utils.lru import MISSING
+
+SIG = SignatureInfo(params=[ParamInfo(name="s", required=True)])
+
+
+class TestSignatureCache:
+    def test_key_includes_interpreter_and_package_version(self) -> None:
+        cache = SignatureCache()
+        assert cache.key_for("json.loads") == f"{PYTHON_VERSION}:json.loads@stdlib"
+        assert cache.key_for("pytest.fixture").startswith(f"{PYTHON_VERSION}:pytest.fixture@")
+        assert cache.key_for("pytest.fixture").endswith(pytest.__version__)
+        assert cache.key_for("not_a_real_pkg.func") is None
+
+    @pytest.mark.asyncio
+    async def test_first_party_names_are_not_cached(self, tmp_path) -> None:
+        store = RegistryCache(tmp_path)
+        cache = SignatureCache(store=store)
+        await cache.set("helper.foo", SIG)  # a local module: no installed version
+        assert await cache.get("helper.foo") is MISSING
+        assert len(cache._memory) == 0
+        assert store.disk_usage()["entries"] == 0
+
+    def test_package_version_is_reread_after_ttl(self, monkeypatch) -> None:
+        from hallucination_firewall.pipeline import signature_cache
+
+        monkeypatch.setattr(signature_cache, "_versions", signature_cache.LRUCache(8, 60))
+        versions = iter(["1.0", "2.0"])
+        monkeypatch.setattr(signature_cache, "_read_version", lambda module: next(versions))
+        assert signature_cache.package_version("somepkg") == "1.0"
+        assert signature_cache.package_version("somepkg") == "1.0"
+        signature_cache._versions.ttl_seconds = 0
+        assert signature_cache.package_version("somepkg") == "2.0"
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self) -> None:
+        cache = SignatureCache()
+        assert await cache.get("json.loads") is MISSING
+        await cache.set("json.loads", SIG)
+        assert await cache.get("json.loads") == SIG
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_negative_result_cached(self) -> None:
+        cache = SignatureCache()
+        await cache.set("json.nope", None)
+        assert await cache.get("json.nope") is None
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier_survives_new_instance(self, tmp_path) -> None:
+        store = RegistryCache(tmp_path)
+        await SignatureCache(store=store).set("json.loads", SIG)
+        await SignatureCache(store=store).set("json.nope", None)
+
+        fresh = SignatureCache(store=store)
+        assert await fresh.get("json.loads") == SIG
+        assert await fresh.get("json.nope") is None
+        assert fresh.stats()["persistent_hits"] == 2
+
+
+class TestCheckSignaturesWithCache:
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_skips_jedi(self, monkeypatch) -> None:
+        lookups = MagicMock(return_value=SIG)
+        monkeypatch.setattr(SignatureLookup, "get_signature", lookups)
+        cache = SignatureCache()
+        code = "import json\njson.loads('1')\n"
+
+        await check_signatures(code, Language.PYTHON, "a.py", signature_cache=cache)
+        await check_signatures(code, Language.PYTHON, "b.py", signature_cache=cache)
+        assert lookups.call_count == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_alias_resolved_before_caching(self, monkeypatch) -> None:
+        lookups = MagicMock(return_value=None)
+        monkeypatch.setattr(SignatureLookup, "get_signature", lookups)
+        cache = SignatureCache()
+
+        await check_signatures(
+            "import json as j\nj.loads('1')\n", Language.PYTHON, "a.py", signature_cache=cache,
+        )
+        assert lookups.call_args.args[0] == "json.loads"
+        assert await cache.get("json.loads") is None
+
+    @pytest.mark.asyncio
+    async def test_non_imported_names_not_cached(self, monkeypatch) -> None:
+        lookups = MagicMock(return_value=None)
+        monkeypatch.setattr(SignatureLookup, "get_signature", lookups)
+        cache = SignatureCache()
+        code = "client = make()\nclient.send(1)\n"
+
+        await check_signatures(code, Language.PYTHON, "a.py", signature_cache=cache)
+        await check_signatures(code, Language.PYTHON, "b.py", signature_cache=cache)
+        assert lookups.call_count == 2
+        assert cache.stats()["size"] == 0
@@ -17,6 +17,8 @@ from hallucination_firewall.pipeline.signature_checker import (
     _resolve_alias,
     check_signatures,
 )
+from hallucination_firewall.pipeline.timing import LayerTimings
+from hallucination_firewall.utils.git_diff import ChangedLines
 
 
 class TestFunctionCallExtractor:
@@ -64,6 +66,24 @@ class TestFunctionCallExtractor:
         get_call = next(c for c in calls if c.name == "requests.get")
         assert get_call.has_star_kwargs
 
+    def test_nested_calls_in_preorder(self) -> None:
+        code = "x.y().z(a.b(c.d()))"
+        calls = self.extractor.extract_calls(code)
+        assert [c.name for c in calls] == ["x.y", "a.b", "c.d"]
+
+    def test_deeply_nested_calls_no_recursion_error(self) -> None:
+        depth = 5_000
+        code = "mod.f(" * depth + ")" * depth
+        calls = self.extractor.extract_calls(code)
+        assert len(calls) == depth
+        assert all(c.name == "mod.f" for c in calls)
+
+    def test_long_attribute_chain(self) -> None:
+        code = "root" + ".attr" * 5_000 + "()"
+        calls = self.extractor.extract_calls(code)
+        assert len(calls) == 1
+        assert calls[0].name.startswith("root.attr.attr")
+
     def test_malformed_code_no_crash(self) -> None:
         code = "import os\nos.path.join('a'"  # missing closing paren
         calls = self.extractor.extract_calls(code)
@@ -257,6 +277,39 @@ class TestSignatureLookupEdgeCases:
         sig = self.lookup._jedi_lookup("os.path.join", "import os\nos.path.join('a')", 1)
         assert sig is None
 
+    def test_script_reused_for_same_code(self, monkeypatch) -> None:
+        """One jedi.Script per document, however many call sites are resolved."""
+        built: list[str] = []
+
+        def _script(code, **kw):
+            built.append(code)
+            mock_script = MagicMock()
+            mock_script.get_signatures.return_value = []
+            mock_script.goto.return_value = []
+            return mock_script
+
+        monkeypatch.setattr("jedi.Script", _script)
+        code = "import os\nos.getcwd()\nos.listdir('.')\n"
+        self.lookup._jedi_lookup("os.getcwd", code, 1)
+        self.lookup._jedi_lookup("os.listdir", code, 2)
+        assert built == [code]
+
+        self.lookup._jedi_lookup("os.getcwd", "import os\nos.getcwd()\n", 1)
+        assert len(built) == 2
+
+    def test_script_shares_process_project(self, monkeypatch) -> None:
+        projects = []
+
+        def _script(code, project=None):
+            projects.append(project)
+            return MagicMock(get_signatures=MagicMock(return_value=[]), goto=lambda *a, **k: [])
+
+        monkeypatch.setattr("jedi.Script", _script)
+        SignatureLookup()._jedi_lookup("os.getcwd", "a", 0)
+        SignatureLookup()._jedi_lookup("os.getcwd", "b", 0)
+        assert projects[0] is not None
+        assert projects[0] is projects[1]
+
     def test_inspect_lookup_non_dotted_name(self) -> None:
         """_inspect_lookup returns None for non-dotted names."""
         sig = self.lookup._inspect_lookup("print")
@@ -329,3 +382,87 @@ class TestResolveAlias:
     def test_empty_aliases(self) -> None:
         result = _resolve_alias("os.path.join", {})
         assert result == "os.path.join"
+
+
+class TestCallPosition:
+    def test_call_records_name_end_column(self) -> None:
+        calls = FunctionCallExtractor().extract_calls("x = print(os.getcwd())\n")
+        assert [(c.name, c.column) for c in calls] == [("os.getcwd", 19)]
+
+    def test_jedi_resolves_the_nested_call(self) -> None:
+        code = "import os\nprint(os.getcwd())\n"
+        call = FunctionCallExtractor().extract_calls(code)[0]
+        sig = SignatureLookup()._jedi_lookup(call.name, code, call.line, call.column)
+        assert sig is not None
+        assert sig.params == []
+        assert not sig.has_var_positional
+
+    def test_jedi_defaults_are_optional(self) -> None:
+        code = "import json\njson.loads('{}')\n"
+        call = FunctionCallExtractor().extract_calls(code)[0]
+        sig = SignatureLookup()._jedi_lookup(call.name, code, call.line, call.column)
+        assert sig is not None
+        assert [p.name for p in sig.params if p.required] == ["s"]
+
+
+class TestCallSiteDeduplication:
+    @pytest.mark.asyncio
+    async def test_imported_name_resolved_once(self, monkeypatch) -> None:
+        resolved: list[tuple[str, int, int]] = []
+
+        def _resolve(code, targets, *args):
+            resolved.extend(targets)
+            return [SignatureInfo() for _ in targets]
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.signature_checker.resolve_signatures", _resolve,
+        )
+        code = "import os\n" + "os.getcwd(1)\n" * 50
+        timings = LayerTimings()
+        issues = await check_signatures(code, Language.PYTHON, "t.py", timings=timings)
+        assert [name for name, _, _ in resolved] == ["os.getcwd"]
+        assert len(issues) == 50
+        assert [i.location.line for i in issues] == list(range(2, 52))
+        assert timings.stats()["signature_calls"] == {
+            "total": 50, "unique": 1, "unique_ratio": 0.02,
+        }
+
+    @pytest.mark.asyncio
+    async def test_local_names_resolved_per_site(self, monkeypatch) -> None:
+        resolved: list[tuple[str, int, int]] = []
+
+        def _resolve(code, targets, *args):
+            resolved.extend(targets)
+            return [None for _ in targets]
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.signature_checker.resolve_signatures", _resolve,
+        )
+        code = "a = []\na.append(1)\nb = {}\na.append(2)\n"
+        await check_signatures(code, Language.PYTHON, "t.py")
+        assert [(name, line) for name, line, _ in resolved] == [("a.append", 1), ("a.append", 3)]
+
+
+class TestChangedLines:
+    @pytest.mark.asyncio
+    async def test_only_calls_in_changed_lines_are_checked(self, monkeypatch) -> None:
+        resolved: list[tuple[str, int, int]] = []
+
+        def _resolve(code, targets, *args):
+            resolved.extend(targets)
+            return [SignatureInfo() for _ in targets]
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.signature_checker.resolve_signatures", _resolve,
+        )
+        code = "import os\nos.getcwd(1)\nos.listdir(\n    1,\n    2,\n)\nos.getpid(1)\n"
+        # Line 5 is inside the multi-line os.listdir call
+        issues = await check_signatures(
+            code, Language.PYTHON, "t.py", changed=ChangedLines([(5, 5)]),
+        )
+        assert [name for name, _, _ in resolved] == ["os.listdir"]
+        assert [i.location.line for i in issues] == [3]
+
+    def test_call_records_end_line(self) -> None:
+        calls = FunctionCallExtractor().extract_calls("os.getcwd(\n  1,\n)\n")
+        assert (calls[0].line, calls[0].end_line) == (0, 2)
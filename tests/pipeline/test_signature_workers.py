@@ -0,0 +1,181 @@
+"""Tests for the signature inference worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from hallucination_firewall.config import load_config
+from hallucination_firewall.models import Language, WorkerConfig
+from hallucination_firewall.pipeline import signature_workers
+from hallucination_firewall.pipeline.signature_checker import check_signatures
+from hallucination_firewall.pipeline.signature_workers import SignatureResolver
+
+CODE = "import os\nos.getcwd(1)\n"
+
+
+class TestResolver:
+    async def test_thread_mode(self) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=0))
+        found = await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"})
+        assert found is not None
+        assert found[0] is not None
+        assert found[0].params == []
+        assert resolver.stats()["batches"] == 1
+
+    async def test_project_root_resolves_first_party_modules(
+        self, tmp_path, monkeypatch,
+    ) -> None:
+        project = tmp_path / "project"
+        project.mkdir()
+        (project / "helper_mod_xyz.py").write_text("def f(a, b):\n    pass\n")
+        monkeypatch.chdir(tmp_path)  # the daemon's directory, not the client's
+        code = "import helper_mod_xyz\nhelper_mod_xyz.f(1)\n"
+        target = [("helper_mod_xyz.f", 1, 15)]
+        resolver = SignatureResolver(WorkerConfig(max_workers=0), project_root=project)
+        found = await resolver.resolve(code, target, {"helper_mod_xyz"})
+        assert found is not None
+        assert found[0] is not None
+        assert [p.name for p in found[0].params] == ["a", "b"]
+
+    async def test_process_mode(self, tmp_path) -> None:
+        resolver = SignatureResolver(
+            WorkerConfig(max_workers=1, timeout_seconds=60), stub_index_dir=tmp_path,
+        )
+        try:
+            found = await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"})
+        finally:
+            resolver._discard_executor()
+        assert found is not None
+        assert found[0] is not None
+        assert found[0].params == []
+
+    async def test_executor_shared_between_resolvers(self, tmp_path) -> None:
+        config = WorkerConfig(max_workers=1)
+        first = SignatureResolver(config, stub_index_dir=tmp_path / "a")
+        second = SignatureResolver(config, stub_index_dir=tmp_path / "b")
+        try:
+            assert first._executor() is second._executor()
+        finally:
+            first._discard_executor()
+
+    async def test_timeout_fails_open(self, monkeypatch) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=0, timeout_seconds=0.05))
+        monkeypatch.setattr(
+            signature_workers, "_resolve_with_indexes", lambda *a: time.sleep(0.5) or [],
+        )
+        assert await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"}) is None
+        assert resolver.stats()["timeouts"] == 1
+
+    async def test_stub_indexes_prepared_outside_timeout(self, tmp_path, monkeypatch) -> None:
+        resolver = SignatureResolver(
+            WorkerConfig(max_workers=0, timeout_seconds=0.05), stub_index_dir=tmp_path,
+        )
+        prepared = []
+        monkeypatch.setattr(
+            signature_workers, "_prepare_stub_index",
+            lambda index_dir, roots: time.sleep(0.2) or prepared.append(roots),
+        )
+        monkeypatch.setattr(signature_workers, "_resolve_with_indexes", lambda *a: [None])
+        assert await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os", "json"}) == [None]
+        assert await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"}) == [None]
+        assert prepared == [["json", "os"]]  # once per root
+        assert resolver.stats()["timeouts"] == 0
+
+    async def test_timeout_replaces_process_pool(self, tmp_path) -> None:
+        resolver = SignatureResolver(
+            WorkerConfig(max_workers=1, timeout_seconds=0), stub_index_dir=tmp_path,
+        )
+        executor = resolver._executor()
+        assert executor is not None
+        try:
+            executor.submit(int).result()  # start the worker
+            processes = list(executor._processes.values())
+            assert await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"}) is None
+            for process in processes:
+                process.join(10)
+                assert not process.is_alive()
+            assert resolver._executor() is not executor
+        finally:
+            resolver._discard_executor()
+        assert resolver.stats()["timeouts"] == 1
+
+    async def test_discarding_a_replaced_pool_keeps_the_new_one(self) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=1))
+        old = resolver._executor()
+        resolver._discard_executor()
+        new = resolver._executor()
+        try:
+            resolver._discard_executor(old)
+            assert resolver._executor() is new
+        finally:
+            resolver._discard_executor()
+
+    async def test_broken_pool_is_discarded(self, monkeypatch) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=1))
+        discarded = []
+        monkeypatch.setattr(resolver, "_executor", lambda: None)
+        monkeypatch.setattr(resolver, "_discard_executor", lambda executor: discarded.append(True))
+
+        def _crash(*args):
+            raise BrokenProcessPool("worker died")
+
+        monkeypatch.setattr(signature_workers, "_resolve_with_indexes", _crash)
+        assert await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"}) is None
+        assert discarded == [True]
+        assert resolver.stats()["failures"] == 1
+
+    async def test_event_loop_not_blocked(self, monkeypatch) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=0))
+        monkeypatch.setattr(
+            signature_workers, "_resolve_with_indexes", lambda *a: time.sleep(0.3) or [None],
+        )
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(_ticker())
+        await resolver.resolve(CODE, [("os.getcwd", 1, 9)], {"os"})
+        task.cancel()
+        assert ticks > 5
+
+
+class TestCheckSignaturesWithResolver:
+    async def test_issues_reported(self) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=0))
+        issues = await check_signatures(CODE, Language.PYTHON, "t.py", resolver=resolver)
+        assert len(issues) == 1
+        assert "Too many arguments" in issues[0].message
+
+    async def test_timeout_reports_nothing(self, monkeypatch) -> None:
+        resolver = SignatureResolver(WorkerConfig(max_workers=0))
+
+        async def _give_up(*args):
+            return None
+
+        monkeypatch.setattr(resolver, "resolve", _give_up)
+        assert await check_signatures(CODE, Language.PYTHON, "t.py", resolver=resolver) == []
+
+
+def test_library_default_is_in_process() -> None:
+    config = WorkerConfig()
+    assert SignatureResolver(config)._executor() is None
+    config.use_pool()
+    assert config.max_workers == 2
+    pinned = WorkerConfig(max_workers=0)
+    pinned.use_pool()
+    assert pinned.max_workers == 0
+
+
+def test_workers_config_section(tmp_path) -> None:
+    config_file = tmp_path / ".firewall.toml"
+    config_file.write_text("[firewall.workers]\nmax_workers = 4\ntimeout_seconds = 2.5\n")
+    config = load_config(config_file)
+    assert config.workers.max_workers == 4
+    assert config.workers.timeout_seconds == 2.5
+
@@ -0,0 +1,104 @@
+"""Tests for the prebuilt stdlib signature index."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from hallucination_firewall.models import Language
+from hallucination_firewall.pipeline.signature_checker import SignatureLookup, check_signatures
+from hallucination_firewall.pipeline.stdlib_index import (
+    PYTHON_VERSION,
+    StdlibIndex,
+    build_stdlib_index,
+    default_index_path,
+    load_stdlib_index,
+)
+
+
+@pytest.fixture(scope="module")
+def built_index(tmp_path_factory):
+    """Build a real index once, restricted to a few modules to keep tests fast."""
+    path = tmp_path_factory.mktemp("idx") / "stdlib.json.gz"
+    original = sys.stdlib_module_names
+    sys.stdlib_module_names = frozenset({"os", "json", "posixpath", "ntpath", "antigravity"})
+    try:
+        count = build_stdlib_index(path)
+    finally:
+        sys.stdlib_module_names = original
+    return path, count
+
+
+class TestBuild:
+    def test_indexes_public_callables(self, built_index) -> None:
+        path, count = built_index
+        index = load_stdlib_index(path)
+        assert index is not None
+        assert len(index) == count
+        assert "json.loads" in index
+        assert "json.JSONDecoder.decode" in index
+        assert "os.getenv" in index
+
+    def test_aliased_submodule_indexed(self, built_index) -> None:
+        index = load_stdlib_index(built_index[0])
+        assert index.get("os.path.join").has_var_positional
+
+    def test_excluded_and_private_names_skipped(self, built_index) -> None:
+        index = load_stdlib_index(built_index[0])
+        assert not any(name.startswith("antigravity.") for name in index._entries)
+        assert "json._default_decoder" not in index
+
+    def test_signature_round_trip(self, built_index) -> None:
+        sig = load_stdlib_index(built_index[0]).get("json.loads")
+        names = [p.name for p in sig.params]
+        assert names[0] == "s"
+        assert sig.params[0].required
+        assert sig.has_var_keyword
+
+
+class TestLoad:
+    def test_missing_file(self, tmp_path) -> None:
+        assert load_stdlib_index(tmp_path / "none.json.gz") is None
+
+    def test_other_interpreter_ignored(self, tmp_path) -> None:
+        path = tmp_path / "old.json.gz"
+        with gzip.open(path, "wt") as f:
+            json.dump({"format": 1, "python": "2.7", "entries": {}}, f)
+        assert load_stdlib_index(path) is None
+
+    def test_corrupt_file_ignored(self, tmp_path) -> None:
+        path = tmp_path / "bad.json.gz"
+        path.write_bytes(b"not gzip")
+        assert load_stdlib_index(path) is None
+
+    def test_default_path_is_per_interpreter(self, tmp_path) -> None:
+        assert default_index_path(tmp_path).name == f"stdlib-index-py{PYTHON_VERSION}.json.gz"
+
+
+class TestLookupUsesIndex:
+    def test_index_consulted_before_jedi(self, monkeypatch) -> None:
+        index = StdlibIndex({"json.loads": [2, [["s", 1]]]})
+        jedi_lookup = MagicMock()
+        monkeypatch.setattr(SignatureLookup, "_jedi_lookup", jedi_lookup)
+        sig = SignatureLookup(stdlib_index=index).get_signature("json.loads", "", 0)
+        assert [p.name for p in sig.params] == ["s"]
+        jedi_lookup.assert_not_called()
+
+    def test_index_ignored_for_non_imported_root(self) -> None:
+        index = StdlibIndex({"json.loads": [0, []]})
+        lookup = SignatureLookup(stdlib_index=index, imported_roots={"os"})
+        assert lookup._index_lookup("json.loads") is None
+
+    @pytest.mark.asyncio
+    async def test_check_signatures_reports_from_index(self, monkeypatch) -> None:
+        index = StdlibIndex({"json.loads": [0, [["s", 1]]]})
+        monkeypatch.setattr(SignatureLookup, "_jedi_lookup", MagicMock(return_value=None))
+        issues = await check_signatures(
+            "import json\njson.loads()\n", Language.PYTHON, "t.py", stdlib_index=index,
+        )
+        assert len(issues) == 1
+        assert "Missing required argument(s): s" in issues[0].message
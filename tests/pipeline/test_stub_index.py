@@ -0,0 +1,238 @@
+"""Tests for the .pyi stub signature index."""
+
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+
+import pytest
+
+from hallucination_firewall.models import Language
+from hallucination_firewall.pipeline import stub_index as stub_index_module
+from hallucination_firewall.pipeline.signature_checker import SignatureLookup, check_signatures
+from hallucination_firewall.pipeline.stub_index import StubIndex, index_package
+
+STUB_INIT = """\
+import sys
+from typing import overload
+from .api import get as get, post as post
+from .models import *
+
+def connect(host: str, port: int = ..., *, timeout: float = ...) -> None: ...
+def only_pos(a, b, /, c): ...
+def splat(*args: int, **kwargs: str) -> None: ...
+
+@overload
+def fetch(x: int) -> int: ...
+@overload
+def fetch(x: str) -> str: ...
+
+if sys.version_info >= (3, 10):
+    def modern(a: int) -> None: ...
+else:
+    def legacy(a: int) -> None: ...
+
+def _private(x) -> None: ...
+
+class Client:
+    def __init__(self, base_url: str, retries: int = ...) -> None: ...
+    def request(self, method: str, url: str) -> None: ...
+    @staticmethod
+    def build(spec: str) -> Client: ...
+    def _helper(self) -> None: ...
+"""
+
+STUB_API = """\
+def get(url: str, params=None, **kwargs) -> None: ...
+def post(url: str, data=None, json=None, **kwargs) -> None: ...
+"""
+
+STUB_MODELS = """\
+class Response:
+    def json(self, **kwargs) -> dict: ...
+"""
+
+
+def _write_package(root, name: str = "fakepkg") -> None:
+    pkg = root / name
+    pkg.mkdir()
+    (pkg / "__init__.pyi").write_text(STUB_INIT)
+    (pkg / "api.pyi").write_text(STUB_API)
+    (pkg / "models.pyi").write_text(STUB_MODELS)
+    (pkg / "_internal.pyi").write_text("def hidden() -> None: ...\n")
+
+
+@pytest.fixture
+def entries(tmp_path):
+    _write_package(tmp_path)
+    return index_package("fakepkg", tmp_path / "fakepkg")
+
+
+def _params(entry):
+    return [(p["name"], p["required"], p["kind"]) for p in entry["params"]]
+
+
+class TestIndexPackage:
+    def test_plain_function(self, entries) -> None:
+        assert _params(entries["fakepkg.connect"]) == [
+            ("host", True, "POSITIONAL_OR_KEYWORD"),
+            ("port", False, "POSITIONAL_OR_KEYWORD"),
+            ("timeout", False, "KEYWORD_ONLY"),
+        ]
+
+    def test_positional_only(self, entries) -> None:
+        kinds = [kind for _, _, kind in _params(entries["fakepkg.only_pos"])]
+        assert kinds == ["POSITIONAL_ONLY", "POSITIONAL_ONLY", "POSITIONAL_OR_KEYWORD"]
+
+    def test_var_args(self, entries) -> None:
+        entry = entries["fakepkg.splat"]
+        assert entry["params"] == []
+        assert entry["has_var_positional"] and entry["has_var_keyword"]
+
+    def test_overloads_are_ambiguous(self, entries) -> None:
+        assert entries["fakepkg.fetch"].get("ambiguous")
+
+    def test_version_branches_are_flattened(self, entries) -> None:
+        assert "fakepkg.modern" in entries
+        assert "fakepkg.legacy" in entries
+
+    def test_class_constructor_and_methods(self, entries) -> None:
+        assert _params(entries["fakepkg.Client"])[0][0] == "base_url"
+        assert _params(entries["fakepkg.Client.request"])[0][0] == "method"
+        assert _params(entries["fakepkg.Client.build"])[0][0] == "spec"
+        assert "fakepkg.Client._helper" not in entries
+
+    def test_private_names_and_modules_skipped(self, entries) -> None:
+        assert "fakepkg._private" in entries  # module-level names are kept
+        assert not any(key.startswith("fakepkg._internal") for key in entries)
+
+    def test_reexports(self, entries) -> None:
+        assert entries["fakepkg.get"] == entries["fakepkg.api.get"]
+        assert "fakepkg.post" in entries
+        assert "fakepkg.Response.json" in entries
+
+    def test_only_pyi_files_indexed(self, tmp_path) -> None:
+        pkg = tmp_path / "dual"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("def f(a, b, c):\n    pass\n")
+        (pkg / "__init__.pyi").write_text("def f(a) -> None: ...\n")
+        (pkg / "impl.py").write_text("def g(a):\n    pass\n")
+        entries = index_package("dual", pkg)
+        assert len(entries["dual.f"]["params"]) == 1
+        assert "dual.impl.g" not in entries
+
+    def test_single_file_stub(self, tmp_path) -> None:
+        stub = tmp_path / "single.pyi"
+        stub.write_text("def run(cmd: str) -> None: ...\n")
+        assert "single.run" in index_package("single", stub)
+
+
+class TestStubIndex:
+    @pytest.fixture
+    def site(self, tmp_path, monkeypatch):
+        site_dir = tmp_path / "site"
+        site_dir.mkdir()
+        _write_package(site_dir)
+        (site_dir / "fakepkg" / "py.typed").write_text("")
+        monkeypatch.syspath_prepend(str(site_dir))
+        yield site_dir
+        sys.modules.pop("fakepkg", None)
+
+    def test_lookup_from_py_typed_package(self, tmp_path, site) -> None:
+        index = StubIndex(tmp_path / "idx", typeshed_dir=None)
+        sig = index.get("fakepkg.get")
+        assert sig is not None
+        assert [p.name for p in sig.params] == ["url", "params"]
+        assert sig.has_var_keyword
+        assert index.get("fakepkg.fetch") is None  # ambiguous overloads
+        assert index.get("fakepkg.nope") is None
+
+    def test_stubs_package_preferred(self, tmp_path, site) -> None:
+        stubs = site / "fakepkg-stubs"
+        stubs.mkdir()
+        (stubs / "__init__.pyi").write_text("def connect(only: str) -> None: ...\n")
+        sig = StubIndex(tmp_path / "idx", typeshed_dir=None).get("fakepkg.connect")
+        assert sig is not None
+        assert [p.name for p in sig.params] == ["only"]
+
+    def test_stubs_package_keyed_on_its_own_version(self, tmp_path, site, monkeypatch) -> None:
+        stubs = site / "fakepkg-stubs"
+        stubs.mkdir()
+        (stubs / "__init__.pyi").write_text("def connect(only: str) -> None: ...\n")
+        versions = {"fakepkg": "1.0", "fakepkg-stubs": "2.0"}
+        monkeypatch.setattr(stub_index_module, "package_version", versions.__getitem__)
+        StubIndex(tmp_path / "idx", typeshed_dir=None).get("fakepkg.connect")
+        stored = json.loads((tmp_path / "idx" / "fakepkg.json").read_text())
+        assert stored["version"] == "stubs:2.0"
+
+    def test_stub_distribution_found_by_name(self, tmp_path, site) -> None:
+        stubs = site / "fakepkg-stubs"
+        stubs.mkdir()
+        (stubs / "__init__.pyi").write_text("def connect(only: str) -> None: ...\n")
+        dist_info = site / "types_fakepkg-3.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(
+            "Metadata-Version: 2.1\nName: types-fakepkg\nVersion: 3.0\n",
+        )
+        StubIndex(tmp_path / "idx", typeshed_dir=None).get("fakepkg.connect")
+        stored = json.loads((tmp_path / "idx" / "fakepkg.json").read_text())
+        assert stored["version"] == "stubs:3.0"
+
+    def test_index_persisted_and_reused(self, tmp_path, site, monkeypatch) -> None:
+        index_dir = tmp_path / "idx"
+        StubIndex(index_dir, typeshed_dir=None).get("fakepkg.get")
+        assert (index_dir / "fakepkg.json").exists()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("should not re-index")
+
+        monkeypatch.setattr(stub_index_module, "index_package", fail)
+        assert StubIndex(index_dir, typeshed_dir=None).get("fakepkg.get") is not None
+
+    def test_reindexed_when_version_changes(self, tmp_path, site) -> None:
+        index_dir = tmp_path / "idx"
+        StubIndex(index_dir, typeshed_dir=None).get("fakepkg.get")
+        path = index_dir / "fakepkg.json"
+        stored = json.loads(path.read_text())
+        stored["version"] = "py.typed:0.0.old"
+        stored["entries"] = {}
+        path.write_text(json.dumps(stored))
+
+        assert StubIndex(index_dir, typeshed_dir=None).get("fakepkg.get") is not None
+        assert json.loads(path.read_text())["version"] != "py.typed:0.0.old"
+
+    def test_unknown_package(self, tmp_path) -> None:
+        index = StubIndex(tmp_path / "idx", typeshed_dir=None)
+        assert index.get("no_such_package_xyz.run") is None
+        assert not (tmp_path / "idx").exists()
+
+    def test_bundled_typeshed(self, tmp_path) -> None:
+        sig = StubIndex(tmp_path / "idx").get("requests.get")
+        assert sig is not None
+        assert sig.params[0].name == "url"
+
+
+class TestLookupIntegration:
+    def test_stub_index_consulted_before_jedi(self, tmp_path, monkeypatch) -> None:
+        index = StubIndex(tmp_path / "idx")
+        lookup = SignatureLookup(stub_index=index, imported_roots={"requests"})
+        monkeypatch.setattr(lookup, "_jedi_lookup", lambda *a: pytest.fail("jedi used"))
+        sig = lookup.get_signature("requests.get", "import requests\n", 1)
+        assert sig is not None
+
+    def test_not_consulted_for_unimported_roots(self, tmp_path) -> None:
+        index = StubIndex(tmp_path / "idx")
+        lookup = SignatureLookup(stub_index=index, imported_roots=set())
+        assert lookup._index_lookup("requests.get") is None
+
+    async def test_check_signatures_uses_stub_index(self, tmp_path) -> None:
+        code = textwrap.dedent("""\
+            import requests
+            requests.get()
+        """)
+        issues = await check_signatures(
+            code, Language.PYTHON, "t.py", stub_index=StubIndex(tmp_path / "idx"),
+        )
+        assert len(issues) == 1
+        assert "url" in issues[0].message
@@ -0,0 +1,42 @@
+"""Tests for per-layer pipeline timings."""
+
+from __future__ import annotations
+
+import pytest
+
+from hallucination_firewall.pipeline.timing import LayerTimings
+
+
+def test_measure_records_runs() -> None:
+    timings = LayerTimings()
+    with timings.measure("syntax"):
+        pass
+    with timings.measure("syntax"):
+        pass
+    layer = timings.stats()["layers"]["syntax"]
+    assert layer["runs"] == 2
+    assert layer["max_ms"] >= layer["avg_ms"] >= 0
+
+
+def test_measure_records_on_exception() -> None:
+    timings = LayerTimings()
+    with pytest.raises(ValueError), timings.measure("imports"):
+        raise ValueError
+    assert timings.stats()["layers"]["imports"]["runs"] == 1
+
+
+def test_record_aggregates() -> None:
+    timings = LayerTimings()
+    timings.record("signatures", 10.0)
+    timings.record("signatures", 30.0)
+    assert timings.stats()["layers"]["signatures"] == {
+        "runs": 2, "total_ms": 40.0, "avg_ms": 20.0, "max_ms": 30.0,
+    }
+
+
+def test_signature_ratio() -> None:
+    timings = LayerTimings()
+    assert timings.stats()["signature_calls"]["unique_ratio"] == 0
+    timings.record_signature_calls(total=8, unique=2)
+    timings.record_signature_calls(total=2, unique=2)
+    assert timings.stats()["signature_calls"] == {"total": 10, "unique": 4, "unique_ratio": 0.4}
@@ -14,7 +14,10 @@ from hallucination_firewall.registries.pypi_registry import PyPIRegistry
 @pytest.fixture
 def mock_cache():
     cache = MagicMock()
-    cache.get.return_value = None
+    cache.aget = AsyncMock(return_value=None)
+    cache.aset = AsyncMock()
+    cache.aget_many = AsyncMock(return_value={})
+    cache.aset_many = AsyncMock()
     return cache
 
 
@@ -41,7 +44,7 @@ async def test_package_exists_whitespace_name(registry):
 
 @pytest.mark.asyncio
 async def test_package_exists_cache_hit(registry, mock_cache):
-    mock_cache.get.return_value = True
+    mock_cache.aget.return_value = True
     result = await registry.package_exists("requests")
     assert result is True
     registry.client.get.assert_not_called()
@@ -53,7 +56,7 @@ async def test_package_exists_http_200(registry, mock_cache):
     registry.client.get = AsyncMock(return_value=mock_response)
     result = await registry.package_exists("requests")
     assert result is True
-    mock_cache.set.assert_called_with("pypi:exists:requests", True)
+    mock_cache.aset.assert_called_with("pypi:exists:requests", True)
 
 
 @pytest.mark.asyncio
@@ -62,7 +65,7 @@ async def test_package_exists_http_404(registry, mock_cache):
     registry.client.get = AsyncMock(return_value=mock_response)
     result = await registry.package_exists("fake-pkg-xyz")
     assert result is False
-    mock_cache.set.assert_called_with("pypi:exists:fake-pkg-xyz", False)
+    mock_cache.aset.assert_called_with("pypi:exists:fake-pkg-xyz", False)
 
 
 @pytest.mark.asyncio
@@ -70,7 +73,29 @@ async def test_package_exists_network_error(registry, mock_cache):
     registry.client.get = AsyncMock(side_effect=httpx.ConnectError("timeout"))
     result = await registry.package_exists("requests")
     assert result is True  # fail open
-    mock_cache.set.assert_not_called()
+    mock_cache.aset.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_package_exists_many_prefetches_cache(registry, mock_cache):
+    mock_cache.aget_many.return_value = {"pypi:exists:a": True, "pypi:exists:b": False}
+    registry.client.get = AsyncMock(return_value=MagicMock(status_code=404))
+    result = await registry.package_exists_many(["a", "b", "c", "a"])
+    assert result == {"a": True, "b": False, "c": False}
+    assert list(mock_cache.aget_many.call_args.args[0]) == [
+        "pypi:exists:a", "pypi:exists:b", "pypi:exists:c",
+    ]
+    registry.client.get.assert_awaited_once()  # only the miss goes to the network
+    mock_cache.aget.assert_not_called()  # misses are not looked up again
+    mock_cache.aset_many.assert_awaited_once_with({"pypi:exists:c": False})
+
+
+@pytest.mark.asyncio
+async def test_package_exists_many_network_error_fails_open(registry, mock_cache):
+    registry.client.get = AsyncMock(side_effect=httpx.ConnectError("timeout"))
+    result = await registry.package_exists_many(["a"])
+    assert result == {"a": True}
+    mock_cache.aset_many.assert_awaited_once_with({})
 
 
 # --- get_package_info ---
@@ -79,7 +104,7 @@ async def test_package_exists_network_error(registry, mock_cache):
 @pytest.mark.asyncio
 async def test_get_package_info_cache_hit(registry, mock_cache):
     cached = {"name": "requests", "version": "2.31.0"}
-    mock_cache.get.return_value = cached
+    mock_cache.aget.return_value = cached
     result = await registry.get_package_info("requests")
     assert result == cached
 
@@ -101,7 +126,7 @@ async def test_get_package_info_http_200(registry, mock_cache):
     assert result["version"] == "2.31.0"
     assert result["summary"] == "HTTP library"
     assert result["requires_python"] == ">=3.7"
-    mock_cache.set.assert_called_once()
+    mock_cache.aset.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -117,3 +142,16 @@ async def test_get_package_info_network_error(registry, mock_cache):
     registry.client.get = AsyncMock(side_effect=httpx.HTTPError("timeout"))
     result = await registry.get_package_info("requests")
     assert result is None
+
+
+# --- client lifecycle ---
+
+
+@pytest.mark.asyncio
+async def test_client_created_lazily(mock_cache):
+    reg = PyPIRegistry(config=RegistryConfig(timeout_seconds=3), cache=mock_cache)
+    await reg.close()  # nothing to close before the first network lookup
+    assert "client" not in reg.__dict__
+    assert reg.client.timeout.read == 3
+    await reg.close()
+    assert reg.client.is_closed
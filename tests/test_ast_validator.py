@@ -112,7 +112,7 @@ def test_extract_import_alias_non_python():
 def test_validate_syntax_exception(monkeypatch):
     """validate_syntax returns [] when tree-sitter crashes."""
     monkeypatch.setattr(
-        "hallucination_firewall.pipeline.ast_validator.Parser",
+        "hallucination_firewall.pipeline.parsed_document.default_pool.parser",
         lambda *a: (_ for _ in ()).throw(RuntimeError("crash")),
     )
     result = validate_syntax("code", Language.PYTHON, "test.py")
@@ -122,7 +122,7 @@ def test_validate_syntax_exception(monkeypatch):
 def test_extract_imports_exception(monkeypatch):
     """extract_imports returns [] when parsing fails."""
     monkeypatch.setattr(
-        "hallucination_firewall.pipeline.ast_validator.Parser",
+        "hallucination_firewall.pipeline.parsed_document.default_pool.parser",
         lambda *a: (_ for _ in ()).throw(RuntimeError("crash")),
     )
     result = extract_imports("code", Language.PYTHON)
@@ -132,7 +132,7 @@ def test_extract_imports_exception(monkeypatch):
 def test_extract_import_aliases_exception(monkeypatch):
     """extract_import_aliases returns {} when parsing fails."""
     monkeypatch.setattr(
-        "hallucination_firewall.pipeline.ast_validator.Parser",
+        "hallucination_firewall.pipeline.parsed_document.default_pool.parser",
         lambda *a: (_ for _ in ()).throw(RuntimeError("crash")),
     )
     result = extract_import_aliases("import pandas", Language.PYTHON)
@@ -150,3 +150,84 @@ def test_extract_import_aliases_unknown_language():
     """UNKNOWN language returns empty dict."""
     result = extract_import_aliases("code", Language.UNKNOWN)
     assert result == {}
+
+
+def test_extract_python_imports_skips_relative():
+    """Relative 'from . import x' is local code, not a package named x."""
+    code = "from . import utils\nfrom .models import Base\nfrom os import path\n"
+    assert extract_imports(code, Language.PYTHON) == ["os"]
+
+
+# --- Deeply nested input (no RecursionError) ---
+
+DEEP = 5_000
+
+
+def test_validate_syntax_deeply_nested_valid():
+    code = "x = " + "[" * DEEP + "]" * DEEP + "\n"
+    assert validate_syntax(code, Language.PYTHON, "deep.py") == []
+
+
+def test_validate_syntax_deeply_nested_broken():
+    code = "x = " + "[" * DEEP + "\n"
+    issues = validate_syntax(code, Language.PYTHON, "deep.py")
+    assert issues
+    assert all(i.issue_type == IssueType.SYNTAX_ERROR for i in issues)
+
+
+def test_extract_imports_deeply_nested():
+    code = "import os\nx = " + "(" * DEEP + "1" + ")" * DEEP + "\nimport json\n"
+    assert extract_imports(code, Language.PYTHON) == ["os", "json"]
+
+
+def test_extract_js_imports_deeply_nested():
+    code = 'import a from "lodash";\nconst x = ' + "[" * DEEP + "]" * DEEP + ";\n"
+    assert extract_imports(code, Language.JAVASCRIPT) == ["lodash"]
+
+
+def test_extract_import_aliases_deeply_nested():
+    code = "import numpy as np\nx = " + "{" * DEEP + "}" * DEEP + "\n"
+    assert extract_import_aliases(code, Language.PYTHON) == {"np": "numpy"}
+
+
+# --- Error-walk pruning and issue cap ---
+
+
+def test_collect_errors_skips_clean_tree():
+    """A tree without errors is never walked."""
+    from hallucination_firewall.pipeline.ast_validator import _collect_errors
+    from hallucination_firewall.pipeline.parsed_document import ParsedDocument
+
+    doc = ParsedDocument("x = 1\n" * 1000, Language.PYTHON)
+
+    class _Root:
+        has_error = False
+
+        def walk(self):
+            raise AssertionError("clean tree must not be walked")
+
+    issues = []
+    _collect_errors(_Root(), "test.py", issues)
+    assert issues == []
+    assert validate_syntax(doc.code, Language.PYTHON, "test.py", document=doc) == []
+
+
+def test_missing_node_reported():
+    issues = validate_syntax("x = foo(1, 2\n", Language.PYTHON, "test.py")
+    assert issues
+    assert issues[0].location.line == 1
+
+
+def test_error_after_clean_prefix_is_found():
+    code = "x = 1\n" * 500 + "def broken(:\n    pass\n"
+    issues = validate_syntax(code, Language.PYTHON, "test.py")
+    assert len(issues) >= 1
+    assert issues[0].location.line == 501
+
+
+def test_syntax_issues_are_capped():
+    from hallucination_firewall.pipeline.ast_validator import MAX_SYNTAX_ISSUES
+
+    code = "def f(:\n    pass\n" * (MAX_SYNTAX_ISSUES * 4)
+    issues = validate_syntax(code, Language.PYTHON, "test.py")
+    assert len(issues) == MAX_SYNTAX_ISSUES
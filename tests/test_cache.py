@@ -3,6 +3,8 @@
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from hallucination_firewall.registries.cache import RegistryCache
 
 
@@ -89,3 +91,394 @@ def test_cache_clear_expired():
         assert count == 2
         assert cache_expired.get("exp1") is None
         assert cache_expired.get("exp2") is None
+
+
+def test_connection_reused_per_thread(tmp_path):
+    import threading
+
+    cache = RegistryCache(tmp_path)
+    conn = cache._connect()
+    cache.set("k", 1)
+    assert cache.get("k") == 1
+    assert cache._connect() is conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(cache._connect()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+    assert len(cache._connections) == 2
+
+
+def test_connection_pragmas(tmp_path):
+    conn = RegistryCache(tmp_path)._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    assert conn.execute("PRAGMA synchronous").fetchone() == (1,)  # NORMAL
+
+
+def test_close_and_reopen(tmp_path):
+    import sqlite3
+
+
+    cache = RegistryCache(tmp_path)
+    cache.set("k", "v")
+    conn = cache._connect()
+    cache.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    assert cache.get("k") == "v"  # a new connection is opened on demand
+
+
+def test_new_connection_after_fork(tmp_path):
+    cache = RegistryCache(tmp_path)
+    conn = cache._connect()
+    cache._pid = -1  # as seen from a forked child
+    assert cache._connect() is not conn
+    assert cache._connections == [cache._connect()]
+
+
+class TestMemoryTier:
+    def test_hits_skip_sqlite(self, tmp_path, monkeypatch):
+        cache = RegistryCache(tmp_path)
+        cache.set("k", {"v": 1})
+        monkeypatch.setattr(cache, "_connect", lambda: pytest.fail("queried SQLite"))
+        assert cache.get("k") == {"v": 1}
+        assert cache.stats()["memory"]["hits"] == 1
+
+    def test_read_through_fills_memory(self, tmp_path):
+        RegistryCache(tmp_path).set("k", True)  # another process wrote it
+        cache = RegistryCache(tmp_path)
+        assert cache.get("k") is True
+        assert cache.get("k") is True
+        stats = cache.stats()
+        assert stats["sqlite"] == {"hits": 1, "misses": 0, "pending_writes": 0}
+        assert stats["memory"]["hits"] == 1
+
+    def test_negative_entries(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        cache = RegistryCache(tmp_path)
+        assert cache.get("missing") is None
+        assert cache.get("missing") is None
+        assert cache.stats()["memory"]["negative_hits"] == 1
+        RegistryCache(tmp_path).set("missing", 1)
+        assert cache.get("missing") is None  # still remembered as missing
+        monkeypatch.setattr(cache_module, "NEGATIVE_TTL_SECONDS", -1)
+        assert cache.get("missing") == 1
+        cache.set("missing", 2)  # a write replaces the negative entry
+        assert cache.get("missing") == 2
+
+    def test_large_values_stay_in_sqlite(self, tmp_path):
+        cache = RegistryCache(tmp_path)
+        cache.set("big", "x" * 2000)
+        assert cache.get("big") == "x" * 2000
+        assert cache.stats()["memory"]["size"] == 0
+        assert cache.stats()["sqlite"]["hits"] == 1
+
+    def test_memory_entries_expire_with_sqlite(self, tmp_path):
+        import time
+
+        cache = RegistryCache(tmp_path, ttl_seconds=0)
+        cache.set("k", "v")
+        time.sleep(0.01)
+        assert cache.get("k") is None
+        assert cache.stats()["memory"]["hits"] == 0
+
+    def test_delete_clears_memory(self, tmp_path):
+        cache = RegistryCache(tmp_path, memory_size=1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.stats()["memory"]["evictions"] == 1
+        cache.delete("b")
+        assert cache.get("b") is None
+
+    def test_values_are_copies(self, tmp_path):
+        cache = RegistryCache(tmp_path)
+        value = {"versions": ["1.0"]}
+        cache.set("k", value)
+        value["versions"].append("2.0")
+        assert cache.get("k") == {"versions": ["1.0"]}
+
+
+class TestAsyncApi:
+    async def test_aset_writes_behind_in_one_batch(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        cache = RegistryCache(tmp_path)
+        for i in range(3):
+            await cache.aset(f"k{i}", i)
+        assert cache.stats()["sqlite"]["pending_writes"] == 3
+        assert await cache.aget("k1") == 1
+        other = RegistryCache(tmp_path)
+        assert other.get("k1") is None  # not written yet
+        assert await cache.aflush() == 3
+        assert RegistryCache(tmp_path).get("k1") == 1
+        cache.close()
+
+    async def test_queued_large_values_are_readable(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        cache = RegistryCache(tmp_path)
+        await cache.aset("big", "x" * 2000)  # not kept in memory
+        assert await cache.aget("big") == "x" * 2000
+        cache.close()
+        assert RegistryCache(tmp_path).get("big") == "x" * 2000  # close() flushed
+
+    async def test_flushes_after_interval_or_batch(self, tmp_path, monkeypatch):
+        import asyncio
+
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 0.01)
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_BATCH", 3)
+        cache = RegistryCache(tmp_path)
+        await cache.aset("a", 1)
+        await asyncio.sleep(0.1)
+        assert cache.stats()["sqlite"]["pending_writes"] == 0
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        for key in "bcd":
+            await cache.aset(key, 1)
+        await asyncio.sleep(0.1)
+        assert cache.stats()["sqlite"]["pending_writes"] == 0  # a full batch does not wait
+        assert RegistryCache(tmp_path).get("d") == 1
+        cache.close()
+
+    async def test_aclose_flushes_off_the_loop(self, tmp_path, monkeypatch):
+        import threading
+
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        cache = RegistryCache(tmp_path)
+        await cache.aset("k", 1)
+        threads = []
+        original = cache.close
+
+        def _close():
+            threads.append(threading.current_thread())
+            original()
+
+        cache.close = _close
+        await cache.aclose()
+        assert threads[0] is not threading.current_thread()
+        assert cache._flush_timer is None
+        assert RegistryCache(tmp_path).get("k") == 1
+
+    async def test_reads_run_off_the_loop(self, tmp_path):
+        import threading
+
+        from hallucination_firewall.registries.cache import track_registry_reads
+
+        RegistryCache(tmp_path).set("k", "v")
+        cache = RegistryCache(tmp_path)
+        threads = []
+        original = cache._get_stored
+
+        def _get_stored(key):
+            threads.append(threading.current_thread())
+            return original(key)
+
+        cache._get_stored = _get_stored
+        with track_registry_reads() as reads:
+            assert await cache.aget("k") == "v"
+            assert await cache.aget("missing") is None
+        assert threads[0] is not threading.current_thread()
+        assert reads.oldest is not None
+        assert reads.unresolved == {"missing"}
+        cache.close()
+
+    async def test_sync_set_supersedes_queued_write(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        cache = RegistryCache(tmp_path)
+        await cache.aset("k", "old")
+        cache.set("k", "new")
+        await cache.aset("gone", 1)
+        cache.delete("gone")
+        assert cache.flush() == 0
+        assert RegistryCache(tmp_path).get("k") == "new"
+        assert RegistryCache(tmp_path).get("gone") is None
+        cache.close()
+
+    def test_flush_fails_open(self, tmp_path, caplog):
+        cache = RegistryCache(tmp_path)
+        cache._pending["k"] = ("1", 0.0)
+        cache._connect().execute("DROP TABLE cache")
+        assert cache.flush() == 1
+        assert "Dropping 1 queued registry cache writes" in caplog.text
+        assert cache._pending == {}
+
+
+class TestBulk:
+    def test_get_many_single_query(self, tmp_path):
+        RegistryCache(tmp_path).set_many({"a": 1, "b": [2], "big": "x" * 2000})
+        cache = RegistryCache(tmp_path)
+        assert cache.get("a") == 1  # now in memory
+        statements = []
+        cache._connect().set_trace_callback(statements.append)
+        assert cache.get_many(["a", "b", "big", "missing", "b"]) == {
+            "a": 1, "b": [2], "big": "x" * 2000,
+        }
+        assert len(statements) == 1
+        assert "WHERE key IN ('b','big','missing')" in statements[0]
+        # Misses were remembered, hits kept in memory: no further queries
+        assert cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": [2]}
+        assert len(statements) == 1
+
+    def test_get_many_chunks_large_requests(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "MAX_QUERY_KEYS", 2)
+        cache = RegistryCache(tmp_path, memory_size=0)
+        cache.set_many({f"k{i}": i for i in range(5)})
+        assert cache.get_many(f"k{i}" for i in range(6)) == {f"k{i}": i for i in range(5)}
+
+    def test_get_many_tracks_reads(self, tmp_path):
+        from hallucination_firewall.registries.cache import track_registry_reads
+
+        cache = RegistryCache(tmp_path, memory_size=0)
+        cache.set("a", 1)
+        with track_registry_reads() as reads:
+            cache.get_many(["a", "missing"])
+        assert reads.oldest is not None
+        assert reads.unresolved == {"missing"}
+
+    def test_set_many_is_one_transaction(self, tmp_path):
+        cache = RegistryCache(tmp_path)
+        statements = []
+        cache._connect().set_trace_callback(statements.append)
+        cache.set_many({"a": 1, "b": 2})
+        assert [s.split()[0] for s in statements] == ["BEGIN", "INSERT", "INSERT", "COMMIT"]
+        assert RegistryCache(tmp_path).get_many(["a", "b"]) == {"a": 1, "b": 2}
+
+    def test_set_many_rolls_back_on_error(self, tmp_path):
+        import sqlite3
+
+        cache = RegistryCache(tmp_path)
+        cache._connect().execute("DROP TABLE cache")
+        with pytest.raises(sqlite3.OperationalError):
+            cache.set_many({"a": 1})
+        assert not cache._connect().in_transaction
+
+    async def test_aget_many_reads_queued_writes(self, tmp_path, monkeypatch):
+        from hallucination_firewall.registries import cache as cache_module
+
+        monkeypatch.setattr(cache_module, "WRITE_BEHIND_INTERVAL", 60)
+        cache = RegistryCache(tmp_path, memory_size=0)
+        cache.set("a", 1)
+        await cache.aset("b", 2)
+        assert await cache.aget_many(["a", "b", "c"]) == {"a": 1, "b": 2}
+        cache.close()
+
+
+class TestBounds:
+    def test_migrates_old_schema(self, tmp_path):
+        import sqlite3
+
+        conn = sqlite3.connect(tmp_path / "registry_cache.db")
+        conn.execute(
+            "CREATE TABLE cache"
+            " (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO cache VALUES ('k', '1', 123.0)")
+        conn.commit()
+        conn.close()
+        cache = RegistryCache(tmp_path, ttl_seconds=10**10)
+        conn = cache._connect()
+        assert conn.execute("SELECT last_access FROM cache").fetchone() == (123.0,)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(cache)")}
+        assert {"cache_created_at", "cache_last_access"} <= indexes
+        assert cache.get("k") == 1
+        assert conn.execute("PRAGMA auto_vacuum").fetchone() == (0,)
+        cache.vacuum()  # switches the old file to incremental auto-vacuum
+        assert conn.execute("PRAGMA auto_vacuum").fetchone() == (2,)
+
+    def test_prune_expires_then_evicts_least_recently_used(self, tmp_path):
+        import time
+
+        cache = RegistryCache(tmp_path, max_entries=2)
+        cache.set_many({"a": 1, "b": 2, "c": 3})
+        cache._connect().execute("UPDATE cache SET created_at = 0 WHERE key = 'c'")
+        cache._memory.clear()
+        cache.set("d", 4)
+        time.sleep(0.01)
+        assert cache.get("a") == 1  # read after "b" and "d" were written
+        result = cache.prune()
+        assert (result.expired, result.evicted) == (1, 1)
+        assert cache.get_many(["a", "b", "c", "d"]) == {"a": 1, "d": 4}
+        assert cache.epoch == 0  # derived results expire on their own
+
+    def test_epoch_changes_only_with_an_existence_answer(self, tmp_path):
+        cache = RegistryCache(tmp_path)
+        cache.set("pypi:exists:foo", False)
+        cache.set("pypi:exists:foo", False)
+        cache.set("sig2:foo", {"params": []})
+        cache.set("sig2:foo", {"missing": True})
+        cache.delete("pypi:exists:bar")
+        assert cache.clear_expired() == 0
+        assert cache.epoch == 0
+        cache.set("pypi:exists:foo", True)
+        assert cache.epoch == 1
+
+    def test_prune_keeps_values_written_during_eviction(self, tmp_path, monkeypatch):
+        import time
+
+        cache = RegistryCache(tmp_path, max_entries=1)
+        cache.set("k", 1)
+
+        def _evict(conn):
+            # An aset from the event loop lands while the I/O thread evicts "k"
+            cache._pending["k"] = ("2", time.time())
+            cache._remember("k", "2", time.time())
+            return ["k"]
+
+        monkeypatch.setattr(cache, "_evict", _evict)
+        assert cache.prune().evicted == 1
+        assert cache._memory.get("k")[0] == 2  # still served from memory
+
+    def test_prune_by_size(self, tmp_path):
+        cache = RegistryCache(tmp_path, max_entries=0, max_bytes=2500)
+        cache.set_many({f"k{i}": "x" * 1000 for i in range(5)})
+        result = cache.prune()
+        assert result.evicted == 3
+        assert result.freed_bytes > 0
+        assert cache.disk_usage()["data_bytes"] <= 2500
+        assert len(cache._memory) == 2  # evicted entries left the memory tier too
+
+    def test_unbounded(self, tmp_path):
+        cache = RegistryCache(tmp_path, max_entries=0, max_bytes=0)
+        cache.set_many({f"k{i}": i for i in range(5)})
+        assert cache.prune().evicted == 0
+
+    def test_disk_usage(self, tmp_path):
+        cache = RegistryCache(tmp_path, ttl_seconds=60)
+        cache.set_many({"a": "xx", "b": "yy"})
+        cache._connect().execute("UPDATE cache SET created_at = 0 WHERE key = 'a'")
+        usage = cache.disk_usage()
+        assert (usage["entries"], usage["expired"], usage["data_bytes"]) == (2, 1, 10)
+        assert usage["file_bytes"] > 0
+        before, after = cache.vacuum()
+        assert after <= before
+
+    def test_writes_start_background_maintenance(self, tmp_path, caplog):
+        import logging
+
+        cache = RegistryCache(tmp_path, max_entries=1)
+        cache._next_maintenance = 0
+        with caplog.at_level(logging.DEBUG, "hallucination_firewall.registries.cache"):
+            cache.set_many({"a": 1, "b": 2})
+            cache.close()  # waits for the I/O thread
+            assert cache.disk_usage()["entries"] == 1
+            cache.set("c", 3)  # the next interval has not passed yet
+            cache.close()
+        assert caplog.text.count("maintenance") == 1
+        assert cache.disk_usage()["entries"] == 2
+
+    def test_background_maintenance_fails_open(self, tmp_path, caplog):
+        cache = RegistryCache(tmp_path)
+        cache._connect().execute("DROP TABLE cache")
+        cache._maintain()
+        assert "Registry cache maintenance failed" in caplog.text
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
 from unittest.mock import MagicMock
 
 import pytest
@@ -43,6 +45,120 @@ class TestCheckCommand:
         result = runner.invoke(main, ["check", "--stdin"], input="x = 1\n")
         assert result.exit_code == 0
 
+    def test_check_timings(self, runner, tmp_path):
+        f = tmp_path / "calls.py"
+        f.write_text("import os\nos.getcwd()\nos.getcwd()\n")
+        result = runner.invoke(main, ["check", str(f), "--timings"])
+        assert result.exit_code == 0
+        assert "Layer timings" in result.output
+        assert "2 total, 1 unique" in result.output
+
+    def test_check_jobs_keeps_input_order(self, runner, tmp_path, monkeypatch):
+        reported = MagicMock()
+        monkeypatch.setattr("hallucination_firewall.reporters.json_reporter.print_json", reported)
+        paths = []
+        for i in range(6):
+            f = tmp_path / f"m{i}.py"
+            f.write_text("def foo(\n" if i % 2 else f"x = {i}\n")
+            paths.append(str(f))
+        result = runner.invoke(main, ["check", *paths, "--jobs", "3", "--format", "json"])
+        assert result.exit_code == 1
+        results = reported.call_args.args[0]
+        assert [r.file for r in results] == paths
+        assert [r.passed for r in results] == [True, False] * 3
+
+    def test_check_directory_and_glob(self, runner, tmp_path, monkeypatch):
+        reported = MagicMock()
+        monkeypatch.setattr("hallucination_firewall.reporters.json_reporter.print_json", reported)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "a.py").write_text("x = 1\n")
+        (tmp_path / "src" / "pkg" / "b.py").write_text("y = 2\n")
+        (tmp_path / "src" / "notes.txt").write_text("not code\n")
+        (tmp_path / "top.py").write_text("z = 3\n")
+        result = runner.invoke(main, ["check", "src", "*.py", "--format", "json"])
+        assert result.exit_code == 0
+        files = [r.file for r in reported.call_args.args[0]]
+        assert files == [
+            os.path.join("src", "a.py"), os.path.join("src", "pkg", "b.py"), "top.py",
+        ]
+
+    def test_check_missing_path_is_usage_error(self, runner, tmp_path):
+        result = runner.invoke(main, ["check", str(tmp_path / "missing.py")])
+        assert result.exit_code == 2
+        assert "does not exist" in result.output
+
+    def test_check_empty_directory(self, runner, tmp_path):
+        result = runner.invoke(main, ["check", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "No supported source files found" in result.output
+
+    def test_check_incremental(self, runner, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".firewall.toml").write_text(
+            f"[firewall]\ncache_dir = {str(tmp_path / 'cache')!r}\n",
+        )
+        (tmp_path / "bad.py").write_text("def foo(\n")
+        args = ["check", "bad.py", "--incremental", "--timings"]
+        first = runner.invoke(main, args)
+        assert first.exit_code == 1
+        assert "Incremental: 0 replayed, 1 validated" in first.output
+        second = runner.invoke(main, args)
+        assert second.exit_code == 1
+        assert "Incremental: 1 replayed, 0 validated" in second.output
+
+    def test_check_changed_since(self, runner, tmp_path, monkeypatch):
+        for var in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{var}_NAME", "test")
+            monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+        monkeypatch.chdir(tmp_path)
+        reported = MagicMock()
+        monkeypatch.setattr("hallucination_firewall.reporters.json_reporter.print_json", reported)
+        (tmp_path / ".firewall.toml").write_text(
+            f"[firewall]\ncache_dir = {str(tmp_path / 'cache')!r}\n",
+        )
+        (tmp_path / ".gitignore").write_text("cache/\n")
+        (tmp_path / "old.py").write_text("import os\nos.popen('ls')\n")
+        (tmp_path / "edited.py").write_text("import os\nos.popen('ls')\n")
+        subprocess.run(["git", "init", "-q"], check=True)
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "base"], check=True)
+        (tmp_path / "edited.py").write_text("import os\nos.popen('ls')\nos.system('ls')\n")
+
+        result = runner.invoke(main, ["check", "--changed-since", "HEAD", "--format", "json"])
+        assert result.exit_code == 0
+        (checked,) = reported.call_args.args[0]
+        assert checked.file == "edited.py"
+        assert [i.location.line for i in checked.issues] == [3]
+
+        bad = runner.invoke(main, ["check", "--changed-since", "no-such-ref"])
+        assert bad.exit_code == 2
+
+    def test_check_changed_since_rejects_incremental(self, runner, tmp_path):
+        args = ["check", str(tmp_path), "--changed-since", "HEAD", "--incremental"]
+        result = runner.invoke(main, args)
+        assert result.exit_code == 2
+
+    def test_check_pool_keeps_configured_workers(self, tmp_path, monkeypatch):
+        from hallucination_firewall.cli import MAX_CHECK_WORKERS, _check_config, _use_check_pool
+
+        monkeypatch.chdir(tmp_path)
+        config = _check_config(ci=False)
+        assert config.workers.max_workers is None  # left for a daemon to size
+        _use_check_pool(config, jobs=64)
+        assert config.workers.max_workers == MAX_CHECK_WORKERS
+
+        (tmp_path / ".firewall.toml").write_text("[firewall.workers]\nmax_workers = 1\n")
+        config = _check_config(ci=False)
+        _use_check_pool(config, jobs=64)
+        assert config.workers.max_workers == 1
+
+    def test_check_jobs_must_be_positive(self, runner, tmp_path):
+        f = tmp_path / "valid.py"
+        f.write_text("x = 1\n")
+        result = runner.invoke(main, ["check", str(f), "--jobs", "0"])
+        assert result.exit_code == 2
+
 
 class TestParseCommand:
     def test_parse_markdown_file(self, runner, tmp_path):
@@ -176,3 +292,75 @@ class TestParseExtended:
         monkeypatch.setattr("httpx.get", MagicMock(return_value=mock_response))
         result = runner.invoke(main, ["parse", "--url", "https://example.com/code.md"])
         assert result.exit_code == 0
+
+
+class TestIndexCommand:
+    def test_build_stdlib_writes_index(self, runner, tmp_path, monkeypatch):
+        calls = []
+
+        def _build(path):
+            calls.append(path)
+            return 42
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.stdlib_index.build_stdlib_index", _build
+        )
+        out = tmp_path / "idx.json.gz"
+        result = runner.invoke(main, ["index", "build-stdlib", "--output", str(out)])
+        assert result.exit_code == 0
+        assert calls == [out]
+        assert "42" in result.output
+
+    def test_build_stdlib_default_path(self, runner, tmp_path, monkeypatch):
+        from hallucination_firewall.models import FirewallConfig
+
+        monkeypatch.setattr(
+            "hallucination_firewall.config.load_config",
+            lambda *a, **kw: FirewallConfig(cache_dir=tmp_path),
+        )
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.stdlib_index.build_stdlib_index",
+            lambda path: 1,
+        )
+        result = runner.invoke(main, ["index", "build-stdlib"])
+        assert result.exit_code == 0
+        assert "stdlib-index-py" in result.output
+
+
+class TestCacheCommand:
+    @pytest.fixture
+    def cache_dir(self, tmp_path, monkeypatch):
+        from hallucination_firewall.models import FirewallConfig
+        from hallucination_firewall.registries.cache import RegistryCache
+
+        monkeypatch.setattr(
+            "hallucination_firewall.config.load_config",
+            lambda *a, **kw: FirewallConfig(cache_dir=tmp_path, registry_cache_max_entries=5),
+        )
+        cache = RegistryCache(tmp_path)
+        cache.set_many({f"k{i}": "x" * 500 for i in range(20)})
+        cache.close()
+        return tmp_path
+
+    def test_stats(self, runner, cache_dir):
+        result = runner.invoke(main, ["cache", "stats"])
+        assert result.exit_code == 0, result.output
+        assert "entries:  20 (0 expired), limit 5" in result.output
+        assert "limit 256.0 MB" in result.output
+
+    def test_prune_and_vacuum(self, runner, cache_dir):
+        result = runner.invoke(main, ["cache", "prune"])
+        assert result.exit_code == 0, result.output
+        assert "Removed 0 expired and 15 evicted entries" in result.output
+        result = runner.invoke(main, ["cache", "vacuum"])
+        assert result.exit_code == 0, result.output
+        assert "Vacuumed" in result.output
+        assert "entries:  5 " in runner.invoke(main, ["cache", "stats"]).output
+
+
+def test_format_bytes():
+    from hallucination_firewall.cli import _format_bytes
+
+    assert [_format_bytes(n) for n in (12, 2048, 3 * 1024**2, 5 * 1024**3)] == [
+        "12 B", "2.0 KB", "3.0 MB", "5.0 GB",
+    ]
@@ -0,0 +1,213 @@
+"""Tests for the background validation daemon."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from unittest.mock import AsyncMock
+
+import pytest
+from click.testing import CliRunner
+
+from hallucination_firewall import daemon as daemon_module
+from hallucination_firewall.cli import main
+from hallucination_firewall.daemon import (
+    DaemonError,
+    FirewallDaemon,
+    check_via_daemon,
+    daemon_status,
+    request,
+    socket_path,
+)
+from hallucination_firewall.models import FirewallConfig
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+from hallucination_firewall.utils.git_diff import ChangedLines
+
+
+@pytest.fixture
+def config(tmp_path):
+    return FirewallConfig(cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture
+async def daemon(config):
+    sock = socket_path(config.cache_dir)
+    daemon = FirewallDaemon(sock, idle_timeout=0)
+    task = asyncio.create_task(daemon.serve())
+    while await daemon_status(sock) is None:
+        await asyncio.sleep(0.01)
+    yield daemon
+    daemon.stop()
+    await task
+
+
+class TestDaemon:
+    async def test_status(self, daemon) -> None:
+        status = await daemon_status(daemon.sock)
+        assert status is not None
+        assert status["pipelines"] == 0
+
+    async def test_check_matches_in_process(self, daemon, config, tmp_path, monkeypatch) -> None:
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "a.py").write_text("import os\nos.getcwd(1)\nos.popen('ls')\n")
+        (tmp_path / "b.py").write_text("def foo(\n")
+        remote = await check_via_daemon(config, ["a.py", "b.py"], jobs=2)
+        assert remote is not None
+        assert [r.file for r in remote] == ["a.py", "b.py"]
+        assert remote[0].issues[0].location.file == "a.py"
+
+        pipeline = ValidationPipeline(FirewallConfig(cache_dir=tmp_path / "other"))
+        local = await pipeline.validate_files(["a.py", "b.py"])
+        await pipeline.close()
+        strip = {"checked_at"}
+        assert [r.model_dump(exclude=strip) for r in remote] == [
+            r.model_dump(exclude=strip) for r in local
+        ]
+        assert (await daemon_status(daemon.sock))["pipelines"] == 1
+
+    async def test_check_with_changed_lines(self, daemon, config, tmp_path) -> None:
+        path = tmp_path / "a.py"
+        path.write_text("import os\nos.popen('ls')\nos.system('ls')\n")
+        remote = await check_via_daemon(
+            config, [str(path)], changed_lines={str(path): ChangedLines([(3, 3)])},
+        )
+        assert [i.location.line for i in remote[0].issues] == [3]
+
+    async def test_pipeline_per_project_root(self, daemon, config, tmp_path, monkeypatch) -> None:
+        for name in ("one", "two"):
+            project = tmp_path / name
+            project.mkdir()
+            (project / "a.py").write_text("x = 1\n")
+            monkeypatch.chdir(project)
+            assert await check_via_daemon(config, ["a.py"]) is not None
+        roots = sorted(p.project_root.name for p in daemon._pipelines.values())
+        assert roots == ["one", "two"]
+
+    async def test_evicted_pipeline_closed_after_last_request(
+        self, config, tmp_path, monkeypatch,
+    ) -> None:
+        monkeypatch.setattr(daemon_module, "MAX_PIPELINES", 1)
+        daemon = FirewallDaemon(socket_path(config.cache_dir))
+        async with daemon._pipeline_for(config, tmp_path / "one") as busy:
+            busy.close = AsyncMock()
+            async with daemon._pipeline_for(config, tmp_path / "two") as other:
+                other.close = AsyncMock()
+            busy.close.assert_not_awaited()  # evicted, but still in use
+            other.close.assert_not_awaited()  # the warm one stays open
+        busy.close.assert_awaited_once()
+
+    async def test_unanswered_request_times_out(self, config, monkeypatch) -> None:
+        sock = socket_path(config.cache_dir)
+        sock.parent.mkdir(parents=True)
+
+        async def _never_answer(reader, writer) -> None:
+            await reader.readline()
+            await asyncio.sleep(10)
+
+        server = await asyncio.start_unix_server(_never_answer, path=str(sock))
+        try:
+            with pytest.raises(DaemonError, match="no daemon response"):
+                await request(sock, {"op": "status"}, timeout=0.05)
+            monkeypatch.setattr(daemon_module, "CHECK_TIMEOUT", 0.05)
+            assert await check_via_daemon(config, ["a.py"]) is None
+        finally:
+            server.close()
+
+    async def test_no_daemon_returns_none(self, config, tmp_path) -> None:
+        assert await check_via_daemon(config, [str(tmp_path / "a.py")]) is None
+        # A socket file left behind by a dead daemon
+        config.cache_dir.mkdir(parents=True)
+        socket_path(config.cache_dir).write_text("")
+        assert await check_via_daemon(config, [str(tmp_path / "a.py")]) is None
+
+    async def test_version_mismatch_rejected(self, daemon) -> None:
+        reader, writer = await asyncio.open_unix_connection(str(daemon.sock))
+        writer.write(json.dumps({"op": "status", "version": "0.0.0"}).encode() + b"\n")
+        response = json.loads(await reader.readline())
+        writer.close()
+        assert "version" in response["error"]
+
+    async def test_unknown_op(self, daemon) -> None:
+        with pytest.raises(DaemonError, match="unknown op"):
+            await request(daemon.sock, {"op": "bogus"})
+
+    async def test_second_daemon_refused(self, daemon) -> None:
+        with pytest.raises(DaemonError, match="already listening"):
+            await FirewallDaemon(daemon.sock).serve()
+
+    async def test_stop_request_removes_socket(self, config) -> None:
+        sock = socket_path(config.cache_dir)
+        daemon = FirewallDaemon(sock, idle_timeout=0)
+        task = asyncio.create_task(daemon.serve())
+        while await daemon_status(sock) is None:
+            await asyncio.sleep(0.01)
+        await request(sock, {"op": "stop"})
+        await asyncio.wait_for(task, 5)
+        assert not sock.exists()
+
+    async def test_idle_timeout(self, config) -> None:
+        daemon = FirewallDaemon(socket_path(config.cache_dir), idle_timeout=0.01)
+        await asyncio.wait_for(daemon.serve(), 5)
+
+
+class TestDaemonCli:
+    @pytest.fixture
+    def project(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / ".firewall.toml").write_text(
+            f"[firewall]\ncache_dir = {str(tmp_path / 'cache')!r}\n",
+        )
+        return tmp_path
+
+    @pytest.fixture
+    def background_daemon(self, project):
+        """A daemon serving from its own event loop on a thread."""
+        loop = asyncio.new_event_loop()
+        daemon = FirewallDaemon(socket_path(project / "cache"), idle_timeout=0)
+        thread = threading.Thread(target=loop.run_until_complete, args=(daemon.serve(),))
+        thread.start()
+        while asyncio.run(daemon_status(daemon.sock)) is None:
+            pass
+        yield daemon
+        loop.call_soon_threadsafe(daemon.stop)
+        thread.join()
+        loop.close()
+
+    def test_check_uses_running_daemon(self, project, background_daemon) -> None:
+        (project / "bad.py").write_text("def foo(\n")
+        before = background_daemon.requests
+        result = CliRunner().invoke(main, ["check", "bad.py"])
+        assert result.exit_code == 1
+        assert background_daemon.requests == before + 1
+
+        result = CliRunner().invoke(main, ["check", "bad.py", "--no-daemon"])
+        assert result.exit_code == 1
+        assert background_daemon.requests == before + 1
+
+    def test_status_and_stop(self, project, background_daemon) -> None:
+        runner = CliRunner()
+        assert runner.invoke(main, ["daemon", "status"]).exit_code == 0
+        assert "already running" in runner.invoke(main, ["daemon", "start"]).output
+        assert "Daemon stopped" in runner.invoke(main, ["daemon", "stop"]).output
+
+    def test_start_detached(self, project) -> None:
+        runner = CliRunner()
+        started = runner.invoke(main, ["daemon", "start", "--idle-timeout", "60"])
+        try:
+            assert started.exit_code == 0, started.output
+            assert "Daemon started" in started.output
+            assert runner.invoke(main, ["daemon", "status"]).exit_code == 0
+        finally:
+            runner.invoke(main, ["daemon", "stop"])
+
+    def test_not_running(self, project) -> None:
+        runner = CliRunner()
+        assert runner.invoke(main, ["daemon", "status"]).exit_code == 1
+        assert "not running" in runner.invoke(main, ["daemon", "stop"]).output
+
+
+def test_cli_idle_timeout_default_matches_daemon() -> None:
+    from hallucination_firewall import cli, daemon
+
+    assert cli.DEFAULT_IDLE_TIMEOUT == daemon.DEFAULT_IDLE_TIMEOUT
@@ -9,6 +9,7 @@ from hallucination_firewall.pipeline.deprecation_checker import (
     PYTHON_DEPRECATIONS,
     check_deprecations,
 )
+from hallucination_firewall.utils.git_diff import ChangedLines
 
 
 class TestCheckDeprecations:
@@ -21,6 +22,14 @@ class TestCheckDeprecations:
         assert "os.popen" in issues[0].message
         assert issues[0].severity == Severity.WARNING
 
+    @pytest.mark.asyncio
+    async def test_changed_lines_limit_reported_calls(self):
+        code = "import os\nos.popen('ls')\nos.system('ls')\n"
+        issues = await check_deprecations(
+            code, Language.PYTHON, "test.py", changed=ChangedLines([(3, 3)]),
+        )
+        assert [i.location.line for i in issues] == [3]
+
     @pytest.mark.asyncio
     async def test_os_system_detected(self):
         code = "import os\nos.system('ls')\n"
@@ -0,0 +1,91 @@
+"""Tests for directory/glob discovery with .gitignore support."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from hallucination_firewall.utils.file_walker import (
+    iter_source_files,
+    parse_ignore_pattern,
+)
+
+
+def _touch(root, *names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x = 1\n")
+
+
+def _rel(paths, root):
+    return [os.path.relpath(p, root).replace(os.sep, "/") for p in paths]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / ".git").mkdir()
+    return tmp_path
+
+
+def test_walks_supported_files_in_sorted_order(repo):
+    _touch(repo, "b.py", "a.js", "README.md", "pkg/z.ts", "pkg/sub/y.py")
+    found = iter_source_files([str(repo)], root=repo)
+    assert _rel(found, repo) == ["a.js", "b.py", "pkg/z.ts", "pkg/sub/y.py"]
+
+
+def test_gitignore_rules(repo):
+    _touch(
+        repo, "keep.py", "gen_pb2.py", "build/out.py", "src/build.py",
+        "logs/a.py", "logs/important.py", "src/vendor/lib.py",
+    )
+    (repo / ".gitignore").write_text(
+        "# generated\n*_pb2.py\nbuild/\nlogs/*\n!logs/important.py\n\n",
+    )
+    (repo / "src" / ".gitignore").write_text("/vendor\n")
+    found = _rel(iter_source_files([str(repo)], root=repo), repo)
+    assert found == ["keep.py", "logs/important.py", "src/build.py"]
+
+
+def test_ancestor_gitignore_applies_to_subdirectory_target(repo):
+    _touch(repo, "src/a.py", "src/skip_me.py")
+    (repo / ".gitignore").write_text("skip_*.py\n")
+    found = _rel(iter_source_files([str(repo / "src")], root=repo), repo)
+    assert found == ["src/a.py"]
+
+
+def test_config_exclude_and_default_excludes(repo):
+    _touch(repo, "a.py", "tests/fixtures/bad.py", "node_modules/lib/index.js", ".venv/x.py")
+    found = iter_source_files([str(repo)], exclude=["tests/fixtures/"], root=repo)
+    assert _rel(found, repo) == ["a.py"]
+
+
+def test_glob_targets(repo):
+    _touch(repo, "src/a.py", "src/pkg/b.py", "src/pkg/c.js", "other/d.py")
+    found = iter_source_files([str(repo / "src" / "**" / "*.py")], root=repo)
+    assert _rel(found, repo) == ["src/a.py", "src/pkg/b.py"]
+
+
+def test_explicit_files_are_kept_and_deduplicated(repo):
+    _touch(repo, "gen_pb2.py", "a.py")
+    (repo / ".gitignore").write_text("*_pb2.py\n")
+    explicit = str(repo / "gen_pb2.py")
+    found = list(iter_source_files([explicit, str(repo), explicit], root=repo))
+    assert _rel(found, repo) == ["gen_pb2.py", "a.py"]
+
+
+def test_walk_is_lazy(repo):
+    _touch(repo, "a.py", "b.py")
+    found = iter_source_files([str(repo)], root=repo)
+    assert _rel([next(found)], repo) == ["a.py"]
+    (repo / "c.py").write_text("x = 1\n")  # directory was already listed
+    assert _rel(found, repo) == ["b.py"]
+
+
+def test_parse_ignore_pattern_skips_blank_and_comments():
+    assert parse_ignore_pattern("") is None
+    assert parse_ignore_pattern("   ") is None
+    assert parse_ignore_pattern("# comment") is None
+    rule = parse_ignore_pattern("\\#literal.py")
+    assert rule is not None and rule.regex.match("#literal.py")
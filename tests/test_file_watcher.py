@@ -0,0 +1,127 @@
+"""Tests for file change detection used by watch mode."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+from hallucination_firewall.utils import file_watcher
+from hallucination_firewall.utils.file_watcher import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchedFiles,
+    create_watcher,
+    watch_roots,
+)
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("a = 1\n")
+    (tmp_path / "src" / "b.py").write_text("b = 1\n")
+    return tmp_path
+
+
+def _touch(path, text):
+    """Rewrite ``path`` with a new mtime even on coarse-grained filesystems."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_watch_roots(project) -> None:
+    assert watch_roots(["src", "src/**/*.py", "src/a.py", "top.py"]) == [
+        ("src", True), ("src", True), ("src", False), (".", False),
+    ]
+
+
+class TestWatchedFiles:
+    def test_rescan_reports_changed_added_removed(self, project) -> None:
+        files = WatchedFiles(["src"])
+        assert len(files) == 2
+        _touch(project / "src" / "a.py", "a = 2\n")
+        (project / "src" / "b.py").unlink()
+        (project / "src" / "c.py").write_text("c = 1\n")
+        changed, removed = files.update(None)
+        assert sorted(changed) == [os.path.join("src", "a.py"), os.path.join("src", "c.py")]
+        assert removed == [os.path.join("src", "b.py")]
+        assert files.update(None) == ([], [])
+
+    def test_touched_known_files_are_only_statted(self, project, monkeypatch) -> None:
+        files = WatchedFiles(["src"])
+        monkeypatch.setattr(files, "_scan", lambda: pytest.fail("rescanned"))
+        a, b = (str(project / "src" / name) for name in ("a.py", "b.py"))
+        _touch(project / "src" / "a.py", "a = 2\n")
+        (project / "src" / "b.py").unlink()
+        touched = {a, b, str(project / "src" / "a.py~")}  # editor backups are ignored
+        assert files.update(touched) == (
+            [os.path.join("src", "a.py")], [os.path.join("src", "b.py")],
+        )
+
+    def test_unknown_source_file_rescans_once(self, project, monkeypatch) -> None:
+        (project / ".gitignore").write_text("build/\n")
+        (project / ".git").mkdir()
+        (project / "src" / "build").mkdir()
+        files = WatchedFiles(["src"])
+        ignored = str(project / "src" / "build" / "gen.py")
+        (project / "src" / "build" / "gen.py").write_text("x = 1\n")
+        assert files.update({ignored}) == ([], [])
+        # Known to be outside the targets now, so no further walks
+        monkeypatch.setattr(files, "_scan", lambda: pytest.fail("rescanned"))
+        assert files.update({ignored}) == ([], [])
+
+
+class TestWatchers:
+    def test_polling_reports_unknown(self) -> None:
+        assert PollingWatcher(interval=0).wait(1.0) is None
+        assert create_watcher([(".", True)], polling=True).kind == "polling"
+
+    def test_falls_back_to_polling(self, monkeypatch) -> None:
+        def _unavailable(roots):
+            raise OSError("no inotify")
+
+        monkeypatch.setattr(file_watcher, "InotifyWatcher", _unavailable)
+        assert create_watcher([(".", True)]).kind == "polling"
+
+    @linux_only
+    def test_inotify_reports_saved_files(self, project) -> None:
+        watcher = InotifyWatcher([("src", True)])
+        try:
+            assert watcher.wait(0.01) == set()
+            (project / "src" / "a.py").write_text("a = 2\n")
+            (project / "src" / "a.py").rename(project / "src" / "moved.py")
+            assert watcher.wait(1.0) == {
+                str(project / "src" / "a.py"), str(project / "src" / "moved.py"),
+            }
+        finally:
+            watcher.close()
+
+    @linux_only
+    def test_inotify_follows_new_directories(self, project) -> None:
+        watcher = InotifyWatcher([("src", True), ("missing", True)])
+        try:
+            (project / "src" / "pkg").mkdir()
+            (project / "src" / "node_modules").mkdir()
+            assert watcher.wait(1.0) is None  # a rescan picks up files made before the watch
+            (project / "src" / "pkg" / "m.py").write_text("m = 1\n")
+            (project / "src" / "node_modules" / "n.py").write_text("n = 1\n")
+            assert watcher.wait(1.0) == {str(project / "src" / "pkg" / "m.py")}
+        finally:
+            watcher.close()
+
+    @linux_only
+    def test_inotify_non_recursive_root(self, project) -> None:
+        watcher = create_watcher(watch_roots(["src/a.py"]))
+        try:
+            assert watcher.kind == "inotify"
+            (project / "src" / "sub").mkdir()
+            (project / "src" / "sub" / "x.py").write_text("x = 1\n")
+            assert watcher.wait(0.2) == set()
+        finally:
+            watcher.close()
@@ -0,0 +1,111 @@
+"""Tests for git changed-line discovery."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+
+import pytest
+
+from hallucination_firewall.utils.git_diff import (
+    ChangedLines,
+    GitDiffError,
+    changed_lines,
+    parse_unified_diff,
+)
+
+DIFF = """\
+diff --git a/src/a.py b/src/a.py
+index 1111111..2222222 100644
+--- a/src/a.py
++++ b/src/a.py
+@@ -3,0 +4,2 @@ def f():
++x = 1
++++ not a header
+@@ -10 +12 @@ def g():
+-old
++new
+@@ -20,3 +22,0 @@ def h():
+-gone
+diff --git a/b.py b/b.py
+new file mode 100644
+--- /dev/null
++++ b/b.py
+@@ -0,0 +1,3 @@
++a
++b
++c
+diff --git "a/sp ace.py" "b/sp ace.py"
+--- "a/sp ace.py"
++++ "b/sp ace.py"
+@@ -1 +1 @@
+-a
++b
+"""
+
+
+def test_parse_unified_diff():
+    changes = parse_unified_diff(DIFF)
+    assert changes["src/a.py"].ranges == [(4, 5), (12, 12), (22, 23)]
+    assert changes["b.py"].ranges == [(1, 3)]
+    assert changes["sp ace.py"].ranges == [(1, 1)]
+    assert "not a header" not in " ".join(changes)
+
+
+def test_deletion_only_hunk_marks_surrounding_lines():
+    diff = (
+        "diff --git a/a.py b/a.py\n--- a/a.py\n+++ b/a.py\n"
+        "@@ -3 +2,0 @@ path = os.path.join(\n-    base,\n"
+        "@@ -1,2 +0,0 @@\n-import os\n-import sys\n"
+    )
+    lines = parse_unified_diff(diff)["a.py"]
+    assert lines.ranges == [(1, 1), (2, 3)]
+    # The call that lost its argument line (now lines 2-4) is re-checked
+    assert lines.overlaps(2, 4)
+
+
+def test_overlaps():
+    lines = ChangedLines([(4, 5), (12, 12)])
+    assert lines.overlaps(5, 5)
+    assert lines.overlaps(1, 4)
+    assert lines.overlaps(10, 20)
+    assert not lines.overlaps(6, 11)
+    assert not lines.overlaps(13, 13)
+    assert ChangedLines(None).overlaps(1, 1)
+    assert not ChangedLines().overlaps(1, 100)
+
+
+def _git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a.py").write_text("one\ntwo\nthree\n")
+    (tmp_path / "gone.py").write_text("x\n")
+    (tmp_path / ".gitignore").write_text("ignored.py\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+
+def test_changed_lines_against_working_tree(repo):
+    (repo / "a.py").write_text("one\nTWO\nthree\nfour\n")
+    (repo / "gone.py").unlink()
+    (repo / "new.py").write_text("n\n")
+    (repo / "ignored.py").write_text("i\n")
+    changes = changed_lines("HEAD", cwd=str(repo))
+    top = os.path.realpath(repo)
+    assert changes[os.path.join(top, "a.py")].ranges == [(2, 2), (4, 4)]
+    assert changes[os.path.join(top, "new.py")].whole_file
+    assert os.path.join(top, "gone.py") not in changes
+    assert os.path.join(top, "ignored.py") not in changes
+
+
+def test_bad_ref_raises(repo):
+    with pytest.raises(GitDiffError):
+        changed_lines("no-such-ref", cwd=str(repo))
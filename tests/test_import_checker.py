@@ -13,21 +13,32 @@ from hallucination_firewall.pipeline.import_checker import (
     _normalize_pypi_name,
     check_js_imports,
     check_python_imports,
+    js_import_issues,
+    python_import_issues,
+    resolve_js_packages,
+    resolve_python_packages,
 )
 
 
-@pytest.fixture
-def mock_pypi():
+def _mock_registry():
     registry = MagicMock()
     registry.package_exists = AsyncMock(return_value=True)
+
+    async def _exists_many(names, max_concurrent=10):
+        return {name: await registry.package_exists(name) for name in names}
+
+    registry.package_exists_many = _exists_many
     return registry
 
 
+@pytest.fixture
+def mock_pypi():
+    return _mock_registry()
+
+
 @pytest.fixture
 def mock_npm():
-    registry = MagicMock()
-    registry.package_exists = AsyncMock(return_value=True)
-    return registry
+    return _mock_registry()
 
 
 class TestPythonImports:
@@ -114,3 +125,56 @@ class TestConstants:
     def test_js_builtins_has_common_modules(self):
         for mod in ["fs", "path", "http", "crypto"]:
             assert mod in JS_BUILTINS
+
+
+class TestSharedResolution:
+    @pytest.mark.asyncio
+    async def test_python_unique_packages_resolved_once(self, mock_pypi):
+        mock_pypi.package_exists = AsyncMock(return_value=False)
+        exists = await resolve_python_packages(
+            ["os", "fake_pkg_q", "fake_pkg_q", "fake_pkg_q"], mock_pypi,
+        )
+        assert exists == {"os": True, "fake_pkg_q": False}
+        mock_pypi.package_exists.assert_awaited_once_with("fake-pkg-q")
+
+    @pytest.mark.asyncio
+    async def test_js_unique_packages_resolved_once(self, mock_npm):
+        exists = await resolve_js_packages(["node:fs", "left-pad", "left-pad"], mock_npm)
+        assert exists == {"node:fs": True, "left-pad": True}
+        mock_npm.package_exists.assert_awaited_once_with("left-pad")
+
+    def test_issues_from_shared_answers(self):
+        exists = {"fake_pkg_q": False, "os": True}
+        issues = python_import_issues(["os", "fake_pkg_q", "unknown"], "a.py", exists)
+        assert [i.message for i in issues] == ["Package 'fake_pkg_q' not found on PyPI or locally"]
+        assert issues[0].location.file == "a.py"
+        js = js_import_issues(["nope"], "a.js", {"nope": False})
+        assert js[0].message == "Package 'nope' not found on npm"
+
+
+class TestRegistryPrefetch:
+    @pytest.mark.asyncio
+    async def test_cached_packages_need_one_round_trip(self, tmp_path, monkeypatch):
+        from hallucination_firewall.models import RegistryConfig
+        from hallucination_firewall.registries.cache import RegistryCache
+        from hallucination_firewall.registries.pypi_registry import PyPIRegistry
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.import_checker.importlib.util.find_spec",
+            lambda name: None,
+        )
+        cache = RegistryCache(tmp_path, memory_size=0)
+        cache.set_many({f"pypi:exists:pkg-{i}": i != 3 for i in range(20)})
+        queries = []
+        get_many_stored = cache._get_many_stored
+        monkeypatch.setattr(cache, "_get_stored", lambda key: pytest.fail("per-key query"))
+        monkeypatch.setattr(
+            cache, "_get_many_stored", lambda keys: queries.append(keys) or get_many_stored(keys),
+        )
+        pypi = PyPIRegistry(RegistryConfig(), cache)
+        imports = [f"pkg_{i}" for i in range(20)]
+        issues = await check_python_imports(imports, "t.py", pypi)
+        assert [i.message for i in issues] == ["Package 'pkg_3' not found on PyPI or locally"]
+        assert len(queries) == 1
+        assert "client" not in pypi.__dict__  # nothing went to the network
+        cache.close()
@@ -0,0 +1,49 @@
+"""Import-time budget for the CLI, which runs on every pre-commit invocation."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+# Cumulative microseconds for `import hallucination_firewall.cli`; about 45ms
+# locally, leaving headroom for slower CI machines.
+CLI_IMPORT_BUDGET_US = 200_000
+
+# Loaded on first use only, never by importing the CLI or the pipeline
+HEAVY_MODULES = ("jedi", "httpx", "tree_sitter_python", "tree_sitter_javascript")
+
+
+def _import_time_us(module: str) -> int:
+    """Cumulative import time of ``module`` in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in proc.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        if name == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+
+def _loaded_after_import(module: str) -> set[str]:
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return {name.split(".")[0] for name in json.loads(proc.stdout)}
+
+
+def test_cli_import_within_budget() -> None:
+    # Best of three to ignore a cold filesystem cache
+    best = min(_import_time_us("hallucination_firewall.cli") for _ in range(3))
+    assert best < CLI_IMPORT_BUDGET_US, f"CLI import took {best / 1000:.0f}ms"
+
+
+def test_cli_import_skips_pipeline_and_rich() -> None:
+    loaded = _loaded_after_import("hallucination_firewall.cli")
+    assert not loaded & {*HEAVY_MODULES, "rich", "pydantic", "tree_sitter"}
+
+
+def test_pipeline_import_defers_jedi_grammars_and_httpx() -> None:
+    loaded = _loaded_after_import("hallucination_firewall.pipeline.runner")
+    assert not loaded & set(HEAVY_MODULES)
@@ -0,0 +1,57 @@
+"""Tests for the in-memory LRU cache."""
+
+from __future__ import annotations
+
+import time
+
+from hallucination_firewall.utils.lru import MISSING, LRUCache
+
+
+def test_get_miss_returns_sentinel():
+    cache: LRUCache[str, int] = LRUCache(2)
+    assert cache.get("a") is MISSING
+    assert cache.misses == 1
+
+
+def test_none_is_a_cacheable_value():
+    cache: LRUCache[str, None] = LRUCache(2)
+    cache.set("a", None)
+    assert cache.get("a") is None
+    assert cache.hits == 1
+
+
+def test_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # a is now most recent
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_expiry():
+    cache: LRUCache[str, int] = LRUCache(2, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.05)
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_zero_size_disables_cache():
+    cache: LRUCache[str, int] = LRUCache(0)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
+
+
+def test_delete_and_clear():
+    cache: LRUCache[str, int] = LRUCache(4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    assert cache.get("a") is MISSING
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["size"] == 0
@@ -2,15 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock
+
 import pytest
 
-from hallucination_firewall.models import IssueType, Severity
+from hallucination_firewall.models import (
+    FirewallConfig,
+    IssueType,
+    Severity,
+    SourceLocation,
+    ValidationIssue,
+    ValidationResult,
+)
 from hallucination_firewall.pipeline.runner import ValidationPipeline
+from hallucination_firewall.registries.cache import RegistryCache
 
 
 @pytest.fixture
-def pipeline():
-    return ValidationPipeline()
+def pipeline(tmp_path):
+    return ValidationPipeline(FirewallConfig(cache_dir=tmp_path / "cache"))
 
 
 class TestValidateCode:
@@ -72,10 +85,61 @@ class TestValidateFile:
         assert result.language == "python"
 
 
+class TestValidateFiles:
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, tmp_path, pipeline):
+        paths = []
+        for i in range(5):
+            f = tmp_path / f"f{i}.py"
+            f.write_text(f"x = {i}\n")
+            paths.append(str(f))
+        results = await pipeline.validate_files(paths, jobs=3)
+        assert [r.file for r in results] == paths
+
+    @pytest.mark.asyncio
+    async def test_jobs_bounds_files_in_flight(self, pipeline, monkeypatch):
+        in_flight = 0
+        peak = 0
+
+        async def fake_validate_file(file_path, changed=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return ValidationResult(file=file_path, language="python")
+
+        monkeypatch.setattr(pipeline, "validate_file", fake_validate_file)
+        results = await pipeline.validate_files([f"f{i}.py" for i in range(8)], jobs=2)
+        assert peak == 2
+        assert [r.file for r in results] == [f"f{i}.py" for i in range(8)]
+
+    @pytest.mark.asyncio
+    async def test_validation_starts_before_paths_are_exhausted(self, pipeline, monkeypatch):
+        started = threading.Event()
+
+        async def fake_validate_file(file_path, changed=None):
+            started.set()
+            return ValidationResult(file=file_path, language="python")
+
+        def slow_walk():
+            yield "first.py"
+            # A walk still in progress: blocks until the first file is being validated
+            assert started.wait(timeout=5)
+            yield "second.py"
+
+        monkeypatch.setattr(pipeline, "validate_file", fake_validate_file)
+        results = await pipeline.validate_files(slow_walk(), jobs=2)
+        assert [r.file for r in results] == ["first.py", "second.py"]
+
+    @pytest.mark.asyncio
+    async def test_first_error_is_raised(self, pipeline):
+        with pytest.raises(FileNotFoundError):
+            await pipeline.validate_files(["/nonexistent/a.py"], jobs=2)
+
+
 class TestCiMode:
     def test_ci_mode_overrides_config(self):
-        from hallucination_firewall.models import FirewallConfig
-
         config = FirewallConfig(ci_mode=True)
         p = ValidationPipeline(config)
         assert p.config.fail_on_network_error is True
@@ -86,3 +150,92 @@ class TestPipelineLifecycle:
     @pytest.mark.asyncio
     async def test_close_no_error(self, pipeline):
         await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_queued_cache_writes(self, pipeline):
+        await pipeline.cache.aset("pypi:exists:requests", True)
+        await pipeline.close()
+        assert pipeline.cache.stats()["sqlite"]["pending_writes"] == 0
+        assert RegistryCache(pipeline.cache.db_path.parent).get("pypi:exists:requests") is True
+
+
+class TestConcurrentLayers:
+    @pytest.mark.asyncio
+    async def test_layers_overlap(self, pipeline, monkeypatch):
+        async def _slow_imports(*args):
+            await asyncio.sleep(0.3)
+            return []
+
+        async def _slow_resolve(code, targets, imported):
+            await asyncio.sleep(0.3)
+            return [None] * len(targets)
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.runner.check_python_imports", _slow_imports,
+        )
+        monkeypatch.setattr(pipeline.signature_resolver, "resolve", _slow_resolve)
+        start = time.perf_counter()
+        await pipeline.validate_code("import os\nos.getcwd()\n", "t.py")
+        assert time.perf_counter() - start < 0.55
+
+    @pytest.mark.asyncio
+    async def test_issues_keep_layer_order(self, pipeline, monkeypatch):
+        async def _late_imports(imports, file_path, pypi):
+            await asyncio.sleep(0.05)
+            return [ValidationIssue(
+                severity=Severity.ERROR,
+                issue_type=IssueType.NONEXISTENT_PACKAGE,
+                location=SourceLocation(file=file_path, line=1),
+                message="missing",
+                source="import_checker",
+            )]
+
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.runner.check_python_imports", _late_imports,
+        )
+        code = "import os\nos.getcwd(1)\nos.popen('ls')\n"
+        result = await pipeline.validate_code(code, "t.py")
+        sources = [i.source for i in result.issues]
+        assert sources == ["import_checker", "signature_checker", "deprecation_checker"]
+        stats = pipeline.timings.stats()["layers"]
+        assert {"imports", "signatures", "deprecations"} <= stats.keys()
+
+
+class TestValidateMany:
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, pipeline):
+        items = [
+            ("import os\n", "a.py"),
+            ("def foo(\n", "b.py"),
+            ("const x = 1;\n", "c.js"),
+        ]
+        results = await pipeline.validate_many(items)
+        assert [r.file for r in results] == ["a.py", "b.py", "c.js"]
+        assert [r.passed for r in results] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_packages_resolved_once_per_batch(self, pipeline, monkeypatch):
+        monkeypatch.setattr(
+            "hallucination_firewall.pipeline.import_checker.importlib.util.find_spec",
+            lambda name: None,
+        )
+
+        async def _exists(name):
+            return name != "fake-pkg"
+
+        lookups = AsyncMock(side_effect=_exists)
+        monkeypatch.setattr(pipeline.pypi, "_fetch", lookups)
+        items = [(f"import requests\nimport fake_pkg\nx = {i}\n", f"f{i}.py") for i in range(20)]
+        results = await pipeline.validate_many(items)
+        assert lookups.await_count == 2
+        assert all(
+            [i.message for i in r.issues] == ["Package 'fake_pkg' not found on PyPI or locally"]
+            for r in results
+        )
+        # Batch results are cached like single ones
+        assert (await pipeline.validate_many(items[:1]))[0] == results[0]
+        assert pipeline.result_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, pipeline):
+        assert await pipeline.validate_many([]) == []
@@ -9,6 +9,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 import hallucination_firewall.server as server_module
+from hallucination_firewall.models import FirewallConfig
 from hallucination_firewall.pipeline.runner import ValidationPipeline
 from hallucination_firewall.server import MetricsCollector, app, lifespan
 
@@ -28,13 +29,14 @@ def _find_rate_limiter(obj, depth=5):
 
 
 @pytest.fixture(autouse=True)
-def _init_pipeline():
+def _init_pipeline(tmp_path):
     """Initialize the global pipeline and reset rate limiter + metrics for tests."""
-    server_module.pipeline = ValidationPipeline()
+    server_module.pipeline = ValidationPipeline(FirewallConfig(cache_dir=tmp_path))
     # Reset rate limiter state between tests
     rl = _find_rate_limiter(app.middleware_stack)
     if rl:
         rl._requests.clear()
+        rl._batch_items.clear()
     # Reset global metrics to avoid state leak between tests
     server_module.metrics = MetricsCollector()
     yield
@@ -100,6 +102,46 @@ class TestValidateEndpoint:
         assert resp.status_code == 200
 
 
+class TestValidateBatchEndpoint:
+    @pytest.mark.asyncio
+    async def test_batch_returns_results_in_order(self, transport):
+        items = [
+            {"code": "x = 1\n", "file_path": "a.py"},
+            {"code": "def foo(\n", "file_path": "b.py"},
+            {"code": "const x = 1;\n", "file_path": "c", "language": "js"},
+        ]
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/validate/batch", json={"items": items})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [r["file"] for r in data] == ["a.py", "b.py", "c.js"]
+        assert [r["passed"] for r in data] == [True, False, True]
+
+    @pytest.mark.asyncio
+    async def test_batch_too_large(self, transport):
+        items = [{"code": "x = 1\n"}] * (server_module.MAX_BATCH_ITEMS + 1)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/validate/batch", json={"items": items})
+        assert resp.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_503_when_pipeline_none(self, transport, monkeypatch):
+        monkeypatch.setattr(server_module, "pipeline", None)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            resp = await client.post("/validate/batch", json={"items": []})
+        assert resp.status_code == 503
+
+    @pytest.mark.asyncio
+    async def test_batch_error_recorded(self, transport, monkeypatch):
+        monkeypatch.setattr(
+            server_module.pipeline, "validate_many", AsyncMock(side_effect=RuntimeError),
+        )
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            with pytest.raises(RuntimeError):
+                await client.post("/validate/batch", json={"items": []})
+        assert server_module.metrics.error_count == 1
+
+
 class TestRateLimiting:
     @pytest.mark.asyncio
     async def test_rate_limit_exceeded(self, transport):
@@ -110,6 +152,22 @@ class TestRateLimiting:
         assert resp.status_code == 429
         assert "rate limit" in resp.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_batch_items_have_their_own_budget(self, transport, monkeypatch):
+        monkeypatch.setattr(
+            server_module.pipeline, "validate_many", AsyncMock(return_value=[]),
+        )
+        monkeypatch.setattr(server_module.pipeline.config, "batch_item_limit", 150)
+        items = [{"code": "x = 1\n"}] * 100
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.post("/validate/batch", json={"items": items})
+            second = await client.post("/validate/batch", json={"items": items})
+            rest = [await client.get("/health") for _ in range(60)]
+        assert first.status_code == 200
+        assert second.status_code == 429
+        # Each batch counted once against the request limit, not per item
+        assert [r.status_code for r in rest].count(200) == 58
+
 
 class TestMetricsCollector:
     def test_record_request_error(self):
@@ -129,12 +187,15 @@ class TestMetricsCollector:
         m.record_request(2000, False)
         assert m.latency_histogram[">1000ms"] == 1
 
-    def test_cache_hit_miss(self):
-        m = MetricsCollector()
-        m.record_cache_hit()
-        m.record_cache_miss()
-        assert m.cache_hits == 1
-        assert m.cache_misses == 1
+    def test_registry_cache_tiers(self):
+        stats = {
+            "memory": {"size": 3, "max_size": 10, "hits": 6, "negative_hits": 1, "evictions": 0},
+            "sqlite": {"hits": 2, "misses": 1},
+        }
+        data = MetricsCollector().get_metrics(stats)
+        assert data["registry_cache"]["memory"]["hit_rate"] == 0.7
+        assert data["registry_cache"]["sqlite"]["hit_rate"] == pytest.approx(0.667, abs=0.001)
+        assert (data["cache_hits"], data["cache_misses"]) == (8, 2)
 
     def test_get_metrics_zero_requests(self):
         m = MetricsCollector()
@@ -150,11 +211,11 @@ class TestMetricsCollector:
         assert data["avg_latency_ms"] == 150.0
 
     def test_get_metrics_cache_hit_rate(self):
-        m = MetricsCollector()
-        m.record_cache_hit()
-        m.record_cache_hit()
-        m.record_cache_miss()
-        data = m.get_metrics()
+        stats = {
+            "memory": {"size": 1, "max_size": 10, "hits": 1, "negative_hits": 0, "evictions": 0},
+            "sqlite": {"hits": 1, "misses": 1},
+        }
+        data = MetricsCollector().get_metrics(stats)
         assert data["cache_hit_rate"] == pytest.approx(0.667, abs=0.001)
 
 
@@ -163,8 +224,6 @@ class TestLifespan:
     async def test_lifespan_startup_shutdown(self, monkeypatch):
         mock_pipeline = MagicMock()
         mock_pipeline.close = AsyncMock()
-        mock_pipeline.cache = MagicMock()
-        mock_pipeline.cache.get = MagicMock(return_value=None)
 
         monkeypatch.setattr(
             "hallucination_firewall.server.load_config",
@@ -184,8 +243,6 @@ class TestLifespan:
     async def test_lifespan_shutdown_exception(self, monkeypatch, caplog):
         mock_pipeline = MagicMock()
         mock_pipeline.close = AsyncMock(side_effect=RuntimeError("cleanup error"))
-        mock_pipeline.cache = MagicMock()
-        mock_pipeline.cache.get = MagicMock(return_value=None)
 
         monkeypatch.setattr(
             "hallucination_firewall.server.load_config",
@@ -224,3 +281,16 @@ class TestMetricsEndpoint:
         assert "request_count" in data
         assert "cache_hits" in data
         assert "latency_histogram" in data
+        assert "parser_pool" in data
+        assert "hits" in data["signature_cache"]
+        assert "timeouts" in data["signature_workers"]
+        assert "signature_calls" in data["layer_timings"]
+
+    @pytest.mark.asyncio
+    async def test_metrics_reports_parser_pool_usage(self, transport):
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.post("/validate", json={"code": "x = 1\n", "file_path": "t.py"})
+            resp = await client.get("/metrics")
+        pool = resp.json()["parser_pool"]["python"]
+        assert pool["checkouts"] >= 1
+        assert pool["in_use"] == 0
@@ -0,0 +1,135 @@
+"""Tests for `firewall check --watch`."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from click.testing import CliRunner
+from rich.console import Console
+
+from hallucination_firewall import watch
+from hallucination_firewall.cli import main
+from hallucination_firewall.models import (
+    FirewallConfig,
+    IssueType,
+    Severity,
+    SourceLocation,
+    ValidationIssue,
+)
+from hallucination_firewall.pipeline.runner import ValidationPipeline
+from hallucination_firewall.utils.file_watcher import WatchedFiles
+from hallucination_firewall.watch import WatchSession, diff_issues, run_watch
+
+
+def _issue(message: str, line: int) -> ValidationIssue:
+    return ValidationIssue(
+        severity=Severity.WARNING,
+        issue_type=IssueType.DEPRECATED_API,
+        location=SourceLocation(file="a.py", line=line),
+        message=message,
+    )
+
+
+def test_diff_issues_ignores_moves() -> None:
+    old = [_issue("a", 1), _issue("b", 2), _issue("b", 5)]
+    new = [_issue("a", 4), _issue("b", 7), _issue("c", 9)]
+    added, resolved = diff_issues(old, new)
+    assert [(i.message, i.location.line) for i in added] == [("c", 9)]
+    assert [(i.message, i.location.line) for i in resolved] == [("b", 5)]
+
+
+def _write(path, text):
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.py").write_text("import os\nos.popen('ls')\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    return tmp_path
+
+
+class TestWatchSession:
+    async def test_only_changed_files_are_rechecked(self, project) -> None:
+        pipeline = ValidationPipeline(FirewallConfig(cache_dir=project / "cache"))
+        session = WatchSession(pipeline, WatchedFiles(["."]))
+        results = await session.start()
+        assert [r.file for r in results] == ["a.py", "b.py"]
+
+        _write(project / "a.py", "import os\n\nos.popen('ls')\nos.system('ls')\n")
+        changes = await session.update(None)
+        assert [c.file for c in changes] == ["a.py"]
+        assert [i.message for i in changes[0].added] == [
+            "'os.system()' is deprecated since Python 3.0",
+        ]
+        assert changes[0].resolved == []
+        assert "a.py" in pipeline.documents
+
+        (project / "a.py").unlink()
+        changes = await session.update({str(project / "a.py")})
+        await pipeline.close()
+        assert changes[0].deleted
+        assert len(changes[0].resolved) == 2
+        assert "a.py" not in pipeline.documents
+
+
+class _ScriptedWatcher:
+    """Replays touched-path batches, then interrupts like Ctrl-C."""
+
+    kind = "scripted"
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+        self.closed = False
+
+    def wait(self, timeout):
+        if not self.steps:
+            raise KeyboardInterrupt
+        step = self.steps.pop(0)
+        if callable(step):
+            return step()
+        return step
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_watch_prints_only_changes(project, monkeypatch) -> None:
+    def _save():
+        _write(project / "b.py", "import os\nos.system('ls')\n")
+        return None
+
+    watcher = _ScriptedWatcher([set(), _save, None])
+    monkeypatch.setattr(watch, "create_watcher", lambda roots, polling: watcher)
+    console = Console(record=True, width=120)
+    run_watch(FirewallConfig(cache_dir=project / "cache"), (".",), 1, console, incremental=True)
+    output = console.export_text()
+    assert "Watching 2 files (scripted)" in output
+    assert "+ ⚠ L2:0 deprecated_api: 'os.system()' is deprecated" in output
+    assert output.count("Re-checked 1 file(s)") == 1  # the quiet rescan prints nothing
+    assert "Stopped watching" in output
+    assert watcher.closed
+
+
+class TestWatchCli:
+    def test_runs_watch(self, project, monkeypatch) -> None:
+        run = MagicMock()
+        monkeypatch.setattr(watch, "run_watch", run)
+        result = CliRunner().invoke(main, ["check", ".", "--watch", "--poll", "-j", "2"])
+        assert result.exit_code == 0, result.output
+        config, targets, jobs, _, incremental, polling = run.call_args.args
+        assert (targets, jobs, incremental, polling) == ((".",), 2, False, True)
+        assert config.workers.max_workers in (0, 2)
+
+    @pytest.mark.parametrize(
+        "args", [["--format", "json"], ["--stdin"], ["--changed-since", "HEAD"]],
+    )
+    def test_rejects_incompatible_options(self, project, args) -> None:
+        result = CliRunner().invoke(main, ["check", ".", "--watch", *args])
+        assert result.exit_code == 2
+        assert "--watch" in result.output